@@ -1,16 +1,42 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 
 class AccountAppConfig(AppConfig):
     name = "saleor.account"
 
     def ready(self):
-        from .models import User
-        from .signals import delete_avatar
+        from .models import Address, User
+        from .signals import (
+            delete_avatar,
+            store_user_order_pks_handler,
+            update_address_users_search_document_handler,
+            update_deleted_user_orders_search_document_handler,
+            update_user_search_document_handler,
+        )
 
         post_delete.connect(
             delete_avatar,
             sender=User,
             dispatch_uid="delete_user_avatar",
         )
+        pre_delete.connect(
+            store_user_order_pks_handler,
+            sender=User,
+            dispatch_uid="store_user_order_pks",
+        )
+        post_delete.connect(
+            update_deleted_user_orders_search_document_handler,
+            sender=User,
+            dispatch_uid="update_deleted_user_orders_search_document",
+        )
+        post_save.connect(
+            update_user_search_document_handler,
+            sender=User,
+            dispatch_uid="update_user_search_document",
+        )
+        post_save.connect(
+            update_address_users_search_document_handler,
+            sender=Address,
+            dispatch_uid="update_address_users_search_document",
+        )
@@ -8,6 +8,7 @@ from django.contrib.auth.models import (
     Permission,
     PermissionsMixin,
 )
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import JSONField  # type: ignore
 from django.db.models import Q, QuerySet, Value
@@ -155,6 +156,8 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     language_code = models.CharField(
         max_length=35, choices=settings.LANGUAGES, default=settings.LANGUAGE_CODE
     )
+    # Lowercased values the user is searched by, maintained by `account.search`.
+    search_document = models.TextField(blank=True, default="")
 
     USERNAME_FIELD = "email"
 
@@ -166,6 +169,14 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             (AccountPermissions.MANAGE_USERS.codename, "Manage customers."),
             (AccountPermissions.MANAGE_STAFF.codename, "Manage staff."),
         )
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+        indexes.extend(ModelWithMetadata.Meta.indexes)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
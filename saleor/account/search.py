@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING
+
+from ..core.utils.search import prepare_search_document
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from .models import User
+
+
+def prepare_user_search_document_value(user: "User") -> str:
+    values = [user.email, user.first_name, user.last_name]
+    if address := user.default_shipping_address:
+        values.extend(
+            [
+                address.first_name,
+                address.last_name,
+                address.city,
+                address.country.code,
+                address.phone,
+            ]
+        )
+    return prepare_search_document(values)
+
+
+def update_user_search_document(user: "User") -> bool:
+    """Update the search document of the user, return whether it has changed."""
+    search_document = prepare_user_search_document_value(user)
+    if search_document == user.search_document:
+        return False
+    user.search_document = search_document
+    user.save(update_fields=["search_document"])
+    return True
+
+
+def update_users_search_document(users: "QuerySet", batch_size: int = 1000) -> int:
+    """Update search documents of the users in batches, return how many changed."""
+    users = users.select_related("default_shipping_address").order_by("pk")
+    updated_count = 0
+    last_pk = 0
+    while batch := list(users.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1].pk
+        changed_users = []
+        for user in batch:
+            search_document = prepare_user_search_document_value(user)
+            if search_document != user.search_document:
+                user.search_document = search_document
+                changed_users.append(user)
+        users.model.objects.bulk_update(changed_users, ["search_document"])
+        updated_count += len(changed_users)
+    return updated_count
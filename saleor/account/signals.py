@@ -1,6 +1,38 @@
 from ..core.utils import delete_versatile_image
+from ..order.search import update_orders_search_document
+from .search import update_user_search_document
+
+# Fields of users included in search documents of their own and of their orders.
+USER_SEARCH_FIELDS = {"email", "first_name", "last_name", "default_shipping_address"}
 
 
 def delete_avatar(sender, instance, **kwargs):
     if avatar := instance.avatar:
         delete_versatile_image(avatar)
+
+
+def update_user_search_document_handler(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and not USER_SEARCH_FIELDS.intersection(update_fields):
+        return
+    if update_user_search_document(instance):
+        update_orders_search_document(instance.orders.all())
+
+
+def store_user_order_pks_handler(sender, instance, **kwargs):
+    # Orders of a deleted user are detached by an update, which sends no signals.
+    instance._order_pks = list(instance.orders.values_list("pk", flat=True))
+
+
+def update_deleted_user_orders_search_document_handler(sender, instance, **kwargs):
+    from ..order.models import Order
+
+    if order_pks := getattr(instance, "_order_pks", None):
+        update_orders_search_document(Order.objects.filter(pk__in=order_pks))
+
+
+def update_address_users_search_document_handler(sender, instance, **kwargs):
+    from .models import User
+
+    users = User.objects.filter(default_shipping_address=instance)
+    for user in users.select_related("default_shipping_address"):
+        update_user_search_document(user)
@@ -0,0 +1,57 @@
+from ..models import User
+from ..search import update_users_search_document
+
+
+def test_user_search_document_set_on_create(customer_user):
+    # then
+    customer_user.refresh_from_db()
+    address = customer_user.default_shipping_address
+    assert customer_user.search_document.split("\n") == [
+        "test@example.com",
+        "leslie",
+        "wade",
+        address.first_name.lower(),
+        address.last_name.lower(),
+        address.city.lower(),
+        address.country.code.lower(),
+        str(address.phone),
+    ]
+
+
+def test_user_search_document_updated_on_address_update(customer_user):
+    # given
+    address = customer_user.default_shipping_address
+
+    # when
+    address.city = "Gdańsk"
+    address.save(update_fields=["city"])
+
+    # then
+    customer_user.refresh_from_db()
+    assert "gdańsk" in customer_user.search_document
+
+
+def test_user_search_document_not_updated_on_unrelated_update(customer_user):
+    # given
+    User.objects.filter(pk=customer_user.pk).update(search_document="")
+
+    # when
+    customer_user.note = "Note"
+    customer_user.save(update_fields=["note"])
+
+    # then
+    customer_user.refresh_from_db()
+    assert customer_user.search_document == ""
+
+
+def test_update_users_search_document(customer_user, staff_user):
+    # given
+    User.objects.filter(pk=customer_user.pk).update(search_document="")
+
+    # when
+    updated_count = update_users_search_document(User.objects.all(), batch_size=1)
+
+    # then
+    assert updated_count == 1
+    customer_user.refresh_from_db()
+    assert "leslie" in customer_user.search_document
@@ -1,8 +1,11 @@
 from typing import TYPE_CHECKING, Iterable, Optional
 
+from django.conf import settings
+
 from ..core.prices import quantize_price
 from ..core.taxes import zero_taxed_money
 from ..discount import DiscountInfo
+from .prices_cache import get_checkout_prices_cache_key, get_or_calculate_checkout_price
 
 if TYPE_CHECKING:
     from prices import TaxedMoney
@@ -24,8 +27,17 @@ def checkout_shipping_price(
 
     It takes in account all plugins.
     """
-    calculated_checkout_shipping = manager.calculate_checkout_shipping(
-        checkout_info, lines, address, discounts or []
+    lines = list(lines)
+    calculated_checkout_shipping = get_or_calculate_checkout_price(
+        "shipping_price",
+        lambda: manager.calculate_checkout_shipping(
+            checkout_info, lines, address, discounts or []
+        ),
+        manager,
+        checkout_info,
+        lines,
+        address,
+        discounts,
     )
     return quantize_price(calculated_checkout_shipping, checkout_info.checkout.currency)
 
@@ -42,8 +54,17 @@ def checkout_subtotal(
 
     It takes in account all plugins.
     """
-    calculated_checkout_subtotal = manager.calculate_checkout_subtotal(
-        checkout_info, lines, address, discounts or []
+    lines = list(lines)
+    calculated_checkout_subtotal = get_or_calculate_checkout_price(
+        "subtotal",
+        lambda: manager.calculate_checkout_subtotal(
+            checkout_info, lines, address, discounts or []
+        ),
+        manager,
+        checkout_info,
+        lines,
+        address,
+        discounts,
     )
     return quantize_price(calculated_checkout_subtotal, checkout_info.checkout.currency)
 
@@ -84,12 +105,40 @@ def checkout_total(
 
     It takes in account all plugins.
     """
-    calculated_checkout_total = manager.calculate_checkout_total(
-        checkout_info, lines, address, discounts or []
+    lines = list(lines)
+    calculated_checkout_total = get_or_calculate_checkout_price(
+        "total",
+        lambda: manager.calculate_checkout_total(
+            checkout_info, lines, address, discounts or []
+        ),
+        manager,
+        checkout_info,
+        lines,
+        address,
+        discounts,
     )
     return quantize_price(calculated_checkout_total, checkout_info.checkout.currency)
 
 
+def get_checkout_lines_prices_cache_key(
+    *,
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    discounts: Iterable[DiscountInfo] = [],
+) -> Optional[str]:
+    """Return the key of cached prices to share between totals of the lines.
+
+    It's None when checkout prices aren't cached.
+    """
+    if not settings.CHECKOUT_PRICES_CACHE_TIMEOUT:
+        return None
+    address = checkout_info.shipping_address or checkout_info.billing_address
+    return get_checkout_prices_cache_key(
+        manager, checkout_info, list(lines), address, discounts
+    )
+
+
 def checkout_line_total(
     *,
     manager: "PluginsManager",
@@ -97,17 +146,29 @@ def checkout_line_total(
     lines: Iterable["CheckoutLineInfo"],
     checkout_line_info: "CheckoutLineInfo",
     discounts: Iterable[DiscountInfo] = [],
+    prices_cache_key: Optional[str] = None,
 ) -> "TaxedMoney":
     """Return the total price of provided line, taxes included.
 
-    It takes in account all plugins.
+    It takes in account all plugins. Totals of many lines of the same checkout
+    should share the key from `get_checkout_lines_prices_cache_key`.
     """
     address = checkout_info.shipping_address or checkout_info.billing_address
-    calculated_line_total = manager.calculate_checkout_line_total(
+    lines = list(lines)
+    calculated_line_total = get_or_calculate_checkout_price(
+        f"line_total-{checkout_line_info.line.pk}",
+        lambda: manager.calculate_checkout_line_total(
+            checkout_info,
+            lines,
+            checkout_line_info,
+            address,
+            discounts or [],
+        ),
+        manager,
         checkout_info,
         lines,
-        checkout_line_info,
         address,
-        discounts or [],
+        discounts,
+        cache_key=prices_cache_key,
     )
     return quantize_price(calculated_line_total, checkout_info.checkout.currency)
@@ -1,6 +1,8 @@
+from collections import defaultdict
 from datetime import date
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -35,7 +37,7 @@ from ..payment.models import Payment, Transaction
 from ..payment.utils import store_customer_id
 from ..product.models import ProductTranslation, ProductVariantTranslation
 from ..warehouse.availability import check_stock_quantity_bulk
-from ..warehouse.management import allocate_stocks
+from ..warehouse.management import StockReservation, allocate_stocks, reserve_stocks
 from . import AddressType
 from .checkout_cleaner import clean_checkout_payment, clean_checkout_shipping
 from .models import Checkout
@@ -332,7 +334,8 @@ def _create_order(
     order_data: dict,
     user: User,
     manager: "PluginsManager",
-    site_settings=None
+    site_settings=None,
+    stock_reservation: Optional[StockReservation] = None
 ) -> Order:
     """Create an order from the checkout.
 
@@ -392,7 +395,12 @@ def _create_order(
     OrderLine.objects.bulk_create(order_lines)
 
     country_code = checkout_info.get_country()
-    allocate_stocks(order_lines_info, country_code, checkout_info.channel.slug)
+    allocate_stocks(
+        order_lines_info,
+        country_code,
+        checkout_info.channel.slug,
+        stock_reservation=stock_reservation,
+    )
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
@@ -536,6 +544,27 @@ def _process_payment(
     return txn
 
 
+def reserve_stocks_for_checkout(
+    checkout_info: "CheckoutInfo", lines: Iterable["CheckoutLineInfo"]
+) -> Optional[StockReservation]:
+    """Reserve stocks of the checkout lines with optimistic allocation enabled.
+
+    Has to be called before the transaction completing the checkout, the result is
+    passed to `complete_checkout` and then to `release_stock_reservation`.
+    """
+    if not settings.OPTIMISTIC_STOCK_ALLOCATION:
+        return None
+    variant_quantities: Dict[int, int] = defaultdict(int)
+    for line_info in lines:
+        if line_info.variant.track_inventory:
+            variant_quantities[line_info.variant.pk] += line_info.line.quantity
+    if not variant_quantities:
+        return None
+    return reserve_stocks(
+        variant_quantities, checkout_info.get_country(), checkout_info.channel.slug
+    )
+
+
 def complete_checkout(
     manager: "PluginsManager",
     checkout_info: "CheckoutInfo",
@@ -547,6 +576,7 @@ def complete_checkout(
     site_settings=None,
     tracking_code=None,
     redirect_url=None,
+    stock_reservation: Optional[StockReservation] = None,
 ) -> Tuple[Optional[Order], bool, dict]:
     """Logic required to finalize the checkout and convert it to order.
 
@@ -595,6 +625,7 @@ def complete_checkout(
                 user=user,  # type: ignore
                 manager=manager,
                 site_settings=site_settings,
+                stock_reservation=stock_reservation,
             )
             # remove checkout after order is successfully created
             checkout.delete()
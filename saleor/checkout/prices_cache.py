@@ -0,0 +1,170 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+if TYPE_CHECKING:
+    from prices import TaxedMoney
+
+    from ..account.models import Address
+    from ..discount import DiscountInfo
+    from ..plugins.manager import PluginsManager
+    from .fetch import CheckoutInfo, CheckoutLineInfo
+
+CHECKOUT_PRICES_CACHE_KEY_PREFIX = "checkout-prices"
+
+# Process-wide tier in front of the shared cache, keyed by the same keys. Each
+# entry holds the time until which it can be used.
+_local_prices: "OrderedDict[str, Tuple[float, Dict[str, TaxedMoney]]]" = OrderedDict()
+_local_prices_lock = threading.Lock()
+
+
+def clear_local_checkout_prices():
+    with _local_prices_lock:
+        _local_prices.clear()
+
+
+def _get_address_key(address: Optional["Address"]):
+    if address is None:
+        return None
+    return tuple(sorted(address.as_data().items()))
+
+
+def _get_discounts_key(discounts: Optional[Iterable["DiscountInfo"]]):
+    # Catalogue ids of discounts from the snapshot are frozensets, which cache their
+    # hash, so only other discounts pay for hashing them.
+    return tuple(
+        (
+            discount.sale.pk,
+            getattr(discount.sale, "type", None),
+            tuple(
+                sorted(
+                    (slug, listing.discount_value, listing.currency)
+                    for slug, listing in discount.channel_listings.items()
+                )
+            ),
+            hash(frozenset(discount.product_ids)),
+            hash(frozenset(discount.category_ids)),
+            hash(frozenset(discount.collection_ids)),
+        )
+        for discount in discounts or []
+    )
+
+
+def get_checkout_prices_cache_key(
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+    discounts: Optional[Iterable["DiscountInfo"]],
+) -> str:
+    """Return a key identifying everything the checkout prices are calculated from.
+
+    The key covers the checkout lines, addresses, shipping method, voucher, active
+    discounts, tax codes and rates, and plugins, so any change of the checkout
+    state leads to a new key and cached prices never have to be invalidated.
+
+    Building the key is linear in the number of lines, so calculations of many
+    lines of the same checkout should build it once.
+    """
+    from ..plugins.manager import PLUGINS_CONFIGURATION_VERSION_CACHE_KEY
+    from ..plugins.vatlayer import VAT_RATES_VERSION_CACHE_KEY
+
+    versions = cache.get_many(
+        [PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, VAT_RATES_VERSION_CACHE_KEY]
+    )
+    checkout = checkout_info.checkout
+    shipping_listing = checkout_info.shipping_method_channel_listings
+    state = (
+        checkout.pk,
+        checkout.currency,
+        checkout.channel_id,
+        checkout.country.code,
+        checkout.voucher_code,
+        checkout.discount_amount,
+        checkout_info.shipping_method.pk if checkout_info.shipping_method else None,
+        shipping_listing.price_amount if shipping_listing else None,
+        _get_address_key(address),
+        _get_address_key(checkout_info.shipping_address),
+        _get_address_key(checkout_info.billing_address),
+        tuple(
+            (
+                line_info.line.pk,
+                line_info.line.quantity,
+                line_info.variant.pk,
+                line_info.channel_listing.price_amount,
+                line_info.channel_listing.currency,
+                line_info.product.pk,
+                line_info.product.category_id,
+                line_info.product.product_type_id,
+                line_info.product.charge_taxes,
+                line_info.product.updated_at,
+                # Tax plugins keep tax codes in the metadata.
+                sorted((line_info.product.metadata or {}).items()),
+                sorted((line_info.product.product_type.metadata or {}).items()),
+                tuple(sorted(collection.pk for collection in line_info.collections)),
+            )
+            for line_info in lines
+        ),
+        _get_discounts_key(discounts),
+        tuple((plugin.PLUGIN_ID, plugin.active) for plugin in manager.plugins),
+        versions.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, 0),
+        versions.get(VAT_RATES_VERSION_CACHE_KEY),
+    )
+    state_hash = hashlib.sha256(repr(state).encode("utf-8")).hexdigest()
+    return f"{CHECKOUT_PRICES_CACHE_KEY_PREFIX}-{state_hash}"
+
+
+def _get_prices(cache_key: str) -> Dict[str, "TaxedMoney"]:
+    with _local_prices_lock:
+        entry = _local_prices.get(cache_key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _local_prices.move_to_end(cache_key)
+                return entry[1]
+            del _local_prices[cache_key]
+    return cache.get(cache_key) or {}
+
+
+def _set_prices(cache_key: str, prices: Dict[str, "TaxedMoney"]):
+    timeout = settings.CHECKOUT_PRICES_CACHE_TIMEOUT
+    cache.set(cache_key, prices, timeout=timeout)
+    with _local_prices_lock:
+        _local_prices[cache_key] = (time.monotonic() + timeout, prices)
+        _local_prices.move_to_end(cache_key)
+        while len(_local_prices) > settings.CHECKOUT_PRICES_LOCAL_CACHE_SIZE:
+            _local_prices.popitem(last=False)
+
+
+def get_or_calculate_checkout_price(
+    price_name: str,
+    calculate: Callable[[], "TaxedMoney"],
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+    discounts: Optional[Iterable["DiscountInfo"]],
+    cache_key: Optional[str] = None,
+) -> "TaxedMoney":
+    """Return the cached price of the checkout state or calculate and store it.
+
+    Prices are looked up in the process memory first and in the shared cache next,
+    the calculation runs only when neither of them has the price. A key already
+    built for the same checkout state can be passed to skip building it again.
+    """
+    if not settings.CHECKOUT_PRICES_CACHE_TIMEOUT:
+        return calculate()
+    if cache_key is None:
+        cache_key = get_checkout_prices_cache_key(
+            manager, checkout_info, lines, address, discounts
+        )
+    prices = _get_prices(cache_key)
+    if price_name in prices:
+        return prices[price_name]
+    price = calculate()
+    _set_prices(cache_key, {**prices, price_name: price})
+    return price
@@ -0,0 +1,125 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db import connection
+
+from ....core.transactions import transaction_with_commit_on_errors
+from ....order.models import Order
+from ....payment import ChargeStatus, TransactionKind
+from ....payment.models import Payment
+from ....plugins.manager import get_plugins_manager
+from ....warehouse.management import release_stock_reservation
+from ....warehouse.models import Stock
+from ... import calculations
+from ...complete_checkout import complete_checkout, reserve_stocks_for_checkout
+from ...fetch import fetch_checkout_info, fetch_checkout_lines
+from ...models import Checkout, CheckoutLine
+
+CHECKOUTS_COUNT = 100
+WORKERS_COUNT = 10
+STOCK_QUANTITY = 80
+
+
+@pytest.fixture
+def flash_sale_checkouts(channel_USD, product, address, shipping_method):
+    variant = product.variants.get()
+    Stock.objects.filter(product_variant=variant).update(
+        quantity=STOCK_QUANTITY, quantity_allocated=0
+    )
+    manager = get_plugins_manager()
+    checkouts = []
+    for _ in range(CHECKOUTS_COUNT):
+        checkout = Checkout.objects.create(
+            currency=channel_USD.currency_code,
+            channel=channel_USD,
+            email="customer@example.com",
+            shipping_address=address.get_copy(),
+            billing_address=address.get_copy(),
+            shipping_method=shipping_method,
+        )
+        CheckoutLine.objects.create(checkout=checkout, variant=variant, quantity=1)
+        lines = fetch_checkout_lines(checkout)
+        checkout_info = fetch_checkout_info(checkout, lines, [], manager)
+        total = calculations.checkout_total(
+            manager=manager,
+            checkout_info=checkout_info,
+            lines=lines,
+            address=checkout.shipping_address,
+        )
+        payment = Payment.objects.create(
+            gateway="mirumee.payments.dummy",
+            is_active=True,
+            total=total.gross.amount,
+            captured_amount=total.gross.amount,
+            charge_status=ChargeStatus.FULLY_CHARGED,
+            currency=total.currency,
+            checkout=checkout,
+        )
+        payment.transactions.create(
+            amount=payment.total,
+            kind=TransactionKind.CAPTURE,
+            gateway_response={},
+            is_success=True,
+        )
+        checkouts.append(checkout)
+    return checkouts
+
+
+def complete_checkout_in_thread(checkout_pk):
+    """Complete the checkout the way the mutation does and return the duration."""
+    try:
+        manager = get_plugins_manager()
+        checkout = Checkout.objects.get(pk=checkout_pk)
+        lines = fetch_checkout_lines(checkout)
+        checkout_info = fetch_checkout_info(checkout, lines, [], manager)
+        start = time.perf_counter()
+        stock_reservation = reserve_stocks_for_checkout(checkout_info, lines)
+        try:
+            with transaction_with_commit_on_errors():
+                complete_checkout(
+                    manager=manager,
+                    checkout_info=checkout_info,
+                    lines=lines,
+                    payment_data={},
+                    store_source=False,
+                    discounts=[],
+                    user=AnonymousUser(),
+                    stock_reservation=stock_reservation,
+                )
+        except ValidationError:
+            # Checkouts over the stock quantity fail with insufficient stock.
+            pass
+        finally:
+            if stock_reservation:
+                release_stock_reservation(stock_reservation)
+        return time.perf_counter() - start
+    finally:
+        connection.close()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("optimistic", [False, True])
+def test_complete_checkout_concurrency(
+    optimistic, flash_sale_checkouts, product, settings, record_property
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = optimistic
+    checkout_pks = [checkout.pk for checkout in flash_sale_checkouts]
+
+    # when
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS_COUNT) as executor:
+        durations = sorted(executor.map(complete_checkout_in_thread, checkout_pks))
+    total_duration = time.perf_counter() - start
+
+    # then
+    assert Order.objects.count() == STOCK_QUANTITY
+    stock = Stock.objects.get(product_variant__product=product)
+    assert stock.quantity_allocated == STOCK_QUANTITY
+    record_property("allocation", "optimistic" if optimistic else "locking")
+    record_property("checkouts_per_second", len(durations) / total_duration)
+    record_property("p99_seconds", durations[math.ceil(len(durations) * 0.99) - 1])
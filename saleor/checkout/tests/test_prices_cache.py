@@ -0,0 +1,273 @@
+from unittest.mock import patch
+
+import pytest
+from prices import Money, TaxedMoney
+
+from ...plugins.manager import get_plugins_manager
+from ...plugins.vatlayer import invalidate_vat_rates
+from .. import calculations
+from ..fetch import fetch_checkout_info, fetch_checkout_lines
+from ..prices_cache import (
+    _local_prices,
+    clear_local_checkout_prices,
+    get_checkout_prices_cache_key,
+    get_or_calculate_checkout_price,
+)
+
+TOTAL = TaxedMoney(net=Money(10, "USD"), gross=Money(12, "USD"))
+
+
+@pytest.fixture
+def prices_cache_enabled(settings):
+    settings.CHECKOUT_PRICES_CACHE_TIMEOUT = 60
+    settings.CHECKOUT_PRICES_LOCAL_CACHE_SIZE = 10
+
+
+def _get_checkout_info(checkout, discounts=()):
+    manager = get_plugins_manager()
+    lines = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, discounts, manager)
+    return manager, checkout_info, lines
+
+
+@patch("saleor.plugins.manager.PluginsManager.calculate_checkout_total")
+def test_checkout_total_cached(
+    calculate_checkout_total_mock, prices_cache_enabled, checkout_with_item, address
+):
+    # given
+    calculate_checkout_total_mock.return_value = TOTAL
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    calculations.checkout_total(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+
+    # when
+    total = calculations.checkout_total(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+
+    # then
+    assert total == TOTAL
+    calculate_checkout_total_mock.assert_called_once()
+
+
+@patch("saleor.plugins.manager.PluginsManager.calculate_checkout_total")
+def test_checkout_total_cached_in_shared_cache(
+    calculate_checkout_total_mock, prices_cache_enabled, checkout_with_item, address
+):
+    # given
+    calculate_checkout_total_mock.return_value = TOTAL
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    calculations.checkout_total(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+    clear_local_checkout_prices()
+
+    # when
+    total = calculations.checkout_total(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+
+    # then
+    assert total == TOTAL
+    calculate_checkout_total_mock.assert_called_once()
+    assert len(_local_prices) == 1
+
+
+@patch("saleor.plugins.manager.PluginsManager.calculate_checkout_total")
+def test_checkout_total_not_cached_when_cache_disabled(
+    calculate_checkout_total_mock, settings, checkout_with_item, address
+):
+    # given
+    settings.CHECKOUT_PRICES_CACHE_TIMEOUT = 0
+    calculate_checkout_total_mock.return_value = TOTAL
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+
+    # when
+    for _ in range(2):
+        calculations.checkout_total(
+            manager=manager, checkout_info=checkout_info, lines=lines, address=address
+        )
+
+    # then
+    assert calculate_checkout_total_mock.call_count == 2
+    assert not _local_prices
+
+
+def test_local_prices_limited_to_cache_size(
+    settings, prices_cache_enabled, checkout_with_item, address
+):
+    # given
+    settings.CHECKOUT_PRICES_LOCAL_CACHE_SIZE = 1
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    calculations.checkout_subtotal(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+    line = checkout_with_item.lines.first()
+    line.quantity += 1
+    line.save(update_fields=["quantity"])
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+
+    # when
+    calculations.checkout_subtotal(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+
+    # then
+    cache_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, None
+    )
+    assert list(_local_prices) == [cache_key]
+
+
+def test_cache_key_changes_with_line_quantity(checkout_with_item, address):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, None)
+    line = checkout_with_item.lines.first()
+    line.quantity += 1
+    line.save(update_fields=["quantity"])
+
+    # when
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, None
+    )
+
+    # then
+    assert new_key != key
+
+
+def test_cache_key_changes_with_address(checkout_with_item, address, address_usa):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+
+    # when
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, None)
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address_usa, None
+    )
+
+    # then
+    assert new_key != key
+
+
+def test_cache_key_changes_with_discounts(checkout_with_item, address, discount_info):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+
+    # when
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, [])
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, [discount_info]
+    )
+
+    # then
+    assert new_key != key
+
+
+def test_cache_key_stable_for_same_checkout_state(checkout_with_item, address):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, None)
+
+    # when
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, None
+    )
+
+    # then
+    assert new_key == key
+
+
+def test_cache_key_changes_with_tax_rates(checkout_with_item, address):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, None)
+
+    # when
+    invalidate_vat_rates()
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, None
+    )
+
+    # then
+    assert new_key != key
+
+
+def test_cache_key_changes_with_product_type_tax_code(checkout_with_item, address):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    key = get_checkout_prices_cache_key(manager, checkout_info, lines, address, None)
+    product_type = lines[0].product.product_type
+    product_type.store_value_in_metadata({"vatlayer.code": "books"})
+    product_type.save(update_fields=["metadata"])
+
+    # when
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+    new_key = get_checkout_prices_cache_key(
+        manager, checkout_info, lines, address, None
+    )
+
+    # then
+    assert new_key != key
+
+
+@patch(
+    "saleor.checkout.prices_cache.get_checkout_prices_cache_key",
+    wraps=get_checkout_prices_cache_key,
+)
+@patch(
+    "saleor.checkout.calculations.get_checkout_prices_cache_key",
+    wraps=get_checkout_prices_cache_key,
+)
+def test_checkout_line_totals_share_cache_key(
+    get_lines_key_mock,
+    get_key_mock,
+    prices_cache_enabled,
+    checkout_with_items,
+):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_items)
+
+    # when
+    prices_cache_key = calculations.get_checkout_lines_prices_cache_key(
+        manager=manager, checkout_info=checkout_info, lines=lines
+    )
+    for line_info in lines:
+        calculations.checkout_line_total(
+            manager=manager,
+            checkout_info=checkout_info,
+            lines=lines,
+            checkout_line_info=line_info,
+            prices_cache_key=prices_cache_key,
+        )
+
+    # then
+    get_lines_key_mock.assert_called_once()
+    get_key_mock.assert_not_called()
+    assert len(_local_prices[prices_cache_key][1]) == len(lines)
+
+
+def test_get_or_calculate_checkout_price_uses_given_key(
+    prices_cache_enabled, checkout_with_item, address
+):
+    # given
+    manager, checkout_info, lines = _get_checkout_info(checkout_with_item)
+
+    # when
+    price = get_or_calculate_checkout_price(
+        "total",
+        lambda: TOTAL,
+        manager,
+        checkout_info,
+        lines,
+        address,
+        None,
+        cache_key="checkout-prices-key",
+    )
+
+    # then
+    assert price == TOTAL
+    assert list(_local_prices) == ["checkout-prices-key"]
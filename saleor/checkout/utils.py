@@ -328,6 +328,9 @@ def get_prices_of_discounted_specific_product(
     )
     address = checkout_info.shipping_address or checkout_info.billing_address
     discounts = discounts or []
+    prices_cache_key = calculations.get_checkout_lines_prices_cache_key(
+        manager=manager, checkout_info=checkout_info, lines=lines, discounts=discounts
+    )
 
     for line_info in discounted_lines:
         line = line_info.line
@@ -337,6 +340,7 @@ def get_prices_of_discounted_specific_product(
             lines=lines,
             checkout_line_info=line_info,
             discounts=discounts,
+            prices_cache_key=prices_cache_key,
         ).gross
         line_unit_price = manager.calculate_checkout_line_unit_price(
             line_total,
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ....warehouse.management import (
+    get_stocks_with_invalid_quantity_allocated,
+    recalculate_stocks_quantity_allocated,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks if allocated quantities of stocks match the sum of their "
+        "allocations. Use --fix to recalculate the invalid ones. With optimistic "
+        "stock allocation, stocks reserved by checkouts being completed are "
+        "reported as invalid, so don't use --fix while checkouts are completed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recalculate allocated quantities of invalid stocks.",
+        )
+
+    def handle(self, *args, **options):
+        stocks = get_stocks_with_invalid_quantity_allocated().values_list(
+            "pk", "quantity_allocated", "allocations_quantity"
+        )
+        for pk, quantity_allocated, allocations_quantity in stocks:
+            self.stdout.write(
+                f"Stock {pk} has {quantity_allocated} allocated items, "
+                f"its allocations sum up to {allocations_quantity}."
+            )
+        if not stocks:
+            self.stdout.write("Allocated quantities of all stocks are valid.")
+            return
+
+        if settings.OPTIMISTIC_STOCK_ALLOCATION:
+            self.stderr.write(
+                self.style.WARNING(
+                    "Quantities reserved by checkouts being completed have no "
+                    "allocations yet and are reported as invalid. Don't use --fix "
+                    "while checkouts are completed."
+                )
+            )
+        if not options["fix"]:
+            raise CommandError(f"Found {len(stocks)} invalid stocks.")
+
+        updated_count = recalculate_stocks_quantity_allocated()
+        self.stdout.write(f"Recalculated allocated quantity of {updated_count} stocks.")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ....account.models import User
+from ....account.search import update_users_search_document
+from ....order.models import Order
+from ....order.search import update_orders_search_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Updates search documents of users and orders. Documents are maintained "
+        "when users and orders change, so the command is needed only to populate "
+        "documents of existing data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of objects updated at once.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        updated_count = update_users_search_document(User.objects.all(), batch_size)
+        self.stdout.write(f"Updated search documents of {updated_count} users.")
+        updated_count = update_orders_search_document(Order.objects.all(), batch_size)
+        self.stdout.write(f"Updated search documents of {updated_count} orders.")
@@ -8,7 +8,7 @@ from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 
-from ..discount.utils import fetch_discounts
+from ..discount.utils import fetch_cached_discounts
 from ..plugins.manager import get_plugins_manager
 from . import analytics
 from .jwt import JWT_REFRESH_TOKEN_COOKIE_NAME, jwt_decode_with_exception_handler
@@ -51,7 +51,7 @@ def discounts(get_response):
 
     def _discounts_middleware(request):
         request.discounts = SimpleLazyObject(
-            lambda: fetch_discounts(request.request_time)
+            lambda: fetch_cached_discounts(request.request_time)
         )
         return get_response(request)
 
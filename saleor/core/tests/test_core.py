@@ -19,6 +19,7 @@ from ...giftcard.models import GiftCard
 from ...order.models import Order
 from ...product.models import ProductMedia, ProductType
 from ...shipping.models import ShippingZone
+from ...warehouse.models import Stock
 from ..storages import S3MediaStorage
 from ..templatetags.placeholder import placeholder
 from ..utils import (
@@ -361,3 +362,57 @@ def test_delete_versatile_image(product_with_image, media_root):
     assert not default_storage.exists(img_name)
     assert not default_storage.exists(thumb_400x400)
     assert not default_storage.exists(thumb_400x400)
+
+
+def test_check_stock_allocations_with_valid_stocks(allocation):
+    out = io.StringIO()
+    call_command("check_stock_allocations", stdout=out)
+    assert "are valid" in out.getvalue()
+
+
+def test_check_stock_allocations_with_invalid_stocks(allocation):
+    Stock.objects.filter(pk=allocation.stock_id).update(quantity_allocated=0)
+
+    with pytest.raises(CommandError):
+        call_command("check_stock_allocations", stdout=io.StringIO())
+
+    stock = Stock.objects.get(pk=allocation.stock_id)
+    assert stock.quantity_allocated == 0
+
+
+def test_check_stock_allocations_fix(allocation):
+    Stock.objects.filter(pk=allocation.stock_id).update(quantity_allocated=0)
+
+    call_command("check_stock_allocations", "--fix", stdout=io.StringIO())
+
+    stock = Stock.objects.get(pk=allocation.stock_id)
+    assert stock.quantity_allocated == allocation.quantity_allocated
+
+
+def test_check_stock_allocations_warns_about_reservations(allocation, settings):
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    Stock.objects.filter(pk=allocation.stock_id).update(quantity_allocated=0)
+    err = io.StringIO()
+
+    with pytest.raises(CommandError):
+        call_command("check_stock_allocations", stdout=io.StringIO(), stderr=err)
+
+    assert "Don't use --fix while checkouts are completed." in err.getvalue()
+
+
+def test_update_search_documents(order, customer_user):
+    # given
+    Order.objects.update(search_document="")
+    User.objects.update(search_document="")
+    out = io.StringIO()
+
+    # when
+    call_command("update_search_documents", stdout=out)
+
+    # then
+    assert "of 1 users" in out.getvalue()
+    assert "of 1 orders" in out.getvalue()
+    order.refresh_from_db()
+    assert "test@example.com" in order.search_document
+    customer_user.refresh_from_db()
+    assert "test@example.com" in customer_user.search_document
@@ -13,7 +13,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.sites.models import Site
 from django.core.files import File
-from django.db.models import F, Q
+from django.db.models import Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
@@ -50,7 +50,7 @@ from ...discount.models import Sale, SaleChannelListing, Voucher, VoucherChannel
 from ...discount.utils import fetch_discounts
 from ...giftcard.models import GiftCard
 from ...menu.models import Menu
-from ...order import OrderStatus
+from ...order import OrderLineData, OrderStatus
 from ...order.models import Fulfillment, Order, OrderLine
 from ...order.utils import update_order_status
 from ...page.models import Page, PageType
@@ -82,7 +82,7 @@ from ...shipping.models import (
     ShippingMethodType,
     ShippingZone,
 )
-from ...warehouse.management import increase_stock
+from ...warehouse.management import deallocate_stock, increase_stock
 from ...warehouse.models import Stock, Warehouse
 
 fake = Factory.create()
@@ -640,8 +640,7 @@ def create_fulfillments(order):
             line.quantity_fulfilled = quantity
             line.save(update_fields=["quantity_fulfilled"])
 
-            allocation.quantity_allocated = F("quantity_allocated") - quantity
-            allocation.save(update_fields=["quantity_allocated"])
+            deallocate_stock([OrderLineData(line=line, quantity=quantity)])
 
     update_order_status(order)
 
@@ -0,0 +1,10 @@
+from typing import Any, Iterable
+
+
+def prepare_search_document(values: Iterable[Any]) -> str:
+    """Join searchable values into a lowercased document, one value per line.
+
+    Searching the document with `contains` on a lowercased phrase matches the same
+    rows as `icontains` on each of the values, but can use a trigram index.
+    """
+    return "\n".join(str(value).lower() for value in values if value)
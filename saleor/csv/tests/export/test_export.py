@@ -1,11 +1,9 @@
 import json
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import graphene
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
 from freezegun import freeze_time
@@ -15,7 +13,6 @@ from ....graphql.csv.enums import ProductFieldEnum
 from ....product.models import Product, ProductChannelListing
 from ... import FileTypes
 from ...utils.export import (
-    append_to_file,
     create_file_with_headers,
     export_products,
     export_products_in_batches,
@@ -23,6 +20,7 @@ from ...utils.export import (
     get_product_queryset,
     save_csv_file_in_export_file,
 )
+from ...utils.writers import BackgroundExportWriter, ExportWriter
 
 
 @pytest.mark.parametrize(
@@ -50,8 +48,9 @@ def test_export_products(
         "channels": [],
     }
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportWriter)
+    mock_writer.temporary_file = MagicMock(spec=File)
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(user_export_file, {"all": ""}, export_info, file_type)
@@ -69,12 +68,13 @@ def test_export_products(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file)
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    mock_writer.close.assert_called_once_with()
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_writer.temporary_file, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -97,8 +97,9 @@ def test_export_products_ids(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportWriter)
+    mock_writer.temporary_file = MagicMock(spec=File)
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(user_export_file, {"ids": pks}, export_info, file_type)
@@ -116,12 +117,13 @@ def test_export_products_ids(
         export_info,
         {"id"},
         ["id"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file)
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    mock_writer.close.assert_called_once_with()
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_writer.temporary_file, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -148,8 +150,9 @@ def test_export_products_filter_is_published(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportWriter)
+    mock_writer.temporary_file = MagicMock(spec=File)
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(
@@ -173,12 +176,13 @@ def test_export_products_filter_is_published(
         export_info,
         {"id"},
         ["id"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file)
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    mock_writer.close.assert_called_once_with()
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_writer.temporary_file, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -204,8 +208,9 @@ def test_export_products_filter_collections(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportWriter)
+    mock_writer.temporary_file = MagicMock(spec=File)
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(
@@ -225,9 +230,12 @@ def test_export_products_filter_collections(
     assert export_products_in_batches_mock.call_count == 1
     batch_args, _ = export_products_in_batches_mock.call_args
     assert set(batch_args[0].values_list("pk", flat=True)) == {product_list[-1].pk}
-    assert batch_args[1:] == (export_info, {"id"}, ["id"], ";", mock_file, file_type)
+    assert batch_args[1:] == (export_info, {"id"}, ["id"], mock_writer)
     send_email_mock.assert_called_once_with(user_export_file)
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    mock_writer.close.assert_called_once_with()
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_writer.temporary_file, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -251,8 +259,9 @@ def test_export_products_by_app(
     }
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportWriter)
+    mock_writer.temporary_file = MagicMock(spec=File)
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(app_export_file, {"all": ""}, export_info, file_type)
@@ -271,14 +280,15 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(app_export_file)
 
-    save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
+    mock_writer.close.assert_called_once_with()
+    save_file_mock.assert_called_once_with(
+        app_export_file, mock_writer.temporary_file, ANY
+    )
 
 
 def test_get_filename_csv():
@@ -325,12 +335,11 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    csv_file = create_file_with_headers(file_headers, ";", FileTypes.CSV)
+    writer = create_file_with_headers(file_headers, ";", FileTypes.CSV)
+    writer.close()
 
     # then
-    assert csv_file
-
-    file_content = csv_file.read().decode().split("\r\n")
+    file_content = writer.temporary_file.read().decode().split("\r\n")
 
     assert ";".join(file_headers) in file_content
 
@@ -344,12 +353,11 @@ def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    xlsx_file = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
+    writer = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
+    writer.close()
 
     # then
-    assert xlsx_file
-
-    wb_obj = openpyxl.load_workbook(xlsx_file)
+    wb_obj = openpyxl.load_workbook(writer.temporary_file)
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
@@ -375,7 +383,7 @@ def test_save_csv_file_in_export_file(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
+def test_write_rows_for_csv(user_export_file, tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
@@ -384,17 +392,14 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    writer = create_file_with_headers(headers, delimiter, FileTypes.CSV)
+    temp_file = writer.temporary_file
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    writer.write_rows(export_data, headers)
+    writer.close()
 
     # then
-    user_export_file.refresh_from_db()
-
     file_content = temp_file.read().decode().split("\r\n")
     assert ";".join(headers) in file_content
     assert ";".join(export_data[0].values()) in file_content
@@ -404,7 +409,7 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
+def test_write_rows_for_xlsx(user_export_file, tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
@@ -413,19 +418,14 @@ def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
     expected_headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = create_file_with_headers(expected_headers, delimiter, FileTypes.XLSX)
+    temp_file = writer.temporary_file
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
+    writer.write_rows(export_data, expected_headers)
+    writer.close()
 
     # then
-    user_export_file.refresh_from_db()
-
     wb_obj = openpyxl.load_workbook(temp_file)
 
     sheet_obj = wb_obj.active
@@ -473,10 +473,8 @@ def test_export_products_in_batches_for_csv(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=";")
+    writer = create_file_with_headers(expected_headers, ";", FileTypes.CSV)
+    temp_file = writer.temporary_file
 
     # when
     export_products_in_batches(
@@ -484,10 +482,9 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.CSV,
+        writer,
     )
+    writer.close()
 
     # then
 
@@ -542,10 +539,8 @@ def test_export_products_in_batches_for_xlsx(
     export_fields = ["id", "name", "description_as_str", "variants__sku"]
     expected_headers = ["id", "name", "description", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = create_file_with_headers(expected_headers, ";", FileTypes.XLSX)
+    temp_file = writer.temporary_file
 
     # when
     export_products_in_batches(
@@ -553,10 +548,9 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.XLSX,
+        writer,
     )
+    writer.close()
 
     # then
     expected_data = []
@@ -588,3 +582,18 @@ def test_export_products_in_batches_for_xlsx(
         assert row in data
 
     shutil.rmtree(tmpdir)
+
+
+def test_background_export_writer_raises_writer_errors():
+    # given
+    writer = MagicMock(spec=ExportWriter)
+    writer.write_rows.side_effect = ValueError("Disk is full.")
+
+    # when
+    with pytest.raises(ValueError):
+        with BackgroundExportWriter(writer) as background_writer:
+            for _ in range(5):
+                background_writer.write_rows([{"id": "123"}], ["id"])
+
+    # then
+    writer.write_rows.assert_called_once_with([{"id": "123"}], ["id"])
@@ -1,14 +1,12 @@
-from tempfile import NamedTemporaryFile
-from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
+from typing import IO, TYPE_CHECKING, Dict, List, Set, Union
 
-import petl as etl
 from django.utils import timezone
 
 from ...product.models import Product
-from .. import FileTypes
 from ..notifications import send_export_download_link_notification
 from .product_headers import get_export_fields_and_headers_info
 from .products_data import get_products_data
+from .writers import BackgroundExportWriter, ExportWriter, create_export_writer
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -34,20 +32,19 @@ def export_products(
         export_info
     )
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    writer = create_file_with_headers(file_headers, delimiter, file_type)
 
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        writer,
     )
+    writer.close()
 
-    save_csv_file_in_export_file(export_file, temporary_file, file_name)
-    temporary_file.close()
+    save_csv_file_in_export_file(export_file, writer.temporary_file, file_name)
+    writer.temporary_file.close()
 
     send_export_download_link_notification(export_file)
 
@@ -98,57 +95,37 @@ def export_products_in_batches(
     export_info: Dict[str, list],
     export_fields: Set[str],
     headers: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: ExportWriter,
 ):
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
     channels = export_info.get("channels")
 
-    for batch_pks in queryset_in_batches(queryset):
-        product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
-            "attributes",
-            "variants",
-            "collections",
-            "media",
-            "product_type",
-            "category",
-        )
-
-        export_data = get_products_data(
-            product_batch, export_fields, attributes, warehouses, channels
-        )
-
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
-
-
-def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
-
-    if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
-    else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
-
-    return temp_file
-
-
-def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
-    headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
-):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
-
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
+    # Rows of a batch are written to the file while the next batch is fetched.
+    with BackgroundExportWriter(writer) as background_writer:
+        for batch_pks in queryset_in_batches(queryset):
+            product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
+                "attributes",
+                "variants",
+                "collections",
+                "media",
+                "product_type",
+                "category",
+            )
+
+            export_data = get_products_data(
+                product_batch, export_fields, attributes, warehouses, channels
+            )
+
+            background_writer.write_rows(export_data, headers)
+
+
+def create_file_with_headers(
+    file_headers: List[str], delimiter: str, file_type: str
+) -> ExportWriter:
+    writer = create_export_writer(file_type, delimiter)
+    writer.write_headers(file_headers)
+    return writer
 
 
 def save_csv_file_in_export_file(
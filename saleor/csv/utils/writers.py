@@ -0,0 +1,123 @@
+import csv
+import queue
+import threading
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from openpyxl import Workbook
+
+from .. import FileTypes
+
+ExportData = List[Dict[str, Union[str, bool]]]
+
+# Value of the cells which are missing in the exported data.
+MISSING_VALUE = " "
+
+
+class ExportWriter:
+    """Write exported rows to a temporary file which is kept open for the export.
+
+    Rows are streamed to the file, so the memory usage doesn't depend on the size
+    of the export.
+    """
+
+    suffix = ""
+
+    def __init__(self):
+        self.temporary_file = NamedTemporaryFile("ab+", suffix=self.suffix)
+
+    def write_headers(self, headers: List[str]):
+        self.write_row(headers)
+
+    def write_rows(self, export_data: ExportData, headers: List[str]):
+        for data in export_data:
+            self.write_row([data.get(header, MISSING_VALUE) for header in headers])
+
+    def write_row(self, row: List[Any]):
+        raise NotImplementedError()
+
+    def close(self):
+        """Flush all rows to the temporary file."""
+        raise NotImplementedError()
+
+
+class CSVExportWriter(ExportWriter):
+    suffix = ".csv"
+
+    def __init__(self, delimiter: str):
+        super().__init__()
+        self.stream = open(self.temporary_file.name, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.stream, delimiter=delimiter)
+
+    def write_row(self, row: List[Any]):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.stream.close()
+
+
+class XLSXExportWriter(ExportWriter):
+    suffix = ".xlsx"
+
+    def __init__(self):
+        super().__init__()
+        # The write-only workbook keeps rows on the disk instead of in memory.
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet()
+
+    def write_row(self, row: List[Any]):
+        self.worksheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.temporary_file.name)
+
+
+def create_export_writer(file_type: str, delimiter: str) -> ExportWriter:
+    if file_type == FileTypes.CSV:
+        return CSVExportWriter(delimiter)
+    return XLSXExportWriter()
+
+
+class BackgroundExportWriter:
+    """Write rows in a separate thread while the next batches are prepared.
+
+    At most `max_pending_batches` batches wait for the writer, which bounds the
+    memory used by the export. Errors raised by the writer are re-raised in the
+    calling thread.
+    """
+
+    def __init__(self, writer: ExportWriter, max_pending_batches: int = 2):
+        self.writer = writer
+        self.queue: "queue.Queue[Optional[Tuple[ExportData, List[str]]]]" = queue.Queue(
+            maxsize=max_pending_batches
+        )
+        self.error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self._write_batches, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error and not exc_type:
+            raise self.error
+
+    def write_rows(self, export_data: ExportData, headers: List[str]):
+        if self.error:
+            raise self.error
+        self.queue.put((export_data, headers))
+
+    def _write_batches(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            if self.error:
+                # Keep consuming batches, so that the producer is never blocked.
+                continue
+            try:
+                self.writer.write_rows(*batch)
+            except Exception as e:
+                self.error = e
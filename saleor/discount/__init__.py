@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Union
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Set, Union
 
 from django.conf import settings
 
+default_app_config = "saleor.discount.app.DiscountAppConfig"
+
 if TYPE_CHECKING:
     # flake8: noqa
     from .models import Sale, SaleChannelListing, Voucher
@@ -40,6 +42,6 @@ class VoucherType:
 class DiscountInfo:
     sale: Union["Sale", "Voucher"]
     channel_listings: Dict[str, "SaleChannelListing"]
-    product_ids: Union[List[int], Set[int]]
-    category_ids: Union[List[int], Set[int]]
-    collection_ids: Union[List[int], Set[int]]
+    product_ids: Union[List[int], Set[int], FrozenSet[int]]
+    category_ids: Union[List[int], Set[int], FrozenSet[int]]
+    collection_ids: Union[List[int], Set[int], FrozenSet[int]]
@@ -0,0 +1,38 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from ..channel.models import Channel
+        from ..product.models import Category
+        from .models import Sale, SaleChannelListing
+        from .signals import invalidate_discounts_snapshot_handler
+
+        # Categories are included as their descendants are discounted too.
+        for model in (Sale, SaleChannelListing, Category):
+            model_name = model._meta.model_name
+            post_save.connect(
+                invalidate_discounts_snapshot_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_discounts_snapshot_on_{model_name}_save",
+            )
+            post_delete.connect(
+                invalidate_discounts_snapshot_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_discounts_snapshot_on_{model_name}_delete",
+            )
+        # Channel listings of sales in the snapshot are keyed by channel slug.
+        post_save.connect(
+            invalidate_discounts_snapshot_handler,
+            sender=Channel,
+            dispatch_uid="invalidate_discounts_snapshot_on_channel_save",
+        )
+        for field_name in ("products", "categories", "collections"):
+            m2m_changed.connect(
+                invalidate_discounts_snapshot_handler,
+                sender=getattr(Sale, field_name).through,
+                dispatch_uid=f"invalidate_discounts_snapshot_on_sale_{field_name}",
+            )
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Set, Tuple
+
+from . import DiscountInfo
+
+if TYPE_CHECKING:
+    from ..product.models import Product
+
+
+class _ChannelDiscountsIndex:
+    def __init__(self):
+        self.by_product: Dict[int, List[int]] = defaultdict(list)
+        self.by_category: Dict[int, List[int]] = defaultdict(list)
+        self.by_collection: Dict[int, List[int]] = defaultdict(list)
+
+
+class DiscountsIndex(Sequence[DiscountInfo]):
+    """Discounts with an inverted index of the products, categories and collections.
+
+    It behaves like a sequence of `DiscountInfo`, so it can be used wherever a list
+    of discounts is expected, while discounts of a product are found without
+    testing every sale.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo]):
+        self._discounts: Tuple[DiscountInfo, ...] = tuple(discounts)
+        self._channels: Dict[str, _ChannelDiscountsIndex] = defaultdict(
+            _ChannelDiscountsIndex
+        )
+        for position, discount in enumerate(self._discounts):
+            # Sales without a listing in a channel don't apply to its products.
+            for channel_slug in discount.channel_listings:
+                channel_index = self._channels[channel_slug]
+                for product_id in discount.product_ids:
+                    channel_index.by_product[product_id].append(position)
+                for category_id in discount.category_ids:
+                    channel_index.by_category[category_id].append(position)
+                for collection_id in discount.collection_ids:
+                    channel_index.by_collection[collection_id].append(position)
+        self._channels = dict(self._channels)
+
+    def __getitem__(self, index):
+        return self._discounts[index]
+
+    def __len__(self) -> int:
+        return len(self._discounts)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._discounts)!r})"
+
+    def get_product_discounts(
+        self, product: "Product", product_collections: Set[int], channel_slug: str
+    ) -> List[DiscountInfo]:
+        """Return discounts of sales the product is on, in their original order."""
+        channel_index = self._channels.get(channel_slug)
+        if channel_index is None:
+            return []
+        positions = set(channel_index.by_product.get(product.id, ()))
+        positions.update(channel_index.by_category.get(product.category_id, ()))
+        for collection_id in product_collections:
+            positions.update(channel_index.by_collection.get(collection_id, ()))
+        return [self._discounts[position] for position in sorted(positions)]
@@ -0,0 +1,5 @@
+from .utils import invalidate_discounts_snapshot
+
+
+def invalidate_discounts_snapshot_handler(sender, **kwargs):
+    invalidate_discounts_snapshot()
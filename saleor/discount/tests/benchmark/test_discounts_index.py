@@ -0,0 +1,88 @@
+import random
+import timeit
+
+import pytest
+from prices import Money
+
+from ....channel.models import Channel
+from ....product.models import Collection, Product
+from ... import DiscountInfo, DiscountValueType
+from ...index import DiscountsIndex
+from ...models import Sale, SaleChannelListing
+from ...utils import calculate_discounted_price
+
+SALES_COUNT = 500
+PRODUCTS_PER_PAGE = 100
+PAGES_PER_RUN = 20
+
+
+@pytest.fixture
+def benchmark_channel():
+    return Channel(slug="benchmark", currency_code="USD")
+
+
+@pytest.fixture
+def active_sales(benchmark_channel):
+    # Sales aren't saved, pricing works on the fetched discounts only.
+    rng = random.Random(0)
+    discounts = []
+    for pk in range(1, SALES_COUNT + 1):
+        sale = Sale(id=pk, type=DiscountValueType.PERCENTAGE)
+        listing = SaleChannelListing(sale=sale, discount_value=pk % 50, currency="USD")
+        discounts.append(
+            DiscountInfo(
+                sale=sale,
+                channel_listings={benchmark_channel.slug: listing},
+                product_ids=frozenset(rng.sample(range(1, 10001), 20)),
+                category_ids=frozenset(rng.sample(range(1, 201), 2)),
+                collection_ids=frozenset(rng.sample(range(1, 101), 2)),
+            )
+        )
+    return discounts
+
+
+@pytest.fixture
+def product_listing_page():
+    rng = random.Random(1)
+    return [
+        (Product(id=pk, category_id=rng.randint(1, 200)), {rng.randint(1, 100)})
+        for pk in rng.sample(range(1, 10001), PRODUCTS_PER_PAGE)
+    ]
+
+
+def price_listing_page(products, discounts, channel):
+    return [
+        calculate_discounted_price(
+            product=product,
+            price=Money(100, "USD"),
+            collections=[Collection(id=pk) for pk in collection_ids],
+            discounts=discounts,
+            channel=channel,
+        )
+        for product, collection_ids in products
+    ]
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_listing_page_pricing_cost(
+    use_index,
+    active_sales,
+    product_listing_page,
+    benchmark_channel,
+    record_property,
+):
+    # given
+    discounts = DiscountsIndex(active_sales) if use_index else active_sales
+
+    # when
+    duration = timeit.timeit(
+        lambda: price_listing_page(product_listing_page, discounts, benchmark_channel),
+        number=PAGES_PER_RUN,
+    )
+
+    # then
+    assert price_listing_page(
+        product_listing_page, discounts, benchmark_channel
+    ) == price_listing_page(product_listing_page, active_sales, benchmark_channel)
+    record_property("discounts", "index" if use_index else "list")
+    record_property("seconds_per_page", duration / PAGES_PER_RUN)
@@ -0,0 +1,71 @@
+from prices import Money
+
+from ...product.models import Product
+from ..index import DiscountsIndex
+from ..utils import calculate_discounted_price
+
+
+def test_discounts_index_behaves_like_sequence(discount_info):
+    # when
+    discounts = DiscountsIndex([discount_info])
+
+    # then
+    assert len(discounts) == 1
+    assert list(discounts) == [discount_info]
+    assert discounts[0] is discount_info
+
+
+def test_discounts_index_get_product_discounts(
+    discount_info, product, collection, channel_USD
+):
+    # given
+    discounts = DiscountsIndex([discount_info])
+    product_in_collection = Product(id=product.id + 1000, category_id=None)
+
+    # when & then
+    assert discounts.get_product_discounts(product, set(), channel_USD.slug) == [
+        discount_info
+    ]
+    assert discounts.get_product_discounts(
+        product_in_collection, {collection.id}, channel_USD.slug
+    ) == [discount_info]
+
+
+def test_discounts_index_skips_channels_without_listing(discount_info, product):
+    # given
+    discounts = DiscountsIndex([discount_info])
+
+    # when
+    product_discounts = discounts.get_product_discounts(
+        product, set(), "channel-without-listing"
+    )
+
+    # then
+    assert product_discounts == []
+
+
+def test_calculate_discounted_price_with_discounts_index(
+    discount_info, product, channel_USD
+):
+    # given
+    price = Money(10, "USD")
+    collections = list(product.collections.all())
+
+    # when
+    discounted_price = calculate_discounted_price(
+        product=product,
+        price=price,
+        collections=collections,
+        discounts=DiscountsIndex([discount_info]),
+        channel=channel_USD,
+    )
+
+    # then
+    assert discounted_price == calculate_discounted_price(
+        product=product,
+        price=price,
+        collections=collections,
+        discounts=[discount_info],
+        channel=channel_USD,
+    )
+    assert discounted_price < price
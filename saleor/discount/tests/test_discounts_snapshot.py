@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Sale
+from ..utils import fetch_cached_discounts, get_discounts_snapshot_version
+
+
+def test_fetch_cached_discounts(sale, product, category, collection):
+    # when
+    discounts = fetch_cached_discounts(timezone.now())
+
+    # then
+    assert len(discounts) == 1
+    discount = discounts[0]
+    assert discount.sale == sale
+    assert discount.product_ids == frozenset([product.id])
+    assert discount.category_ids == frozenset([category.id])
+    assert discount.collection_ids == frozenset([collection.id])
+
+
+def test_fetch_cached_discounts_reuses_snapshot(sale, assert_num_queries):
+    # given
+    date = timezone.now()
+    fetch_cached_discounts(date)
+
+    # when
+    with assert_num_queries(0):
+        discounts = fetch_cached_discounts(date + timedelta(minutes=1))
+
+    # then
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_cached_discounts_rebuilt_after_sale_change(sale, product_list):
+    # given
+    date = timezone.now()
+    fetch_cached_discounts(date)
+    version = get_discounts_snapshot_version()
+
+    # when
+    sale.products.add(product_list[0])
+
+    # then
+    assert get_discounts_snapshot_version() != version
+    (discount,) = fetch_cached_discounts(date)
+    assert product_list[0].id in discount.product_ids
+
+
+def test_fetch_cached_discounts_rebuilt_after_channel_slug_change(sale, channel_USD):
+    # given
+    date = timezone.now()
+    fetch_cached_discounts(date)
+    channel_USD.slug = "new-slug"
+
+    # when
+    channel_USD.save(update_fields=["slug"])
+
+    # then
+    (discount,) = fetch_cached_discounts(date)
+    assert set(discount.channel_listings) == {"new-slug"}
+
+
+def test_fetch_cached_discounts_expires_at_sale_end_date(sale):
+    # given
+    date = timezone.now()
+    sale.end_date = date + timedelta(hours=1)
+    sale.save(update_fields=["end_date"])
+    assert fetch_cached_discounts(date)
+
+    # when
+    discounts = fetch_cached_discounts(date + timedelta(hours=2))
+
+    # then
+    assert not discounts
+
+
+def test_fetch_cached_discounts_expires_at_sale_start_date(sale):
+    # given
+    date = timezone.now()
+    future_sale = Sale.objects.create(
+        name="Future sale", start_date=date + timedelta(hours=1)
+    )
+    assert [discount.sale for discount in fetch_cached_discounts(date)] == [sale]
+
+    # when
+    discounts = fetch_cached_discounts(date + timedelta(hours=2))
+
+    # then
+    assert {discount.sale for discount in discounts} == {sale, future_sale}
+
+
+def test_fetch_cached_discounts_for_date_before_snapshot(sale):
+    # given
+    date = timezone.now()
+    fetch_cached_discounts(date)
+
+    # when
+    discounts = fetch_cached_discounts(sale.start_date - timedelta(days=1))
+
+    # then
+    assert not discounts
@@ -1,8 +1,12 @@
 import datetime
+import time
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
-from django.db.models import F
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Min
 from django.utils import timezone
 from prices import Money
 
@@ -10,8 +14,11 @@ from ..channel.models import Channel
 from ..checkout import calculations
 from ..core.taxes import zero_money
 from . import DiscountInfo
+from .index import DiscountsIndex
 from .models import NotApplicable, Sale, SaleChannelListing, VoucherCustomer
 
+DISCOUNTS_SNAPSHOT_VERSION_CACHE_KEY = "discounts_snapshot_version"
+
 if TYPE_CHECKING:
     # flake8: noqa
     from ..checkout.fetch import CheckoutInfo, CheckoutLineInfo
@@ -77,6 +84,10 @@ def get_product_discounts(
 ) -> Money:
     """Return discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, DiscountsIndex):
+        discounts = discounts.get_product_discounts(
+            product, product_collections, channel.slug
+        )
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(
@@ -251,3 +262,108 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
 
 def fetch_active_discounts() -> List[DiscountInfo]:
     return fetch_discounts(timezone.now())
+
+
+@dataclass(frozen=True)
+class DiscountsSnapshot:
+    """Active discounts shared by all requests handled by the process.
+
+    The snapshot is valid from the moment it was created until the first start or
+    end date of a sale after it, when the set of active sales changes.
+    """
+
+    version: int
+    created: datetime.datetime
+    expires: Optional[datetime.datetime]
+    discounts: DiscountsIndex
+
+    def is_valid(self, version: int, date: datetime.datetime) -> bool:
+        return (
+            self.version == version
+            and self.created <= date
+            and (self.expires is None or date < self.expires)
+        )
+
+
+# Process-wide snapshot of active discounts, replaced when sales change.
+_discounts_snapshot: Optional[DiscountsSnapshot] = None
+
+
+def get_discounts_snapshot_version() -> Optional[int]:
+    version = cache.get(DISCOUNTS_SNAPSHOT_VERSION_CACHE_KEY)
+    if version is None:
+        # A new version is used when the key was never set or got evicted, so
+        # snapshots built for an old version are never used again.
+        cache.add(DISCOUNTS_SNAPSHOT_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(DISCOUNTS_SNAPSHOT_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_discounts_snapshot():
+    """Force all processes to rebuild their snapshots of active discounts.
+
+    The version is bumped again once the transaction is committed, as other
+    processes could build the snapshot before the changes were visible.
+    """
+
+    def bump_version():
+        global _discounts_snapshot
+        cache.set(DISCOUNTS_SNAPSHOT_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        _discounts_snapshot = None
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def build_discounts_snapshot(
+    date: datetime.datetime, version: int
+) -> DiscountsSnapshot:
+    discounts = DiscountsIndex(
+        DiscountInfo(
+            sale=discount.sale,
+            channel_listings=discount.channel_listings,
+            product_ids=frozenset(discount.product_ids),
+            category_ids=frozenset(discount.category_ids),
+            collection_ids=frozenset(discount.collection_ids),
+        )
+        for discount in fetch_discounts(date)
+    )
+    # Sales are active until the end of their end date, so the snapshot expires
+    # right after it.
+    expiry_dates = [
+        discount.sale.end_date + datetime.timedelta(microseconds=1)
+        for discount in discounts
+        if discount.sale.end_date
+    ]
+    next_start_date = Sale.objects.filter(start_date__gt=date).aggregate(
+        next_start_date=Min("start_date")
+    )["next_start_date"]
+    if next_start_date:
+        expiry_dates.append(next_start_date)
+    return DiscountsSnapshot(
+        version=version,
+        created=date,
+        expires=min(expiry_dates, default=None),
+        discounts=discounts,
+    )
+
+
+def fetch_cached_discounts(date: datetime.datetime) -> DiscountsIndex:
+    """Return discounts active at the given date from the process-wide snapshot.
+
+    Discounts for dates before the snapshot was created are fetched from the
+    database without replacing the snapshot.
+    """
+    global _discounts_snapshot
+    version = get_discounts_snapshot_version()
+    if version is None:
+        # Without a version, e.g. with a dummy cache backend, changes can't be
+        # noticed so discounts are fetched every time.
+        return DiscountsIndex(fetch_discounts(date))
+    snapshot = _discounts_snapshot
+    if snapshot is None or not snapshot.is_valid(version, date):
+        if snapshot is not None and date < snapshot.created:
+            return DiscountsIndex(fetch_discounts(date))
+        snapshot = build_discounts_snapshot(date, version)
+        _discounts_snapshot = snapshot
+    return snapshot.discounts
@@ -18,6 +18,7 @@ from ....account import events as account_events
 from ....account.error_codes import AccountErrorCode
 from ....account.models import Address, User
 from ....account.notifications import get_default_user_payload
+from ....account.search import update_users_search_document
 from ....checkout import AddressType
 from ....core.jwt import create_token
 from ....core.notify_events import NotifyEventType
@@ -4147,6 +4148,7 @@ def test_query_customer_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
@@ -4254,6 +4256,7 @@ def test_query_staff_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": staff_member_filter}
     response = staff_api_client.post_graphql(
@@ -13,6 +13,8 @@ from ..shipping.dataloaders import ShippingZoneByIdLoader
 
 class ChannelByIdLoader(DataLoader):
     context_key = "channel_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Channel,)
 
     def batch_load(self, keys):
         channels = Channel.objects.in_bulk(keys)
@@ -21,6 +23,8 @@ class ChannelByIdLoader(DataLoader):
 
 class ChannelBySlugLoader(DataLoader):
     context_key = "channel_by_slug"
+    shared_cache_timeout = 300
+    shared_cache_models = (Channel,)
 
     def batch_load(self, keys):
         channels = Channel.objects.in_bulk(keys, field_name="slug")
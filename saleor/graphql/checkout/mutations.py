@@ -9,7 +9,7 @@ from ...channel.exceptions import ChannelNotDefined
 from ...channel.models import Channel
 from ...channel.utils import get_default_channel
 from ...checkout import models
-from ...checkout.complete_checkout import complete_checkout
+from ...checkout.complete_checkout import complete_checkout, reserve_stocks_for_checkout
 from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.fetch import (
     CheckoutLineInfo,
@@ -37,6 +37,7 @@ from ...order import models as order_models
 from ...product import models as product_models
 from ...shipping import models as shipping_models
 from ...warehouse.availability import check_stock_quantity_bulk
+from ...warehouse.management import release_stock_reservation
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.enums import LanguageCodeEnum
@@ -145,6 +146,38 @@ def check_lines_quantity(variants, quantities, country, channel_slug):
         raise ValidationError({"quantity": errors})
 
 
+def check_new_lines_quantity(checkout, variants, quantities, channel_slug):
+    """Check if stock is sufficient for checkout lines after adding the quantities.
+
+    Stocks of all variants are checked at once against the quantities that the
+    lines will have, so there is no need to check each added variant separately.
+    """
+    new_quantities = dict(
+        checkout.lines.filter(variant__in=variants).values_list(
+            "variant_id", "quantity"
+        )
+    )
+    variants_by_id = {}
+    for variant, quantity in zip(variants, quantities):
+        variants_by_id[variant.pk] = variant
+        new_quantities[variant.pk] = new_quantities.get(variant.pk, 0) + quantity
+    variants_to_check = [
+        variant
+        for variant_id, variant in variants_by_id.items()
+        if new_quantities[variant_id] > 0
+    ]
+    try:
+        check_stock_quantity_bulk(
+            variants_to_check,
+            checkout.get_country(),
+            [new_quantities[variant.pk] for variant in variants_to_check],
+            channel_slug,
+        )
+    except InsufficientStock as exc:
+        error = prepare_insufficient_stock_checkout_validation_error(exc)
+        raise ValidationError({"lines": error})
+
+
 def validate_variants_available_for_purchase(variants, channel_id):
     not_available_variants = []
     for variant in variants:
@@ -472,14 +505,20 @@ class CheckoutLinesAdd(BaseMutation):
         validate_variants_available_in_channel(variants, checkout.channel_id)
 
         if variants and quantities:
+            if not replace:
+                # Stocks were checked only for the added quantities so far.
+                check_new_lines_quantity(
+                    checkout, variants, quantities, checkout_info.channel.slug
+                )
             for variant, quantity in zip(variants, quantities):
                 try:
                     checkout = add_variant_to_checkout(
-                        checkout_info, variant, quantity, replace=replace
+                        checkout_info,
+                        variant,
+                        quantity,
+                        replace=replace,
+                        check_quantity=False,
                     )
-                except InsufficientStock as exc:
-                    error = prepare_insufficient_stock_checkout_validation_error(exc)
-                    raise ValidationError({"lines": error})
                 except ProductNotPublished as exc:
                     raise ValidationError(
                         "Can't add unpublished product.",
@@ -918,57 +957,65 @@ class CheckoutComplete(BaseMutation):
     @classmethod
     def perform_mutation(cls, _root, info, checkout_id, store_source, **data):
         tracking_code = analytics.get_client_id(info.context)
-        with transaction_with_commit_on_errors():
-            try:
-                checkout = cls.get_node_or_error(
-                    info,
-                    checkout_id,
-                    only_type=Checkout,
-                    field="checkout_id",
-                )
-            except ValidationError as e:
-                _type, checkout_token = from_global_id_or_error(
-                    checkout_id, only_type=Checkout, field="checkout_id"
-                )
-
-                order = order_models.Order.objects.get_by_checkout_token(checkout_token)
-                if order:
-                    if not order.channel.is_active:
-                        raise ValidationError(
-                            {
-                                "channel": ValidationError(
-                                    "Cannot complete checkout with inactive channel.",
-                                    code=CheckoutErrorCode.CHANNEL_INACTIVE.value,
-                                )
-                            }
-                        )
-                    # The order is already created. We return it as a success
-                    # checkoutComplete response. Order is anonymized for not logged in
-                    # user
-                    return CheckoutComplete(
-                        order=order, confirmation_needed=False, confirmation_data={}
-                    )
-                raise e
-
-            manager = info.context.plugins
-            lines = fetch_checkout_lines(checkout)
-            variants = [line.variant for line in lines]
-            validate_variants_available_in_channel(variants, checkout.channel)
-            checkout_info = fetch_checkout_info(
-                checkout, lines, info.context.discounts, manager
+        try:
+            checkout = cls.get_node_or_error(
+                info,
+                checkout_id,
+                only_type=Checkout,
+                field="checkout_id",
             )
-            order, action_required, action_data = complete_checkout(
-                manager=manager,
-                checkout_info=checkout_info,
-                lines=lines,
-                payment_data=data.get("payment_data", {}),
-                store_source=store_source,
-                discounts=info.context.discounts,
-                user=info.context.user,
-                site_settings=info.context.site.settings,
-                tracking_code=tracking_code,
-                redirect_url=data.get("redirect_url"),
+        except ValidationError as e:
+            _type, checkout_token = from_global_id_or_error(
+                checkout_id, only_type=Checkout, field="checkout_id"
             )
+
+            order = order_models.Order.objects.get_by_checkout_token(checkout_token)
+            if order:
+                if not order.channel.is_active:
+                    raise ValidationError(
+                        {
+                            "channel": ValidationError(
+                                "Cannot complete checkout with inactive channel.",
+                                code=CheckoutErrorCode.CHANNEL_INACTIVE.value,
+                            )
+                        }
+                    )
+                # The order is already created. We return it as a success
+                # checkoutComplete response. Order is anonymized for not logged in
+                # user
+                return CheckoutComplete(
+                    order=order, confirmation_needed=False, confirmation_data={}
+                )
+            raise e
+
+        manager = info.context.plugins
+        lines = fetch_checkout_lines(checkout)
+        variants = [line.variant for line in lines]
+        validate_variants_available_in_channel(variants, checkout.channel)
+        checkout_info = fetch_checkout_info(
+            checkout, lines, info.context.discounts, manager
+        )
+        # Stocks are reserved in a transaction of their own, so they aren't locked
+        # while the order is being created.
+        stock_reservation = reserve_stocks_for_checkout(checkout_info, lines)
+        try:
+            with transaction_with_commit_on_errors():
+                order, action_required, action_data = complete_checkout(
+                    manager=manager,
+                    checkout_info=checkout_info,
+                    lines=lines,
+                    payment_data=data.get("payment_data", {}),
+                    store_source=store_source,
+                    discounts=info.context.discounts,
+                    user=info.context.user,
+                    site_settings=info.context.site.settings,
+                    tracking_code=tracking_code,
+                    redirect_url=data.get("redirect_url"),
+                    stock_reservation=stock_reservation,
+                )
+        finally:
+            if stock_reservation:
+                release_stock_reservation(stock_reservation)
         # If gateway returns information that additional steps are required we need
         # to inform the frontend and pass all required data
         return CheckoutComplete(
@@ -31,6 +31,7 @@ from ....plugins.manager import PluginsManager, get_plugins_manager
 from ....plugins.tests.sample_plugins import ActiveDummyPaymentGateway
 from ....product.models import ProductChannelListing, ProductVariant
 from ....shipping import models as shipping_models
+from ....tests.utils import flush_post_commit_hooks
 from ....warehouse.models import Stock
 from ...tests.utils import assert_no_permission, get_graphql_content
 from ..mutations import (
@@ -130,9 +131,10 @@ MUTATION_CHECKOUT_CREATE = """
 """
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
 def test_checkout_create_triggers_webhooks(
     mocked_webhook_trigger,
+    any_webhook,
     user_api_client,
     stock,
     graphql_address_data,
@@ -154,6 +156,7 @@ def test_checkout_create_triggers_webhooks(
     }
     assert not Checkout.objects.exists()
     response = user_api_client.post_graphql(MUTATION_CHECKOUT_CREATE, variables)
+    flush_post_commit_hooks()
     get_graphql_content(response)
 
     assert mocked_webhook_trigger.called
@@ -761,6 +761,68 @@ def test_checkout_complete_insufficient_stock(
     assert orders_count == Order.objects.count()
 
 
+def test_checkout_complete_with_optimistic_stock_allocation(
+    user_api_client, payment_dummy, checkout_ready_to_complete, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    checkout = checkout_ready_to_complete
+    checkout_line = checkout.lines.first()
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    quantity_allocated = stock.quantity_allocated
+    payment = payment_dummy
+    payment.checkout = checkout
+    payment.save()
+    checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
+    variables = {"checkoutId": checkout_id, "redirectUrl": "https://www.example.com"}
+
+    # when
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_COMPLETE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["checkoutComplete"]["checkoutErrors"]
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == quantity_allocated + checkout_line.quantity
+    order_line = Order.objects.get(checkout_token=checkout.token).lines.get(
+        variant=checkout_line.variant
+    )
+    assert order_line.allocations.get(stock=stock).quantity_allocated == (
+        checkout_line.quantity
+    )
+
+
+@patch.object(PluginsManager, "process_payment")
+def test_checkout_complete_releases_stock_reservation_after_failed_payment(
+    mocked_process_payment,
+    user_api_client,
+    payment_dummy,
+    checkout_ready_to_complete,
+    settings,
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    mocked_process_payment.side_effect = _process_payment_raise_error
+    checkout = checkout_ready_to_complete
+    stock = Stock.objects.get(product_variant=checkout.lines.first().variant)
+    quantity_allocated = stock.quantity_allocated
+    payment = payment_dummy
+    payment.checkout = checkout
+    payment.save()
+    checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
+    variables = {"checkoutId": checkout_id, "redirectUrl": "https://www.example.com"}
+
+    # when
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_COMPLETE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["checkoutComplete"]["checkoutErrors"]
+    assert not Order.objects.filter(checkout_token=checkout.token).exists()
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == quantity_allocated
+
+
 @patch("saleor.checkout.complete_checkout.gateway.refund")
 def test_checkout_complete_insufficient_stock_payment_refunded(
     gateway_refund_mock,
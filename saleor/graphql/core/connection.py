@@ -1,9 +1,16 @@
+import hashlib
 import json
-from typing import Any, Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import graphene
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import connections
+from django.db.models import BooleanField, Expression, F, Func
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
+from django.db.models import Q, QuerySet, Value
+from django.db.models.fields import Field
 from graphene.relay.connection import Connection
 from graphene_django.types import DjangoObjectType
 from graphql.error import GraphQLError
@@ -93,6 +100,84 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValueComparison(Expression):
+    """Compare rows of values, e.g. `ROW(name, slug) > ROW('Name', 'slug')`.
+
+    Unlike the equivalent tree of `OR` and `AND` conditions, the row comparison can
+    be answered with a range scan of a composite index over the compared fields.
+    """
+
+    def __init__(self, lhs: Func, rhs: Func, operator: str):
+        super().__init__(output_field=BooleanField())
+        self.lhs = lhs
+        self.rhs = rhs
+        self.operator = operator
+
+    def get_source_expressions(self):
+        return [self.lhs, self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = compiler.compile(self.lhs)
+        rhs_sql, rhs_params = compiler.compile(self.rhs)
+        return f"{lhs_sql} {self.operator} {rhs_sql}", [*lhs_params, *rhs_params]
+
+
+def _get_non_null_model_field(qs: QuerySet, field_name: str) -> Optional[Field]:
+    """Return the model field of the sorting field if it can't contain nulls.
+
+    Annotations, nullable fields and fields of nullable or multi-valued relations
+    return `None`.
+    """
+    if field_name in qs.query.annotations:
+        return None
+    opts = qs.model._meta
+    *relation_names, name = field_name.split("__")
+    try:
+        for relation_name in relation_names:
+            relation = opts.get_field(relation_name)
+            if not relation.many_to_one or relation.null:
+                return None
+            opts = relation.related_model._meta
+        field = opts.pk if name == "pk" else opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if field.is_relation or field.null:
+        return None
+    return field
+
+
+def _prepare_keyset_filter(
+    qs: QuerySet, cursor: List[str], sorting_fields: List[str], sorting_direction: str
+) -> Optional[RowValueComparison]:
+    """Create a row comparison filter equivalent to the one from `_prepare_filter`.
+
+    It's possible only when none of the sorting fields can be null, as nulls are
+    sorted after all values and a row comparison with a null is never true.
+    """
+    if None in cursor:
+        return None
+    model_fields = [_get_non_null_model_field(qs, field) for field in sorting_fields]
+    if None in model_fields:
+        return None
+    # Rows combine fields of different types, so they can't infer their own type.
+    row_kwargs = {"output_field": Field()}
+    return RowValueComparison(
+        Func(*[F(field) for field in sorting_fields], function="ROW", **row_kwargs),
+        Func(
+            *[
+                Value(field.to_python(value), output_field=field)
+                for field, value in zip(model_fields, cursor)
+            ],
+            function="ROW",
+            **row_kwargs,
+        ),
+        ">" if sorting_direction == "gt" else "<",
+    )
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -216,10 +301,13 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(cursor, sorting_fields, sorting_direction) if cursor else Q()
-    )
-    qs = qs.filter(filter_kwargs)
+    if cursor:
+        filter_kwargs = _prepare_keyset_filter(
+            qs, cursor, sorting_fields, sorting_direction
+        )
+        if filter_kwargs is None:
+            filter_kwargs = _prepare_filter(cursor, sorting_fields, sorting_direction)
+        qs = qs.filter(filter_kwargs)
     qs = qs[:end_margin]
     edges, page_info = _get_edges_for_connection(edge_type, qs, args, sorting_fields)
 
@@ -229,6 +317,63 @@ def connection_from_queryset_slice(
     )
 
 
+class TotalCountStrategy:
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+TOTAL_COUNT_CACHE_KEY_PREFIX = "total-count"
+
+
+def _get_total_count_cache_key(qs: QuerySet) -> str:
+    sql, params = qs.query.sql_with_params()
+    query_hash = hashlib.sha256(repr((sql, params)).encode("utf-8")).hexdigest()
+    return f"{TOTAL_COUNT_CACHE_KEY_PREFIX}-{qs.db}-{query_hash}"
+
+
+def estimate_queryset_count(qs: QuerySet) -> int:
+    """Return the number of rows the Postgres query planner expects from the query.
+
+    The estimate is based on table statistics, so it costs as much as planning the
+    query, but it can be far from the real count.
+    """
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_queryset(qs: QuerySet) -> int:
+    """Count rows of the queryset according to `GRAPHQL_TOTAL_COUNT_STRATEGY`."""
+    strategy = settings.GRAPHQL_TOTAL_COUNT_STRATEGY
+    try:
+        if strategy == TotalCountStrategy.ESTIMATE:
+            # Small estimates are the least reliable ones and the cheapest to verify.
+            estimate = estimate_queryset_count(qs)
+            if estimate >= settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD:
+                return estimate
+        elif strategy == TotalCountStrategy.CACHED:
+            cache_key = _get_total_count_cache_key(qs)
+            count = cache.get(cache_key)
+            if count is None:
+                count = qs.count()
+                cache.set(
+                    cache_key,
+                    count,
+                    timeout=settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT,
+                )
+            return count
+    except EmptyResultSet:
+        # The query can't match any rows, e.g. it's `none()` or filtered by an
+        # empty list, so Django doesn't build its SQL at all.
+        return 0
+    return qs.count()
+
+
 class NonNullConnection(Connection):
     class Meta:
         abstract = True
@@ -271,7 +416,7 @@ class CountableConnection(NonNullConnection):
     def resolve_total_count(root, *_args, **_kwargs):
         if isinstance(root.iterable, list):
             return len(root.iterable)
-        return root.iterable.count()
+        return count_queryset(root.iterable)
 
 
 class CountableDjangoObjectType(DjangoObjectType):
@@ -1,8 +1,15 @@
-from typing import Generic, Iterable, List, TypeVar, Union
+import time
+from typing import Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union
 
 import opentracing
 import opentracing.tags
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
 from django.http import HttpRequest
+from mptt.models import MPTTModel
+from mptt.signals import node_moved
 from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
@@ -14,6 +21,16 @@ class DataLoader(BaseLoader, Generic[K, R]):
     context_key = None
     context = None
 
+    # Loaders of rarely changing data can opt-in to a second-level cache shared
+    # between requests by setting a timeout in seconds. Saving or deleting any of
+    # `shared_cache_models` invalidates all cached results of the loader, as does
+    # moving a node of an MPTT model. `QuerySet.update()`, `bulk_create()`,
+    # `bulk_update()`, raw SQL and data migrations don't send these signals; code
+    # writing the models that way has to call `invalidate_shared_cache()`,
+    # otherwise the results are stale until the timeout passes.
+    shared_cache_timeout: Optional[int] = None
+    shared_cache_models: Tuple[Type[Model], ...] = ()
+
     def __new__(cls, context: HttpRequest):
         key = cls.context_key
         if key is None:
@@ -32,16 +49,95 @@ class DataLoader(BaseLoader, Generic[K, R]):
             self.user = context.user
             super().__init__()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.shared_cache_timeout is None:
+            return
+
+        def invalidate_shared_cache_handler(sender, **kwargs):
+            cls.invalidate_shared_cache()
+
+        for model in cls.shared_cache_models:
+            signals = [post_save, post_delete]
+            if issubclass(model, MPTTModel):
+                # Moving a node updates tree fields of other nodes with raw SQL.
+                signals.append(node_moved)
+            for signal in signals:
+                signal.connect(
+                    invalidate_shared_cache_handler,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=f"invalidate_{cls.context_key}_shared_cache",
+                )
+
+    @classmethod
+    def get_shared_cache_version_key(cls) -> str:
+        return f"dataloader-{cls.context_key}-version"
+
+    @classmethod
+    def invalidate_shared_cache(cls):
+        """Make all processes load results of the loader again.
+
+        The version is bumped again once the transaction is committed, as other
+        processes could cache results before the changes were visible.
+        """
+
+        def bump_version():
+            cache.set(cls.get_shared_cache_version_key(), time.time_ns(), timeout=None)
+
+        bump_version()
+        transaction.on_commit(bump_version)
+
+    @classmethod
+    def get_shared_cache_version(cls) -> int:
+        version_key = cls.get_shared_cache_version_key()
+        version = cache.get(version_key)
+        if version is None:
+            # A new version is used when the key was never set or got evicted, so
+            # results stored for an old version are never read again.
+            cache.add(version_key, time.time_ns(), timeout=None)
+            version = cache.get(version_key)
+        return version
+
     def batch_load_fn(self, keys: Iterable[K]) -> Promise[List[R]]:
         with opentracing.global_tracer().start_active_span(
             self.__class__.__name__
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
+            if self.shared_cache_timeout is not None:
+                return self.batch_load_with_shared_cache(list(keys))
             results = self.batch_load(keys)
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
             return results
 
+    def batch_load_with_shared_cache(self, keys: List[K]) -> Promise[List[R]]:
+        version = self.get_shared_cache_version()
+        cache_keys = [f"dataloader-{self.context_key}-{version}-{key}" for key in keys]
+        cached_results = cache.get_many(cache_keys)
+        missing = [
+            (key, cache_key)
+            for key, cache_key in zip(keys, cache_keys)
+            if cache_key not in cached_results
+        ]
+        if not missing:
+            return Promise.resolve(
+                [cached_results[cache_key] for cache_key in cache_keys]
+            )
+
+        def merge_results(loaded_results):
+            to_cache = {}
+            for (_, cache_key), result in zip(missing, loaded_results):
+                # Missing objects are not cached so that new ones are visible at once.
+                if result is not None:
+                    to_cache[cache_key] = result
+                cached_results[cache_key] = result
+            cache.set_many(to_cache, timeout=self.shared_cache_timeout)
+            return [cached_results[cache_key] for cache_key in cache_keys]
+
+        results = self.batch_load([key for key, _ in missing])
+        return Promise.resolve(results).then(merge_results)
+
     def batch_load(self, keys: Iterable[K]) -> Union[Promise[List[R]], List[R]]:
         raise NotImplementedError()
@@ -0,0 +1,124 @@
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from .....order import OrderStatus
+from .....order.models import Order
+from .....product.models import Product
+from ...connection import connection_from_queryset_slice, to_global_cursor
+
+# Deep pages are what the keyset filter is for, so the tables have to hold more
+# rows than the last benchmarked page needs.
+PAGE_SIZE = 100
+PAGES = [1, 100, 1000]
+ROWS_COUNT = PAGE_SIZE * max(PAGES) + PAGE_SIZE
+BATCH_SIZE = 10000
+REPEAT = 5
+
+
+@pytest.fixture
+def products_for_pagination(product_type, category):
+    Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {index % 1000}",
+                slug=f"product-{index}",
+                product_type=product_type,
+                category=category,
+            )
+            for index in range(ROWS_COUNT)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+@pytest.fixture
+def orders_for_pagination(channel_USD):
+    now = timezone.now()
+    statuses = [status for status, _ in OrderStatus.CHOICES]
+    Order.objects.bulk_create(
+        [
+            Order(
+                token=str(uuid4()),
+                channel=channel_USD,
+                currency=channel_USD.currency_code,
+                created=now - timedelta(minutes=index // 10),
+                status=statuses[index % len(statuses)],
+                user_email=f"customer{index}@example.com",
+            )
+            for index in range(ROWS_COUNT)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _get_page_duration(qs, sorting_fields, page):
+    """Return the shortest time of fetching the page after its preceding record."""
+    args = {
+        "first": PAGE_SIZE,
+        "sort_by": {"field": sorting_fields, "direction": ""},
+    }
+    if page > 1:
+        cursor_values = qs.values_list(*sorting_fields)[(page - 1) * PAGE_SIZE - 1]
+        args["after"] = to_global_cursor(cursor_values)
+    durations = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        connection = connection_from_queryset_slice(qs, args)
+        durations.append(time.perf_counter() - start)
+        assert len(connection.edges) == PAGE_SIZE
+    return min(durations)
+
+
+def _filter_context(keyset):
+    if keyset:
+        return nullcontext()
+    # Without the keyset filter the connection falls back to the tree of conditions.
+    return patch(
+        "saleor.graphql.core.connection._prepare_keyset_filter", return_value=None
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("keyset", [False, True])
+@pytest.mark.parametrize("page", PAGES)
+def test_products_pagination_by_name(
+    page, keyset, products_for_pagination, record_property
+):
+    # given
+    sorting_fields = ["name", "slug"]
+    qs = Product.objects.order_by(*sorting_fields)
+
+    # when
+    with _filter_context(keyset):
+        duration = _get_page_duration(qs, sorting_fields, page)
+
+    # then
+    record_property("filter", "keyset" if keyset else "tree")
+    record_property("page", page)
+    record_property("seconds", duration)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("keyset", [False, True])
+@pytest.mark.parametrize("page", PAGES)
+def test_orders_pagination_by_creation_date(
+    page, keyset, orders_for_pagination, record_property
+):
+    # given
+    sorting_fields = ["created", "status", "pk"]
+    qs = Order.objects.order_by(*sorting_fields)
+
+    # when
+    with _filter_context(keyset):
+        duration = _get_page_duration(qs, sorting_fields, page)
+
+    # then
+    record_property("filter", "keyset" if keyset else "tree")
+    record_property("page", page)
+    record_property("seconds", duration)
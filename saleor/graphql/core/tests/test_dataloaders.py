@@ -0,0 +1,94 @@
+from django.contrib.auth.models import AnonymousUser
+
+from ....product.models import Category
+from ....tests.utils import flush_post_commit_hooks
+from ...product.dataloaders import CategoryByIdLoader
+
+
+def _get_request(rf):
+    request = rf.request()
+    request.user = AnonymousUser()
+    return request
+
+
+def test_shared_cache_loader_reuses_results_between_requests(
+    category, rf, assert_num_queries
+):
+    # given
+    CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # when
+    with assert_num_queries(0):
+        result = CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # then
+    assert result == category
+
+
+def test_shared_cache_loader_loads_only_missing_keys(category, rf, assert_num_queries):
+    # given
+    CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+    other_category = Category.objects.create(name="Other", slug="other")
+    keys = [category.pk, other_category.pk]
+
+    # when
+    with assert_num_queries(1):
+        results = CategoryByIdLoader(_get_request(rf)).load_many(keys).get()
+
+    # then
+    assert results == [category, other_category]
+
+
+def test_shared_cache_loader_invalidated_on_save(category, rf):
+    # given
+    CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # when
+    category.name = "New name"
+    category.save(update_fields=["name"])
+    result = CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # then
+    assert result.name == "New name"
+
+
+def test_shared_cache_loader_does_not_cache_missing_objects(category, rf):
+    # given
+    missing_id = category.pk + 1000
+    assert CategoryByIdLoader(_get_request(rf)).load(missing_id).get() is None
+
+    # when
+    Category.objects.create(pk=missing_id, name="Other", slug="other")
+    result = CategoryByIdLoader(_get_request(rf)).load(missing_id).get()
+
+    # then
+    assert result.pk == missing_id
+
+
+def test_shared_cache_loader_invalidated_again_on_commit(
+    category, rf, assert_num_queries
+):
+    # given
+    CategoryByIdLoader.invalidate_shared_cache()
+    # Results loaded before the commit could miss the changes.
+    CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # when
+    flush_post_commit_hooks()
+
+    # then
+    with assert_num_queries(1):
+        CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+
+def test_shared_cache_loader_invalidated_on_node_move(category, rf):
+    # given
+    parent = Category.objects.create(name="Parent", slug="parent")
+    CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # when
+    category.move_to(parent)
+    result = CategoryByIdLoader(_get_request(rf)).load(category.pk).get()
+
+    # then
+    assert result.parent_id == parent.pk
@@ -2,9 +2,18 @@ import math
 
 import graphene
 import pytest
+from django.db.models import Count
 
+from ....product.models import Product
 from ....tests.models import Book
-from ..connection import CountableDjangoObjectType
+from ..connection import (
+    CountableDjangoObjectType,
+    TotalCountStrategy,
+    _prepare_filter,
+    _prepare_keyset_filter,
+    count_queryset,
+    get_field_value,
+)
 from ..fields import FilterInputConnectionField
 
 
@@ -218,3 +227,158 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+@pytest.mark.parametrize(
+    "sorting_fields",
+    [["name", "slug"], ["product_type__name", "name", "slug"], ["pk"]],
+)
+@pytest.mark.parametrize("sorting_direction", ["gt", "lt"])
+def test_prepare_keyset_filter(sorting_fields, sorting_direction, product_list):
+    # given
+    qs = Product.objects.order_by(*sorting_fields)
+    product = qs[1]
+    cursor = [str(get_field_value(product, field)) for field in sorting_fields]
+
+    # when
+    keyset_filter = _prepare_keyset_filter(
+        qs, cursor, sorting_fields, sorting_direction
+    )
+
+    # then
+    assert keyset_filter is not None
+    assert "ROW(" in str(qs.filter(keyset_filter).query)
+    expected_filter = _prepare_filter(cursor, sorting_fields, sorting_direction)
+    assert list(qs.filter(keyset_filter)) == list(qs.filter(expected_filter))
+
+
+def test_prepare_keyset_filter_for_nullable_field(product_list):
+    # given
+    sorting_fields = ["updated_at", "name", "slug"]
+    qs = Product.objects.order_by(*sorting_fields)
+    product = qs.first()
+    cursor = [str(product.updated_at), product.name, product.slug]
+
+    # when
+    keyset_filter = _prepare_keyset_filter(qs, cursor, sorting_fields, "gt")
+
+    # then
+    assert keyset_filter is None
+
+
+def test_prepare_keyset_filter_for_annotated_field(product_list):
+    # given
+    sorting_fields = ["variants_count", "slug"]
+    qs = Product.objects.annotate(variants_count=Count("variants")).order_by(
+        *sorting_fields
+    )
+    product = qs.first()
+    cursor = [str(product.variants_count), product.slug]
+
+    # when
+    keyset_filter = _prepare_keyset_filter(qs, cursor, sorting_fields, "gt")
+
+    # then
+    assert keyset_filter is None
+
+
+def test_prepare_keyset_filter_for_cursor_with_null(product_list):
+    # given
+    sorting_fields = ["name", "slug"]
+    qs = Product.objects.order_by(*sorting_fields)
+
+    # when
+    keyset_filter = _prepare_keyset_filter(qs, [None, "slug"], sorting_fields, "gt")
+
+    # then
+    assert keyset_filter is None
+
+
+QUERY_BOOKS_TOTAL_COUNT = """
+    query BooksTotalCount {
+        books(first: 1) {
+            totalCount
+        }
+    }
+"""
+
+
+def test_total_count_exact(settings, books, assert_num_queries):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_STRATEGY = TotalCountStrategy.EXACT
+    schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+
+    # when
+    with assert_num_queries(2):
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_total_count_cached(settings, books, assert_num_queries):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_STRATEGY = TotalCountStrategy.CACHED
+    schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+    Book.objects.create(name="New book")
+
+    # when
+    with assert_num_queries(1):
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_total_count_estimate_below_threshold(settings, books, capture_queries):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_STRATEGY = TotalCountStrategy.ESTIMATE
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 10000
+
+    # when
+    with capture_queries() as ctx:
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+    assert any(query["sql"].startswith("EXPLAIN") for query in ctx.captured_queries)
+
+
+def test_total_count_estimate(settings, books, capture_queries):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_STRATEGY = TotalCountStrategy.ESTIMATE
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 0
+
+    # when
+    with capture_queries() as ctx:
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] >= 0
+    assert not any("COUNT(*)" in query["sql"] for query in ctx.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "strategy", [TotalCountStrategy.CACHED, TotalCountStrategy.ESTIMATE]
+)
+@pytest.mark.parametrize(
+    "get_queryset",
+    [lambda: Book.objects.none(), lambda: Book.objects.filter(pk__in=[])],
+)
+def test_count_queryset_without_results(
+    settings, books, strategy, get_queryset, assert_num_queries
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_STRATEGY = strategy
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 0
+
+    # when
+    with assert_num_queries(0):
+        count = count_queryset(get_queryset())
+
+    # then
+    assert count == 0
@@ -0,0 +1,210 @@
+import pytest
+from graphql.language.parser import parse
+
+from ...api import schema
+from ...query_cost import QueryCostAnalyzer
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+
+PRODUCTS_QUERY = """
+query Products($first: Int, $channel: String) {
+    products(first: $first, channel: $channel) {
+        edges {
+            node {
+                name
+                ...ProductCategory
+            }
+        }
+    }
+}
+
+fragment ProductCategory on Product {
+    category {
+        products(first: 10) {
+            edges {
+                node {
+                    id
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def test_query_cost_multiplies_connection_fields():
+    document_ast = parse(PRODUCTS_QUERY)
+
+    cost, depth = QueryCostAnalyzer(document_ast, {"first": 5}).get_cost_and_depth(
+        "Products"
+    )
+
+    # products + 5 * (edges + node + name + category + products + 10 * (edges + node
+    # + id))
+    assert cost == 1 + 5 * (1 + 1 + 1 + 1 + 1 + 10 * 3)
+    assert depth == 8
+
+
+def test_query_cost_without_pagination_arguments():
+    document_ast = parse("{ shop { name countries { code } } }")
+
+    cost, depth = QueryCostAnalyzer(document_ast).get_cost_and_depth(None)
+
+    assert cost == 4
+    assert depth == 3
+
+
+def test_query_cost_skips_introspection_fields():
+    document_ast = parse("{ __schema { types { name fields { name } } } }")
+
+    assert QueryCostAnalyzer(document_ast).get_cost_and_depth(None) == (0, 0)
+
+
+def test_query_cost_with_schema_multiplies_connection_fields_once():
+    document_ast = parse(PRODUCTS_QUERY)
+    analyzer = QueryCostAnalyzer(document_ast, {"first": 5}, schema)
+
+    # edges of connections are lists, but only the pagination multiplier applies
+    assert analyzer.get_cost_and_depth("Products") == (176, 8)
+
+
+def test_query_cost_with_schema_multiplies_list_fields():
+    document_ast = parse(
+        '{ product(id: "UHJvZHVjdDox") { variants { stocks { quantity } } } }'
+    )
+
+    cost, depth = QueryCostAnalyzer(document_ast, schema=schema).get_cost_and_depth(
+        None
+    )
+
+    # product + variants + 10 * (stocks + 5 * quantity)
+    assert cost == 1 + 1 + 10 * (1 + 5 * 1)
+    assert depth == 4
+
+
+def test_query_cost_with_schema_uses_field_costs():
+    document_ast = parse(
+        '{ product(id: "UHJvZHVjdDox") { isAvailable pricing { onSale } } }'
+    )
+
+    cost, depth = QueryCostAnalyzer(document_ast, schema=schema).get_cost_and_depth(
+        None
+    )
+
+    # product + isAvailable + pricing + onSale
+    assert cost == 1 + 5 + 10 + 1
+    assert depth == 3
+
+
+def test_query_cost_reported_in_extensions(api_client, channel_USD, product):
+    variables = {"first": 5, "channel": channel_USD.slug}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"]["requestedQueryCost"] == 176
+
+
+DASHBOARD_PRODUCT_LIST_QUERY = """
+query ProductList($first: Int) {
+    products(first: $first) {
+        edges {
+            node {
+                id
+                name
+                thumbnail {
+                    url
+                }
+                productType {
+                    id
+                    name
+                    hasVariants
+                }
+                channelListings {
+                    isPublished
+                    publicationDate
+                    isAvailableForPurchase
+                    availableForPurchase
+                    visibleInListings
+                    channel {
+                        id
+                        name
+                        currencyCode
+                    }
+                    pricing {
+                        priceRange {
+                            start {
+                                net {
+                                    amount
+                                    currency
+                                }
+                            }
+                            stop {
+                                net {
+                                    amount
+                                    currency
+                                }
+                            }
+                        }
+                    }
+                }
+                attributes {
+                    attribute {
+                        id
+                    }
+                    values {
+                        id
+                        name
+                        slug
+                    }
+                }
+            }
+        }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+    }
+}
+"""
+
+
+def test_dashboard_product_list_within_default_limits(
+    staff_api_client, product, permission_manage_products
+):
+    # given
+    variables = {"first": 100}
+
+    # when
+    response = staff_api_client.post_graphql(
+        DASHBOARD_PRODUCT_LIST_QUERY,
+        variables,
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"]
+    cost = content["extensions"]["cost"]
+    assert cost["maximumAvailable"] == 250000
+    assert cost["requestedQueryCost"] == 53501
+
+
+@pytest.mark.parametrize(
+    "max_cost, max_depth, error",
+    [
+        (100, 0, "The query exceeds the maximum cost of 100, its cost is 176."),
+        (0, 5, "The query exceeds the maximum depth of 5, its depth is 8."),
+    ],
+)
+def test_query_exceeding_limits_is_rejected(
+    max_cost, max_depth, error, api_client, channel_USD, settings
+):
+    settings.GRAPHQL_QUERY_MAX_COST = max_cost
+    settings.GRAPHQL_QUERY_MAX_DEPTH = max_depth
+    variables = {"first": 5, "channel": channel_USD.slug}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == error
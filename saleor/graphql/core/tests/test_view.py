@@ -2,11 +2,13 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.core.cache import cache
 from django.test import override_settings
 from graphql.execution.base import ExecutionResult
 
 from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
+from ...query_cache import get_persisted_query_cache_key, get_query_hash
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -15,7 +17,7 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...views import document_backend, generate_cache_key
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -397,3 +399,99 @@ def test_introspection_query_is_not_cached_in_debug_mode(
 def test_generate_cache_key_use_saleor_version():
     cache_key = generate_cache_key(INTROSPECTION_QUERY)
     assert saleor_version in cache_key
+
+
+SHOP_NAME_QUERY = """
+query ShopName {
+    shop {
+        name
+    }
+}
+"""
+
+
+def test_parsed_document_is_cached(api_client, site_settings):
+    document_backend.clear()
+
+    api_client.post_graphql(SHOP_NAME_QUERY)
+    response = api_client.post_graphql(SHOP_NAME_QUERY)
+
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert document_backend.misses == 1
+    assert document_backend.hits == 1
+
+
+def test_invalid_document_from_cache_returns_validation_errors(api_client):
+    document_backend.clear()
+    query = "query { shop { notExistingField } }"
+
+    api_client.post_graphql(query)
+    response = api_client.post_graphql(query)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert "notExistingField" in content["errors"][0]["message"]
+    assert document_backend.hits == 1
+
+
+def test_document_cache_evicts_least_recently_used_documents(api_client, monkeypatch):
+    document_backend.clear()
+    monkeypatch.setattr(document_backend, "maxsize", 1)
+
+    api_client.post_graphql(SHOP_NAME_QUERY)
+    api_client.post_graphql(INTROSPECTION_QUERY)
+    api_client.post_graphql(SHOP_NAME_QUERY)
+
+    assert document_backend.misses == 3
+    assert document_backend.get_stats()["size"] == 1
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_persisted_query_not_found(api_client):
+    query_hash = get_query_hash(SHOP_NAME_QUERY)
+    cache.delete(get_persisted_query_cache_key(query_hash))
+
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    assert response.status_code == 200
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    query_hash = get_query_hash(SHOP_NAME_QUERY)
+    extensions = _persisted_query_extensions(query_hash)
+    api_client.post({"query": SHOP_NAME_QUERY, "extensions": extensions})
+
+    response = api_client.post({"extensions": extensions})
+
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    extensions = _persisted_query_extensions(get_query_hash("query { shop { id } }"))
+
+    response = api_client.post({"query": SHOP_NAME_QUERY, "extensions": extensions})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match query."
+    )
+
+
+def test_persisted_query_unsupported_version(api_client):
+    extensions = {
+        "persistedQuery": {"version": 2, "sha256Hash": get_query_hash(SHOP_NAME_QUERY)}
+    }
+
+    response = api_client.post({"query": SHOP_NAME_QUERY, "extensions": extensions})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
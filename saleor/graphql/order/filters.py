@@ -9,7 +9,11 @@ from ..core.types.common import DateRangeInput
 from ..core.utils import from_global_id_or_error
 from ..payment.enums import PaymentChargeStatusEnum
 from ..utils import resolve_global_ids_to_primary_keys
-from ..utils.filters import filter_by_query_param, filter_range_field
+from ..utils.filters import (
+    filter_by_query_param,
+    filter_by_search_document,
+    filter_range_field,
+)
 from .enums import OrderStatusFilter
 
 
@@ -68,20 +72,11 @@ def filter_created_range(qs, _, value):
 
 
 def filter_order_search(qs, _, value):
-    order_fields = [
-        "pk",
-        "discounts__name",
-        "discounts__translated_name",
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-        "payments__transactions__searchable_key",
-    ]
     payment_id = get_payment_id_from_query(value)
     if payment_id:
         return filter_order_by_payment(qs, payment_id)
 
-    qs = filter_by_query_param(qs, value, order_fields)
+    qs = filter_by_search_document(qs, value)
     return qs
 
 
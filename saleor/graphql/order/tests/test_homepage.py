@@ -47,6 +47,7 @@ def test_orders_total(
     permission_manage_orders,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     channel_USD,
 ):
     # given
@@ -69,6 +70,7 @@ def test_orders_total_channel_pln(
     permission_manage_orders,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     channel_PLN,
 ):
     # given
@@ -110,6 +112,7 @@ def test_orders_total_as_staff(
     permission_manage_orders,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     channel_USD,
 ):
     # given
@@ -132,6 +135,7 @@ def test_orders_total_as_app(
     permission_manage_orders,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     channel_USD,
 ):
     # given
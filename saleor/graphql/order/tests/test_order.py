@@ -25,6 +25,7 @@ from ....order.error_codes import OrderErrorCode
 from ....order.events import order_replacement_created
 from ....order.models import Order, OrderEvent
 from ....order.notifications import get_default_order_payload
+from ....order.search import update_orders_search_document
 from ....payment import ChargeStatus, PaymentError
 from ....payment.models import Payment
 from ....plugins.manager import PluginsManager
@@ -5309,6 +5310,7 @@ def test_orders_query_with_filter_search(
     payment.transactions.create(
         gateway_response={}, is_success=True, searchable_key="ExternalID"
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(orders_query_with_filter, variables)
@@ -5432,6 +5434,7 @@ def test_draft_orders_query_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(draft_orders_query_with_filter, variables)
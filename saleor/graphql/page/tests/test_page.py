@@ -1,4 +1,3 @@
-import datetime
 from unittest import mock
 
 import graphene
@@ -11,7 +10,7 @@ from ....attribute.models import AttributeValue
 from ....attribute.utils import associate_attribute_values_to_instance
 from ....page.error_codes import PageErrorCode
 from ....page.models import Page, PageType
-from ....tests.utils import dummy_editorjs
+from ....tests.utils import dummy_editorjs, flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import generate_page_payload
 from ...tests.utils import get_graphql_content
@@ -276,9 +275,10 @@ def test_page_create_mutation(staff_api_client, permission_manage_pages, page_ty
     assert tag_value_slug in values
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
 def test_page_create_trigger_page_webhook(
     mocked_webhook_trigger,
+    any_webhook,
     staff_api_client,
     permission_manage_pages,
     page_type,
@@ -303,6 +303,7 @@ def test_page_create_trigger_page_webhook(
     response = staff_api_client.post_graphql(
         CREATE_PAGE_MUTATION, variables, permissions=[permission_manage_pages]
     )
+    flush_post_commit_hooks()
     content = get_graphql_content(response)
     data = content["data"]["pageCreate"]
     assert data["pageErrors"] == []
@@ -312,10 +313,9 @@ def test_page_create_trigger_page_webhook(
     assert data["page"]["isPublished"] == page_is_published
     assert data["page"]["pageType"]["id"] == page_type_id
     page = Page.objects.first()
-    expected_data = generate_page_payload(page)
 
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PAGE_CREATED, expected_data
+        WebhookEventType.PAGE_CREATED, page.pk
     )
 
 
@@ -1042,7 +1042,12 @@ def test_page_delete_mutation(staff_api_client, page, permission_manage_pages):
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_page_delete_trigger_webhook(
-    mocked_webhook_trigger, staff_api_client, page, permission_manage_pages, settings
+    mocked_webhook_trigger,
+    any_webhook,
+    staff_api_client,
+    page,
+    permission_manage_pages,
+    settings,
 ):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     variables = {"id": graphene.Node.to_global_id("Page", page.id)}
@@ -1169,9 +1174,14 @@ def test_update_page(staff_api_client, permission_manage_pages, page):
 
 
 @freeze_time("2020-03-18 12:00:00")
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
 def test_update_page_trigger_webhook(
-    mocked_webhook_trigger, staff_api_client, permission_manage_pages, page, settings
+    mocked_webhook_trigger,
+    any_webhook,
+    staff_api_client,
+    permission_manage_pages,
+    page,
+    settings,
 ):
     query = UPDATE_PAGE_MUTATION
 
@@ -1195,6 +1205,7 @@ def test_update_page_trigger_webhook(
     response = staff_api_client.post_graphql(
         query, variables, permissions=[permission_manage_pages]
     )
+    flush_post_commit_hooks()
 
     # then
     content = get_graphql_content(response)
@@ -1203,11 +1214,9 @@ def test_update_page_trigger_webhook(
     assert not data["pageErrors"]
     assert data["page"]["title"] == page_title
     assert data["page"]["slug"] == new_slug
-    page.publication_date = datetime.date(2020, 3, 18)
-    expected_data = generate_page_payload(page)
 
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PAGE_UPDATED, expected_data
+        WebhookEventType.PAGE_UPDATED, page.pk
     )
 
 
@@ -25,6 +25,8 @@ VariantIdAndChannelSlug = Tuple[int, str]
 
 class CategoryByIdLoader(DataLoader):
     context_key = "category_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Category,)
 
     def batch_load(self, keys):
         categories = Category.objects.in_bulk(keys)
@@ -129,6 +131,8 @@ class ProductChannelListingByProductIdAndChannelSlugLoader(
 
 class ProductTypeByIdLoader(DataLoader):
     context_key = "product_type_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (ProductType,)
 
     def batch_load(self, keys):
         product_types = ProductType.objects.in_bulk(keys)
@@ -432,6 +436,8 @@ class ImagesByProductVariantIdLoader(DataLoader):
 
 class CollectionByIdLoader(DataLoader):
     context_key = "collection_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Collection,)
 
     def batch_load(self, keys):
         collections = Collection.objects.in_bulk(keys)
@@ -1,12 +1,12 @@
 from django.db.models import Sum
 
 from ...account.utils import requestor_is_staff_member_or_app
-from ...order import OrderStatus
+from ...order import SalesRollupPeriod
 from ...product import models
 from ..channel import ChannelQsContext
 from ..core.utils import from_global_id_or_error
 from ..utils import get_user_or_app_from_context
-from ..utils.filters import filter_by_period
+from ..utils.filters import reporting_period_to_date
 from .filters import filter_products_by_stock_availability
 
 
@@ -127,18 +127,13 @@ def resolve_product_variants(
 
 
 def resolve_report_product_sales(period, channel_slug) -> ChannelQsContext:
-    qs = models.ProductVariant.objects.all()
-
-    # exclude draft and canceled orders
-    exclude_status = [OrderStatus.DRAFT, OrderStatus.CANCELED]
-    qs = qs.exclude(order_lines__order__status__in=exclude_status)
-
-    # filter by period
-    qs = filter_by_period(qs, period, "order_lines__order__created")
-
-    qs = qs.annotate(quantity_ordered=Sum("order_lines__quantity"))
-    qs = qs.filter(
-        quantity_ordered__isnull=False, order_lines__order__channel__slug=channel_slug
+    # Quantities are read from the daily sales rollups, which skip draft and canceled
+    # orders.
+    qs = models.ProductVariant.objects.filter(
+        sales_rollups__channel__slug=channel_slug,
+        sales_rollups__period=SalesRollupPeriod.DAY,
+        sales_rollups__start__gte=reporting_period_to_date(period),
     )
+    qs = qs.annotate(quantity_ordered=Sum("sales_rollups__quantity"))
     qs = qs.order_by("-quantity_ordered")
     return ChannelQsContext(qs=qs, channel_slug=channel_slug)
@@ -40,6 +40,7 @@ def test_report_product_sales(
     staff_api_client,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     permission_manage_products,
     permission_manage_orders,
     channel_USD,
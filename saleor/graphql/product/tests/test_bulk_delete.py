@@ -451,6 +451,7 @@ def test_delete_products_with_images(
 def test_delete_products_trigger_webhook(
     mocked_recalculate_orders_task,
     mocked_webhook_trigger,
+    any_webhook,
     staff_api_client,
     product_list,
     permission_manage_products,
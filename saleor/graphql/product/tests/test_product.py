@@ -39,6 +39,7 @@ from ....product.tasks import update_variants_names
 from ....product.tests.utils import create_image, create_pdf_file_with_image_ext
 from ....product.utils.costs import get_product_costs_data
 from ....tests.utils import dummy_editorjs
+from ....warehouse.management import recalculate_stocks_quantity_allocated
 from ....warehouse.models import Allocation, Stock, Warehouse
 from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import generate_product_deleted_payload
@@ -1955,6 +1956,7 @@ def test_products_query_with_filter_stock_availability_as_staff(
         Allocation.objects.create(
             order_line=order_line, stock=stock, quantity_allocated=stock.quantity
         )
+    recalculate_stocks_quantity_allocated()
     product = product_list[0]
     product.variants.first().channel_listings.filter(channel=channel_USD).update(
         price_amount=None
@@ -1984,6 +1986,7 @@ def test_products_query_with_filter_stock_availability_as_user(
         Allocation.objects.create(
             order_line=order_line, stock=stock, quantity_allocated=stock.quantity
         )
+    recalculate_stocks_quantity_allocated()
     product = product_list[0]
     product.variants.first().channel_listings.filter(channel=channel_USD).update(
         price_amount=None
@@ -2019,6 +2022,7 @@ def test_products_query_with_filter_stock_availability_channel_without_shipping_
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=stock.quantity
     )
+    recalculate_stocks_quantity_allocated()
     variables = {
         "filter": {"stockAvailability": "OUT_OF_STOCK", "channel": channel_USD.slug}
     }
@@ -5681,6 +5685,7 @@ def test_delete_product_with_image(
 def test_delete_product_trigger_webhook(
     mocked_recalculate_orders_task,
     mocked_webhook_trigger,
+    any_webhook,
     staff_api_client,
     product,
     permission_manage_products,
@@ -7714,6 +7719,7 @@ def test_report_product_sales(
     staff_api_client,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     permission_manage_products,
     permission_manage_orders,
     channel_USD,
@@ -7744,6 +7750,7 @@ def test_report_product_sales_channel_pln(
     staff_api_client,
     order_with_lines,
     order_with_lines_channel_PLN,
+    orders_sales_rollups,
     permission_manage_products,
     permission_manage_orders,
     channel_PLN,
@@ -8777,3 +8784,45 @@ def test_create_product_with_weight_input(
     result_weight = content["data"]["productCreate"]["product"]["weight"]
     assert result_weight["value"] == expected_weight_value
     assert result_weight["unit"] == site_settings.default_weight_unit.upper()
+
+
+QUERY_PRODUCTS_IS_AVAILABLE = """
+    query ($channel: String, $address: AddressInput) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    id
+                    isAvailable(address: $address)
+                }
+            }
+        }
+    }
+"""
+
+
+def test_products_query_is_available(user_api_client, product_list, channel_USD):
+    # given
+    ProductChannelListing.objects.filter(
+        product__in=product_list, channel=channel_USD
+    ).update(available_for_purchase=(datetime.now() - timedelta(days=1)).date())
+    out_of_stock_product = product_list[0]
+    Stock.objects.filter(product_variant__product=out_of_stock_product).update(
+        quantity=0
+    )
+    variables = {"channel": channel_USD.slug, "address": {"country": "US"}}
+
+    # when
+    response = user_api_client.post_graphql(QUERY_PRODUCTS_IS_AVAILABLE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    is_available = {
+        edge["node"]["id"]: edge["node"]["isAvailable"]
+        for edge in content["data"]["products"]["edges"]
+    }
+    assert is_available == {
+        graphene.Node.to_global_id("Product", product.pk): (
+            product != out_of_stock_product
+        )
+        for product in product_list
+    }
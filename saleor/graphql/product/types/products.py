@@ -7,6 +7,7 @@ from django_countries.fields import Country
 from graphene import relay
 from graphene_federation import key
 from graphql.error import GraphQLError
+from promise import Promise
 
 from ....account.utils import requestor_is_staff_member_or_app
 from ....attribute import models as attribute_models
@@ -21,7 +22,6 @@ from ....product.utils.availability import (
     get_variant_availability,
 )
 from ....product.utils.variants import get_variant_selection_attributes
-from ....warehouse.availability import is_product_in_stock
 from ...account import types as account_types
 from ...account.enums import CountryCodeEnum
 from ...attribute.filters import AttributeFilterInput
@@ -66,6 +66,7 @@ from ...utils import get_user_country_context, get_user_or_app_from_context
 from ...utils.filters import reporting_period_to_date
 from ...warehouse.dataloaders import (
     AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader,
+    IsProductInStockByProductIdCountryCodeAndChannelSlugLoader,
     StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChanneLoader,
 )
 from ...warehouse.types import Stock
@@ -733,17 +734,21 @@ class Product(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
             address, info.context.site.settings.company_address
         )
 
-        def calculate_is_available(product_channel_listing):
-            in_stock = is_product_in_stock(root.node, country_code, channel_slug)
+        def calculate_is_available(data):
+            product_channel_listing, in_stock = data
             is_visible = False
             if product_channel_listing:
                 is_visible = product_channel_listing.is_available_for_purchase()
             return is_visible and in_stock
 
-        return (
-            ProductChannelListingByProductIdAndChannelSlugLoader(info.context)
-            .load((root.node.id, channel_slug))
-            .then(calculate_is_available)
+        product_channel_listing = ProductChannelListingByProductIdAndChannelSlugLoader(
+            info.context
+        ).load((root.node.id, channel_slug))
+        in_stock = IsProductInStockByProductIdCountryCodeAndChannelSlugLoader(
+            info.context
+        ).load((root.node.id, country_code, channel_slug))
+        return Promise.all([product_channel_listing, in_stock]).then(
+            calculate_is_available
         )
 
     @staticmethod
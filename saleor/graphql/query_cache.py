@@ -0,0 +1,139 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Hashable, Optional
+
+from django.core.cache import cache
+from graphql import GraphQLDocument
+from graphql.backend.base import GraphQLBackend
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult, execute
+from graphql.language.base import parse
+from graphql.validation import validate
+
+PERSISTED_QUERY_CACHE_KEY_PREFIX = "persisted-query"
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryNotFound(GraphQLError):
+    """Raised when the client sends a hash of a query which isn't stored yet.
+
+    The message follows the Automatic Persisted Queries protocol, clients retry the
+    request with the full query after receiving it.
+    """
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryError(GraphQLError):
+    pass
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_cache_key(query_hash: str) -> str:
+    return f"{PERSISTED_QUERY_CACHE_KEY_PREFIX}-{query_hash}"
+
+
+def resolve_persisted_query(query: Optional[str], extensions) -> Optional[str]:
+    """Return the query string for the request using the `persistedQuery` extension.
+
+    When the client sends both the query and its hash, the query is stored so that
+    following requests can send only the hash.
+    """
+    persisted_query = extensions.get("persistedQuery") if extensions else None
+    if not isinstance(persisted_query, dict):
+        return query
+
+    query_hash = persisted_query.get("sha256Hash")
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION or not isinstance(
+        query_hash, str
+    ):
+        raise PersistedQueryError("Unsupported persisted query version.")
+
+    cache_key = get_persisted_query_cache_key(query_hash)
+    if query:
+        if get_query_hash(query) != query_hash:
+            raise PersistedQueryError("Provided sha256Hash does not match query.")
+        cache.set(cache_key, query)
+        return query
+
+    stored_query = cache.get(cache_key)
+    if stored_query is None:
+        raise PersistedQueryNotFound()
+    return stored_query
+
+
+class CachedDocumentBackend(GraphQLBackend):
+    """Backend keeping an LRU cache of parsed and validated documents.
+
+    Documents are validated once, when they are added to the cache, so executing a
+    cached document skips both parsing and validation. Documents which failed the
+    validation are cached as well and return the validation errors on execution.
+    """
+
+    def __init__(self, maxsize: int = 1000, executor=None):
+        self.maxsize = maxsize
+        self.execute_params = {"executor": executor}
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[Hashable, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def document_from_string(self, schema, document_string: str) -> GraphQLDocument:
+        key = (schema, get_query_hash(document_string))
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        document = self.build_document(schema, document_string)
+
+        with self._lock:
+            self._documents[key] = document
+            if len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+        return document
+
+    def build_document(self, schema, document_string: str) -> GraphQLDocument:
+        document_ast = parse(document_string)
+        validation_errors = validate(schema, document_ast)
+        if validation_errors:
+            execute_document = partial(
+                _validation_failed_result, validation_errors=validation_errors
+            )
+        else:
+            execute_document = partial(
+                execute, schema, document_ast, **self.execute_params
+            )
+        return GraphQLDocument(
+            schema=schema,
+            document_string=document_string,
+            document_ast=document_ast,
+            execute=execute_document,
+        )
+
+
+def _validation_failed_result(*args, validation_errors, **kwargs) -> ExecutionResult:
+    return ExecutionResult(errors=validation_errors, invalid=True)
@@ -0,0 +1,209 @@
+from typing import Any, Dict, Optional, Tuple
+
+from graphql import GraphQLDocument
+from graphql.error import GraphQLError
+from graphql.language import ast
+from graphql.type import GraphQLList, GraphQLNonNull, GraphQLSchema
+
+FIELD_COST = 1
+PAGINATION_ARGUMENTS = ("first", "last")
+
+# Fields calculated through plugins or with many queries, keyed by "Type.field".
+FIELD_COSTS = {
+    "Checkout.availablePaymentGateways": 10,
+    "Checkout.availableShippingMethods": 10,
+    "Checkout.shippingPrice": 10,
+    "Checkout.subtotalPrice": 10,
+    "Checkout.totalPrice": 10,
+    "CheckoutLine.totalPrice": 10,
+    "Order.availableShippingMethods": 10,
+    "Product.isAvailable": 5,
+    "Product.pricing": 10,
+    "ProductVariant.pricing": 10,
+    "ProductVariant.quantityAvailable": 5,
+    "Shop.availablePaymentGateways": 10,
+    "Shop.availableShippingMethods": 10,
+}
+
+# Number of items expected from list fields which aren't paginated, by which the
+# cost of their selections is multiplied, keyed by "Type.field".
+LIST_FIELD_MULTIPLIER = 10
+LIST_FIELD_MULTIPLIERS = {
+    "ProductVariant.stocks": 5,
+    "Shop.countries": 250,
+    "Shop.languages": 100,
+    "ShippingZone.countries": 250,
+}
+
+
+class QueryCostError(GraphQLError):
+    pass
+
+
+def get_field_type(parent_type: Any, field_name: str) -> Tuple[Any, bool]:
+    """Return the named type of the field and whether it's a list.
+
+    The type is None if the parent type has no fields, e.g. is a union.
+    """
+    field = (getattr(parent_type, "fields", None) or {}).get(field_name)
+    if field is None:
+        return None, False
+    field_type = field.type
+    is_list = False
+    while isinstance(field_type, (GraphQLNonNull, GraphQLList)):
+        is_list = is_list or isinstance(field_type, GraphQLList)
+        field_type = field_type.of_type
+    return field_type, is_list
+
+
+def get_pagination_multiplier(field: ast.Field, variables: dict) -> int:
+    """Return the number of nodes requested from a connection field.
+
+    Fields which don't use `first` or `last` arguments return a single object.
+    """
+    for argument in field.arguments or []:
+        if argument.name.value not in PAGINATION_ARGUMENTS:
+            continue
+        value = argument.value
+        if isinstance(value, ast.Variable):
+            value = variables.get(value.name.value)
+        elif isinstance(value, ast.IntValue):
+            value = int(value.value)
+        else:
+            value = None
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            return value
+    return 1
+
+
+class QueryCostAnalyzer:
+    """Compute static cost and depth of a GraphQL operation.
+
+    Every field costs `FIELD_COST` unless listed in `FIELD_COSTS`. The cost of
+    fields selected on a connection is multiplied by the number of requested nodes,
+    on a list field by its expected length. Introspection fields are free. Without
+    the schema, field types are unknown and only connections are multiplied.
+    """
+
+    def __init__(
+        self,
+        document_ast: ast.Document,
+        variables: Optional[dict] = None,
+        schema: Optional[GraphQLSchema] = None,
+    ):
+        self.schema = schema
+        self.variables = variables if isinstance(variables, dict) else {}
+        self.fragments: Dict[str, ast.FragmentDefinition] = {}
+        self.operations: Dict[Optional[str], ast.OperationDefinition] = {}
+        for definition in document_ast.definitions:
+            if isinstance(definition, ast.FragmentDefinition):
+                self.fragments[definition.name.value] = definition
+            elif isinstance(definition, ast.OperationDefinition):
+                name = definition.name.value if definition.name else None
+                self.operations[name] = definition
+        self._fragments_cost: Dict[str, Tuple[int, int]] = {}
+
+    def get_cost_and_depth(self, operation_name: Optional[str]) -> Tuple[int, int]:
+        if operation_name in self.operations:
+            operations = [self.operations[operation_name]]
+        else:
+            operations = list(self.operations.values())
+        results = [
+            self._get_selection_set_cost(
+                operation.selection_set, self._get_operation_type(operation)
+            )
+            for operation in operations
+        ]
+        cost = max((cost for cost, _ in results), default=0)
+        depth = max((depth for _, depth in results), default=0)
+        return cost, depth
+
+    def _get_operation_type(self, operation: ast.OperationDefinition) -> Any:
+        if self.schema is None:
+            return None
+        if operation.operation == "mutation":
+            return self.schema.get_mutation_type()
+        if operation.operation == "subscription":
+            return self.schema.get_subscription_type()
+        return self.schema.get_query_type()
+
+    def _get_type(self, type_condition: Optional[ast.NamedType], default: Any) -> Any:
+        if self.schema is None or type_condition is None:
+            return default
+        return self.schema.get_type(type_condition.name.value)
+
+    def _get_selection_set_cost(
+        self, selection_set: Optional[ast.SelectionSet], parent_type: Any = None
+    ) -> Tuple[int, int]:
+        cost = 0
+        depth = 0
+        if not selection_set:
+            return cost, depth
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                field_name = selection.name.value
+                if field_name.startswith("__"):
+                    continue
+                field_type, is_list = get_field_type(parent_type, field_name)
+                children_cost, children_depth = self._get_selection_set_cost(
+                    selection.selection_set, field_type
+                )
+                key = f"{getattr(parent_type, 'name', '')}.{field_name}"
+                # Edges of connections are multiplied by the pagination arguments.
+                if is_list and not parent_type.name.endswith("Connection"):
+                    multiplier = LIST_FIELD_MULTIPLIERS.get(key, LIST_FIELD_MULTIPLIER)
+                else:
+                    multiplier = get_pagination_multiplier(selection, self.variables)
+                cost += FIELD_COSTS.get(key, FIELD_COST) + multiplier * children_cost
+                depth = max(depth, children_depth + 1)
+            elif isinstance(selection, ast.FragmentSpread):
+                fragment_cost, fragment_depth = self._get_fragment_cost(
+                    selection.name.value
+                )
+                cost += fragment_cost
+                depth = max(depth, fragment_depth)
+            elif isinstance(selection, ast.InlineFragment):
+                fragment_cost, fragment_depth = self._get_selection_set_cost(
+                    selection.selection_set,
+                    self._get_type(selection.type_condition, parent_type),
+                )
+                cost += fragment_cost
+                depth = max(depth, fragment_depth)
+        return cost, depth
+
+    def _get_fragment_cost(self, name: str) -> Tuple[int, int]:
+        if name not in self._fragments_cost:
+            # Guard against fragment cycles, validation rejects them anyway.
+            self._fragments_cost[name] = (0, 0)
+            fragment = self.fragments.get(name)
+            if fragment:
+                self._fragments_cost[name] = self._get_selection_set_cost(
+                    fragment.selection_set,
+                    self._get_type(fragment.type_condition, None),
+                )
+        return self._fragments_cost[name]
+
+
+def validate_query_cost(
+    document: GraphQLDocument,
+    variables: Optional[dict],
+    operation_name: Optional[str],
+    max_cost: int,
+    max_depth: int,
+) -> int:
+    """Return the cost of the query or raise an error when it exceeds the limits.
+
+    Limits set to 0 are not checked.
+    """
+    analyzer = QueryCostAnalyzer(document.document_ast, variables, document.schema)
+    cost, depth = analyzer.get_cost_and_depth(operation_name)
+    if max_depth and depth > max_depth:
+        raise QueryCostError(
+            f"The query exceeds the maximum depth of {max_depth}, "
+            f"its depth is {depth}."
+        )
+    if max_cost and cost > max_cost:
+        raise QueryCostError(
+            f"The query exceeds the maximum cost of {max_cost}, its cost is {cost}."
+        )
+    return cost
@@ -35,6 +35,17 @@ def filter_by_query_param(queryset, query, search_fields):
     return queryset
 
 
+def filter_by_search_document(queryset, query):
+    """Filter queryset by the `search_document` of its model.
+
+    Documents are lowercased, so the lookup is case-insensitive while still being
+    able to use a trigram index of the document.
+    """
+    if query:
+        return queryset.filter(search_document__contains=str(query).lower())
+    return queryset
+
+
 def reporting_period_to_date(period):
     now = timezone.now()
     if period == ReportingPeriod.TODAY:
@@ -18,7 +18,7 @@ from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.error import format_error as format_graphql_error
 from graphql.execution import ExecutionResult
@@ -27,6 +27,12 @@ from jwt.exceptions import PyJWTError
 from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .query_cache import (
+    CachedDocumentBackend,
+    PersistedQueryNotFound,
+    resolve_persisted_query,
+)
+from .query_cost import validate_query_cost
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
@@ -34,6 +40,9 @@ INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
 handled_errors_logger = logging.getLogger("saleor.graphql.errors.handled")
 
+# Shared by all view instances, as Django creates a new view for every request.
+document_backend = CachedDocumentBackend(maxsize=settings.GRAPHQL_QUERY_CACHE_SIZE)
+
 
 def tracing_wrapper(execute, sql, params, many, context):
     conn: DatabaseWrapper = context["connection"]
@@ -58,6 +67,8 @@ class GraphQLView(View):
     # - file upload (https://github.com/lmcgartland/graphene-file-upload)
     # - query batching
     # - CORS
+    # - caching parsed and validated documents
+    # - automatic persisted queries
 
     schema = None
     executor = None
@@ -74,7 +85,7 @@ class GraphQLView(View):
         if schema is None:
             schema = graphene_settings.SCHEMA
         if backend is None:
-            backend = get_default_backend()
+            backend = document_backend
         if middleware is None:
             middleware = graphene_settings.MIDDLEWARE
         self.schema = self.schema or schema
@@ -192,6 +203,8 @@ class GraphQLView(View):
                 status_code = 400
             else:
                 response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
             result: Optional[Dict[str, List[Any]]] = response
         else:
             result = None
@@ -247,6 +260,12 @@ class GraphQLView(View):
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            try:
+                query = resolve_persisted_query(query, self.get_extensions(data))
+            except GraphQLError as e:
+                return ExecutionResult(
+                    errors=[e], invalid=not isinstance(e, PersistedQueryNotFound)
+                )
 
             document, error = self.parse_query(query)
             if error:
@@ -255,12 +274,26 @@ class GraphQLView(View):
             if document is not None:
                 raw_query_string = document.document_string
                 span.set_tag("graphql.query", raw_query_string)
+                if isinstance(self.backend, CachedDocumentBackend):
+                    span.set_tag("graphql.document_cache.hits", self.backend.hits)
+                    span.set_tag("graphql.document_cache.misses", self.backend.misses)
                 try:
                     query_contains_schema = self.check_if_query_contains_only_schema(
                         document
                     )
                 except GraphQLError as e:
                     return ExecutionResult(errors=[e], invalid=True)
+                try:
+                    query_cost = validate_query_cost(
+                        document,
+                        variables,
+                        operation_name,
+                        max_cost=settings.GRAPHQL_QUERY_MAX_COST,
+                        max_depth=settings.GRAPHQL_QUERY_MAX_DEPTH,
+                    )
+                except GraphQLError as e:
+                    return ExecutionResult(errors=[e], invalid=True)
+                span.set_tag("graphql.query_cost", query_cost)
 
             extra_options: Dict[str, Optional[Any]] = {}
 
@@ -289,6 +322,10 @@ class GraphQLView(View):
                         )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
+                    response.extensions["cost"] = {
+                        "requestedQueryCost": query_cost,
+                        "maximumAvailable": settings.GRAPHQL_QUERY_MAX_COST,
+                    }
                     return response
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
@@ -311,6 +348,16 @@ class GraphQLView(View):
             return request.POST
         return {}
 
+    @staticmethod
+    def get_extensions(data: dict) -> Optional[dict]:
+        extensions = data.get("extensions")
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                return None
+        return extensions if isinstance(extensions, dict) else None
+
     @staticmethod
     def get_graphql_params(request: HttpRequest, data: dict):
         query = data.get("query")
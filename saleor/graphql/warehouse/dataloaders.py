@@ -4,6 +4,7 @@ from uuid import UUID
 
 from django.conf import settings
 
+from ...warehouse.availability import get_products_in_stock_bulk
 from ...warehouse.models import Stock, Warehouse
 from ..core.dataloaders import DataLoader
 
@@ -173,6 +174,36 @@ class StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChanneLoader(
         ]
 
 
+class IsProductInStockByProductIdCountryCodeAndChannelSlugLoader(
+    DataLoader[Tuple[int, str, Optional[str]], bool]
+):
+    """Check if any variant of a product is in stock in given country and channel."""
+
+    context_key = "is_product_in_stock_by_product_country_and_channel"
+
+    def batch_load(self, keys):
+        product_ids_by_country_and_channel: DefaultDict[
+            Tuple[str, Optional[str]], List[int]
+        ] = defaultdict(list)
+        for product_id, country_code, channel_slug in keys:
+            product_ids_by_country_and_channel[(country_code, channel_slug)].append(
+                product_id
+            )
+
+        # Execute a single query for all products of each country and channel.
+        in_stock_keys = set()
+        for key, product_ids in product_ids_by_country_and_channel.items():
+            country_code, channel_slug = key
+            in_stock_keys.update(
+                (product_id, country_code, channel_slug)
+                for product_id in get_products_in_stock_bulk(
+                    product_ids, country_code, channel_slug
+                )
+            )
+
+        return [key in in_stock_keys for key in keys]
+
+
 class WarehouseByIdLoader(DataLoader):
     context_key = "warehouse_by_id"
 
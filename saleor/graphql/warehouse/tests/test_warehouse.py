@@ -40,6 +40,9 @@ query {
 }
 """
 
+# Countries of 100 shipping zones of 100 warehouses exceed the default limit.
+QUERY_WAREHOUSES_MAX_COST = 3000000
+
 QUERY_WAREHOUSES_WITH_FILTERS = """
 query Warehouses($filters: WarehouseFilterInput) {
     warehouses(first:100, filter: $filters) {
@@ -268,8 +271,9 @@ def test_warehouse_query_as_customer(user_api_client, warehouse):
 
 
 def test_query_warehouses_as_staff_with_manage_orders(
-    staff_api_client, warehouse, permission_manage_orders
+    staff_api_client, warehouse, permission_manage_orders, settings
 ):
+    settings.GRAPHQL_QUERY_MAX_COST = QUERY_WAREHOUSES_MAX_COST
     response = staff_api_client.post_graphql(
         QUERY_WAREHOUSES, permissions=[permission_manage_orders]
     )
@@ -287,8 +291,9 @@ def test_query_warehouses_as_staff_with_manage_orders(
 
 
 def test_query_warehouses_as_staff_with_manage_apps(
-    staff_api_client, warehouse, permission_manage_apps
+    staff_api_client, warehouse, permission_manage_apps, settings
 ):
+    settings.GRAPHQL_QUERY_MAX_COST = QUERY_WAREHOUSES_MAX_COST
     response = staff_api_client.post_graphql(
         QUERY_WAREHOUSES, permissions=[permission_manage_apps]
     )
@@ -296,13 +301,17 @@ def test_query_warehouses_as_staff_with_manage_apps(
 
 
 def test_query_warehouses_as_customer(
-    user_api_client, warehouse, permission_manage_apps
+    user_api_client, warehouse, permission_manage_apps, settings
 ):
+    settings.GRAPHQL_QUERY_MAX_COST = QUERY_WAREHOUSES_MAX_COST
     response = user_api_client.post_graphql(QUERY_WAREHOUSES)
     assert_no_permission(response)
 
 
-def test_query_warehouses(staff_api_client, warehouse, permission_manage_products):
+def test_query_warehouses(
+    staff_api_client, warehouse, permission_manage_products, settings
+):
+    settings.GRAPHQL_QUERY_MAX_COST = QUERY_WAREHOUSES_MAX_COST
     response = staff_api_client.post_graphql(
         QUERY_WAREHOUSES, permissions=[permission_manage_products]
     )
@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 from ...core.permissions import AppPermission
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
+from ...webhook.utils import invalidate_webhook_subscriptions
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
 from ..core.utils import from_global_id_or_error
@@ -90,6 +91,7 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        invalidate_webhook_subscriptions()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -161,6 +163,7 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+            invalidate_webhook_subscriptions()
 
 
 class WebhookDelete(ModelDeleteMutation):
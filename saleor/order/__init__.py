@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional
 
+default_app_config = "saleor.order.app.OrderAppConfig"
+
 if TYPE_CHECKING:
     from ..product.models import ProductVariant
     from .models import FulfillmentLine, OrderLine
@@ -55,6 +57,15 @@ class FulfillmentStatus:
     ]
 
 
+class SalesRollupPeriod:
+    """Length of the time buckets of the sales rollups."""
+
+    HOUR = "hour"
+    DAY = "day"
+
+    CHOICES = [(HOUR, "Hour"), (DAY, "Day")]
+
+
 class OrderEvents:
     """The different order event types."""
 
@@ -49,6 +49,7 @@ from .notifications import (
     send_order_refunded_confirmation,
     send_payment_confirmation,
 )
+from .tasks import update_sales_rollups_task
 from .utils import (
     order_line_needs_automatic_fulfillment,
     recalculate_order,
@@ -67,6 +68,10 @@ OrderLineIDType = int
 QuantityType = int
 
 
+def update_sales_rollups_on_commit(order: "Order"):
+    transaction.on_commit(lambda: update_sales_rollups_task.delay([order.pk]))
+
+
 def order_created(
     order: "Order", user: "User", manager: "PluginsManager", from_draft: bool = False
 ):
@@ -93,6 +98,8 @@ def order_created(
     site_settings = Site.objects.get_current().settings
     if site_settings.automatically_confirm_all_new_orders:
         order_confirmed(order, user, manager)
+    else:
+        update_sales_rollups_on_commit(order)
 
 
 def order_confirmed(
@@ -107,6 +114,8 @@ def order_confirmed(
     """
     events.order_confirmed_event(order=order, user=user)
     manager.order_confirmed(order)
+    # Unconfirmed orders can be edited, their totals are final once confirmed.
+    update_sales_rollups_on_commit(order)
     if send_confirmation_email:
         send_order_confirmed(order, user, manager)
 
@@ -141,6 +150,7 @@ def cancel_order(order: "Order", user: Optional["User"], manager: "PluginsManage
     deallocate_stock_for_order(order)
     order.status = OrderStatus.CANCELED
     order.save(update_fields=["status"])
+    update_sales_rollups_on_commit(order)
 
     manager.order_cancelled(order)
     manager.order_updated(order)
@@ -159,6 +169,7 @@ def order_refunded(
         order=order, user=user, amount=amount, payment=payment
     )
     manager.order_updated(order)
+    update_sales_rollups_on_commit(order)
 
     send_order_refunded_confirmation(order, user, amount, payment.currency, manager)
 
@@ -0,0 +1,37 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class OrderAppConfig(AppConfig):
+    name = "saleor.order"
+
+    def ready(self):
+        from ..discount.models import OrderDiscount
+        from ..payment.models import Transaction
+        from .models import Order
+        from .signals import (
+            update_discount_order_search_document_handler,
+            update_order_search_document_handler,
+            update_transaction_order_search_document_handler,
+        )
+
+        post_save.connect(
+            update_order_search_document_handler,
+            sender=Order,
+            dispatch_uid="update_order_search_document",
+        )
+        post_save.connect(
+            update_discount_order_search_document_handler,
+            sender=OrderDiscount,
+            dispatch_uid="update_order_search_document_on_discount_save",
+        )
+        post_delete.connect(
+            update_discount_order_search_document_handler,
+            sender=OrderDiscount,
+            dispatch_uid="update_order_search_document_on_discount_delete",
+        )
+        post_save.connect(
+            update_transaction_order_search_document_handler,
+            sender=Transaction,
+            dispatch_uid="update_order_search_document_on_transaction_save",
+        )
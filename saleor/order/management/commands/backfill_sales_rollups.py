@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from tqdm import tqdm
+
+from ...models import Order
+from ...sales_rollups import rebuild_channel_day_sales_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates the hourly and daily sales rollups from existing orders. "
+        "Rollups are replaced day by day, so the command can be run while the "
+        "store is processing orders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="Recalculate only rollups of days since the date (YYYY-MM-DD).",
+        )
+
+    def handle(self, *args, **options):
+        orders = Order.objects.non_draft()
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d")
+            except ValueError:
+                raise CommandError("The date has to be in the YYYY-MM-DD format.")
+            orders = orders.filter(created__gte=since.replace(tzinfo=timezone.utc))
+
+        # Canceled orders are included, so rollups of days where all orders were
+        # canceled are cleared as well.
+        days = (
+            orders.annotate(day=TruncDay("created", tzinfo=timezone.utc))
+            .order_by("channel_id", "day")
+            .values_list("channel_id", "day")
+            .distinct()
+        )
+        for channel_id, day in tqdm(list(days)):
+            rebuild_channel_day_sales_rollups(channel_id, day)
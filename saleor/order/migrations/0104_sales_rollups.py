@@ -0,0 +1,113 @@
+# Generated by Django 3.1.8 on 2021-04-12 10:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channel", "0001_initial"),
+        ("product", "0144_auto_20210318_1155"),
+        ("order", "0103_auto_20210401_1105"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="sales_rollup_contribution",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="OrderSalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")], max_length=8
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("currency", models.CharField(max_length=3)),
+                ("orders_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_rollups",
+                        to="channel.channel",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("start", "pk"),
+                "unique_together": {("channel", "period", "start", "currency")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ProductVariantSalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")], max_length=8
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="variant_sales_rollups",
+                        to="channel.channel",
+                    ),
+                ),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_rollups",
+                        to="product.productvariant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("start", "pk"),
+                "unique_together": {("channel", "variant", "period", "start")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="productvariantsalesrollup",
+            index=models.Index(
+                fields=["channel", "period", "start"],
+                name="variantsalesrollup_channel_idx",
+            ),
+        ),
+    ]
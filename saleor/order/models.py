@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import uuid4
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import JSONField  # type: ignore
@@ -27,7 +28,7 @@ from ..discount.models import Voucher
 from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
 from ..shipping.models import ShippingMethod
-from . import FulfillmentStatus, OrderEvents, OrderStatus
+from . import FulfillmentStatus, OrderEvents, OrderStatus, SalesRollupPeriod
 
 
 class OrderQueryset(models.QuerySet):
@@ -208,11 +209,30 @@ class Order(ModelWithMetadata):
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
     redirect_url = models.URLField(blank=True, null=True)
+    # Lowercased values the order is searched by, maintained by `order.search`.
+    search_document = models.TextField(blank=True, default="")
+    # Values last added to the sales rollups, maintained by `order.sales_rollups`.
+    sales_rollup_contribution = JSONField(blank=True, null=True, editable=False)
     objects = OrderQueryset.as_manager()
 
     class Meta(ModelWithMetadata.Meta):
         ordering = ("-pk",)
         permissions = ((OrderPermissions.MANAGE_ORDERS.codename, "Manage orders."),)
+        indexes = [
+            # Composite indexes of the sorting fields used for paginating orders.
+            models.Index(
+                fields=["created", "status", "id"], name="order_created_status_idx"
+            ),
+            models.Index(
+                fields=["status", "user_email", "id"], name="order_status_email_idx"
+            ),
+            GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+        indexes.extend(ModelWithMetadata.Meta.indexes)
 
     def save(self, *args, **kwargs):
         if not self.token:
@@ -602,3 +622,62 @@ class OrderEvent(models.Model):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class OrderSalesRollup(models.Model):
+    """Totals of orders placed in a channel within a time bucket.
+
+    Rollups are kept up to date by `saleor.order.sales_rollups` so that sales
+    reports read a few pre-aggregated rows instead of all orders of the period.
+    """
+
+    channel = models.ForeignKey(
+        Channel, related_name="sales_rollups", on_delete=models.CASCADE
+    )
+    period = models.CharField(max_length=8, choices=SalesRollupPeriod.CHOICES)
+    start = models.DateTimeField()
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    orders_count = models.PositiveIntegerField(default=0)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total = TaxedMoneyField(
+        net_amount_field="total_net_amount",
+        gross_amount_field="total_gross_amount",
+        currency_field="currency",
+    )
+
+    class Meta:
+        ordering = ("start", "pk")
+        unique_together = [["channel", "period", "start", "currency"]]
+
+
+class ProductVariantSalesRollup(models.Model):
+    """Quantity of a variant ordered in a channel within a time bucket."""
+
+    channel = models.ForeignKey(
+        Channel, related_name="variant_sales_rollups", on_delete=models.CASCADE
+    )
+    variant = models.ForeignKey(
+        "product.ProductVariant", related_name="sales_rollups", on_delete=models.CASCADE
+    )
+    period = models.CharField(max_length=8, choices=SalesRollupPeriod.CHOICES)
+    start = models.DateTimeField()
+    quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("start", "pk")
+        unique_together = [["channel", "variant", "period", "start"]]
+        indexes = [
+            models.Index(
+                fields=["channel", "period", "start"],
+                name="variantsalesrollup_channel_idx",
+            )
+        ]
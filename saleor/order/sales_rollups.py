@@ -0,0 +1,171 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Type
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from prices import Money, TaxedMoney
+
+from ..channel.models import Channel
+from . import OrderStatus, SalesRollupPeriod
+from .models import Order, OrderSalesRollup, ProductVariantSalesRollup
+
+PERIOD_LENGTH = {
+    SalesRollupPeriod.HOUR: timedelta(hours=1),
+    SalesRollupPeriod.DAY: timedelta(days=1),
+}
+
+
+def get_period_start(date: datetime, period: str) -> datetime:
+    """Return the start of the UTC bucket of the given period containing the date."""
+    date = date.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if period == SalesRollupPeriod.DAY:
+        date = date.replace(hour=0)
+    return date
+
+
+def get_order_sales_contribution(order: Order) -> Optional[dict]:
+    """Return values the order adds to its rollups, None if it isn't reported."""
+    if order.status in [OrderStatus.DRAFT, OrderStatus.CANCELED]:
+        return None
+    variants: Dict[str, int] = defaultdict(int)
+    for variant_id, quantity in order.lines.filter(variant__isnull=False).values_list(
+        "variant_id", "quantity"
+    ):
+        variants[str(variant_id)] += quantity
+    return {
+        "start": get_period_start(order.created, SalesRollupPeriod.HOUR).isoformat(),
+        "currency": order.currency,
+        "net": str(order.total_net_amount),
+        "gross": str(order.total_gross_amount),
+        "variants": dict(variants),
+    }
+
+
+def update_sales_rollups(orders: Iterable[Order]):
+    """Apply changes of the orders to rollups of the hours and days they were placed."""
+    for order_id in sorted({order.pk for order in orders}):
+        update_order_sales_rollups(order_id)
+
+
+@transaction.atomic
+def update_order_sales_rollups(order_id: int):
+    """Replace the contribution of the order to its rollups with the current one.
+
+    The contribution last applied is stored on the order, so rollups are moved by
+    the difference with `F()` updates and repeating the update changes nothing.
+    Only the order row is locked; concurrent updates of other orders of the same
+    channel and bucket add to the rollup rows without waiting for each other.
+    """
+    order = Order.objects.select_for_update(of=("self",)).filter(pk=order_id).first()
+    if order is None:
+        return
+    _apply_order_sales_contribution(order, get_order_sales_contribution(order))
+
+
+def _apply_order_sales_contribution(order: Order, contribution: Optional[dict]):
+    previous_contribution = order.sales_rollup_contribution
+    if contribution == previous_contribution:
+        return
+    if previous_contribution:
+        _add_sales_contribution(order.channel_id, previous_contribution, sign=-1)
+    if contribution:
+        _add_sales_contribution(order.channel_id, contribution, sign=1)
+    Order.objects.filter(pk=order.pk).update(sales_rollup_contribution=contribution)
+    order.sales_rollup_contribution = contribution
+
+
+def _add_sales_contribution(channel_id: int, contribution: dict, sign: int):
+    hour = datetime.fromisoformat(contribution["start"])
+    for period in [SalesRollupPeriod.HOUR, SalesRollupPeriod.DAY]:
+        bucket = {
+            "channel_id": channel_id,
+            "period": period,
+            "start": get_period_start(hour, period),
+        }
+        _add_to_rollup(
+            OrderSalesRollup,
+            {**bucket, "currency": contribution["currency"]},
+            sign,
+            orders_count=1,
+            total_net_amount=Decimal(contribution["net"]),
+            total_gross_amount=Decimal(contribution["gross"]),
+        )
+        # Rows are always updated in the same order, so concurrent updates
+        # wait for each other instead of deadlocking.
+        variants = sorted(contribution["variants"].items(), key=lambda v: int(v[0]))
+        for variant_id, quantity in variants:
+            _add_to_rollup(
+                ProductVariantSalesRollup,
+                {**bucket, "variant_id": int(variant_id)},
+                sign,
+                quantity=quantity,
+            )
+
+
+def _add_to_rollup(model: Type[models.Model], lookup: dict, sign: int, **deltas):
+    rollups = model.objects.filter(**lookup)  # type: ignore
+    updates = {field: F(field) + sign * delta for field, delta in deltas.items()}
+    if sign < 0:
+        rollups.update(**updates)
+        # Buckets left without orders are removed, as if they were never reported.
+        count_field = "orders_count" if "orders_count" in deltas else "quantity"
+        rollups.filter(**{count_field: 0}).delete()
+        return
+    if rollups.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)  # type: ignore
+    except IntegrityError:
+        # The bucket was created by a concurrent update in the meantime.
+        rollups.update(**updates)
+
+
+@transaction.atomic
+def rebuild_channel_day_sales_rollups(channel_id: int, day: datetime):
+    """Recalculate rollups of the channel's day and its hours from the orders.
+
+    Orders of the day are locked first, so updates of them wait for the rebuild,
+    while orders placed during it are added on top of the rebuilt rollups.
+    """
+    day = get_period_start(day, SalesRollupPeriod.DAY)
+    orders = list(
+        Order.objects.select_for_update(of=("self",))
+        .filter(
+            channel_id=channel_id,
+            created__gte=day,
+            created__lt=day + PERIOD_LENGTH[SalesRollupPeriod.DAY],
+        )
+        .order_by("pk")
+    )
+    for model in [OrderSalesRollup, ProductVariantSalesRollup]:
+        model.objects.filter(  # type: ignore
+            channel_id=channel_id,
+            start__gte=day,
+            start__lt=day + PERIOD_LENGTH[SalesRollupPeriod.DAY],
+        ).delete()
+    Order.objects.filter(pk__in=[order.pk for order in orders]).update(
+        sales_rollup_contribution=None
+    )
+    for order in orders:
+        order.sales_rollup_contribution = None
+        _apply_order_sales_contribution(order, get_order_sales_contribution(order))
+
+
+def get_sales_total(channel: Channel, start: datetime) -> TaxedMoney:
+    """Return the total of orders placed in the channel since the start of a day."""
+    totals = OrderSalesRollup.objects.filter(
+        channel=channel,
+        period=SalesRollupPeriod.DAY,
+        start__gte=start,
+        currency=channel.currency_code,
+    ).aggregate(
+        net_total=Sum("total_net_amount"), gross_total=Sum("total_gross_amount")
+    )
+    return TaxedMoney(
+        net=Money(totals["net_total"] or 0, channel.currency_code),
+        gross=Money(totals["gross_total"] or 0, channel.currency_code),
+    )
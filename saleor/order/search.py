@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING
+
+from ..core.utils.search import prepare_search_document
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from .models import Order
+
+
+def prepare_order_search_document_value(order: "Order") -> str:
+    values = [order.pk, order.user_email]
+    if user := order.user:
+        values.extend([user.first_name, user.last_name])
+    for discount in order.discounts.all():
+        values.extend([discount.name, discount.translated_name])
+    for payment in order.payments.all():
+        values.extend(
+            transaction.searchable_key for transaction in payment.transactions.all()
+        )
+    return prepare_search_document(values)
+
+
+def update_order_search_document(order: "Order") -> bool:
+    """Update the search document of the order, return whether it has changed."""
+    search_document = prepare_order_search_document_value(order)
+    if search_document == order.search_document:
+        return False
+    order.search_document = search_document
+    order.save(update_fields=["search_document"])
+    return True
+
+
+def update_orders_search_document(orders: "QuerySet", batch_size: int = 1000) -> int:
+    """Update search documents of the orders in batches, return how many changed."""
+    orders = (
+        orders.select_related("user")
+        .prefetch_related("discounts", "payments__transactions")
+        .order_by("pk")
+    )
+    updated_count = 0
+    last_pk = 0
+    while batch := list(orders.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1].pk
+        changed_orders = []
+        for order in batch:
+            search_document = prepare_order_search_document_value(order)
+            if search_document != order.search_document:
+                order.search_document = search_document
+                changed_orders.append(order)
+        orders.model.objects.bulk_update(changed_orders, ["search_document"])
+        updated_count += len(changed_orders)
+    return updated_count
@@ -0,0 +1,33 @@
+from .search import update_order_search_document, update_orders_search_document
+
+# Fields of orders included in their search documents.
+ORDER_SEARCH_FIELDS = {"user", "user_email"}
+
+
+def update_order_search_document_handler(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and not ORDER_SEARCH_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    update_order_search_document(instance)
+
+
+def update_discount_order_search_document_handler(sender, instance, **kwargs):
+    from .models import Order
+
+    if instance.order_id:
+        update_orders_search_document(Order.objects.filter(pk=instance.order_id))
+
+
+def update_transaction_order_search_document_handler(
+    sender, instance, update_fields, **kwargs
+):
+    from .models import Order
+
+    if not instance.searchable_key:
+        return
+    if update_fields is not None and "searchable_key" not in update_fields:
+        return
+    update_orders_search_document(
+        Order.objects.filter(payments__pk=instance.payment_id)
+    )
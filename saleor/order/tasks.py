@@ -2,6 +2,7 @@ from typing import List
 
 from ..celeryconf import app
 from .models import Order
+from .sales_rollups import update_sales_rollups
 from .utils import recalculate_order
 
 
@@ -10,3 +11,9 @@ def recalculate_orders_task(order_ids: List[int]):
     orders = Order.objects.filter(id__in=order_ids)
     for order in orders:
         recalculate_order(order)
+
+
+@app.task
+def update_sales_rollups_task(order_ids: List[int]):
+    orders = Order.objects.filter(id__in=order_ids).only("channel_id", "created")
+    update_sales_rollups(orders)
@@ -5,6 +5,7 @@ import pytest
 from ...core.exceptions import InsufficientStock
 from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
+from ...warehouse.management import recalculate_stocks_quantity_allocated
 from ...warehouse.models import Allocation, Stock
 from ..actions import create_fulfillments
 from ..models import FulfillmentLine, OrderStatus
@@ -274,6 +275,7 @@ def test_create_fulfillments_without_allocations(
     order = order_with_lines
     order_line1, order_line2 = order.lines.all()
     Allocation.objects.filter(order_line__order=order).delete()
+    recalculate_stocks_quantity_allocated()
     fulfillment_lines_for_warehouses = {
         str(warehouse.pk): [
             {"order_line": order_line1, "quantity": 3},
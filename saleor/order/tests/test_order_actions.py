@@ -10,6 +10,7 @@ from ...payment.models import Payment
 from ...plugins.manager import get_plugins_manager
 from ...product.models import DigitalContent
 from ...product.tests.utils import create_image
+from ...warehouse.management import recalculate_stocks_quantity_allocated
 from ...warehouse.models import Allocation, Stock
 from .. import FulfillmentStatus, OrderEvents, OrderStatus
 from ..actions import (
@@ -63,6 +64,7 @@ def order_with_digital_line(order, digital_content, stock, site_settings):
     )
 
     Allocation.objects.create(order_line=line, stock=stock, quantity_allocated=quantity)
+    recalculate_stocks_quantity_allocated()
 
     return order
 
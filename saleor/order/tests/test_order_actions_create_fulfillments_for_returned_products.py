@@ -5,6 +5,7 @@ from prices import Money, TaxedMoney
 
 from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
+from ...warehouse.management import recalculate_stocks_quantity_allocated
 from ...warehouse.models import Allocation, Stock
 from .. import FulfillmentLineData, FulfillmentStatus, OrderEvents, OrderLineData
 from ..actions import create_fulfillments_for_returned_products
@@ -561,6 +562,7 @@ def test_create_return_fulfillment_multiple_lines_returns(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    recalculate_stocks_quantity_allocated()
 
     for _ in range(2):
         create_fulfillments_for_returned_products(
@@ -633,6 +635,7 @@ def test_create_return_fulfillment_multiple_lines_without_refund(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    recalculate_stocks_quantity_allocated()
     refunded_fulfillment = Fulfillment.objects.create(
         order=fulfilled_order, status=FulfillmentStatus.REFUNDED
     )
@@ -723,6 +726,7 @@ def test_create_return_fulfillment_with_lines_already_refunded(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    recalculate_stocks_quantity_allocated()
     refunded_fulfillment = Fulfillment.objects.create(
         order=fulfilled_order, status=FulfillmentStatus.REFUNDED
     )
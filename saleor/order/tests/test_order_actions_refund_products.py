@@ -5,6 +5,7 @@ from prices import Money, TaxedMoney
 
 from ...payment import ChargeStatus
 from ...plugins.manager import get_plugins_manager
+from ...warehouse.management import recalculate_stocks_quantity_allocated
 from ...warehouse.models import Allocation, Stock
 from .. import FulfillmentLineData, FulfillmentStatus, OrderLineData
 from ..actions import create_refund_fulfillment
@@ -304,6 +305,7 @@ def test_create_refund_fulfillment_multiple_refunds(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    recalculate_stocks_quantity_allocated()
     fulfillment = fulfilled_order.fulfillments.get()
     fulfillment.lines.create(order_line=order_line, quantity=2, stock=stock)
 
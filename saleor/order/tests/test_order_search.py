@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from ..models import Order
+from ..search import update_orders_search_document
+from ..utils import match_orders_with_new_user
+
+
+def test_order_search_document_set_on_create(order, customer_user):
+    # then
+    order.refresh_from_db()
+    assert order.search_document.split("\n") == [
+        str(order.pk),
+        "test@example.com",
+        "leslie",
+        "wade",
+    ]
+
+
+def test_order_search_document_updated_on_discount_create(order):
+    # when
+    order.discounts.create(
+        name="Black Friday",
+        translated_name="Czarny Piątek",
+        value=Decimal("1"),
+        amount_value=Decimal("1"),
+    )
+
+    # then
+    order.refresh_from_db()
+    assert "black friday" in order.search_document
+    assert "czarny piątek" in order.search_document
+
+
+def test_order_search_document_updated_on_transaction_create(payment_dummy):
+    # when
+    payment_dummy.transactions.create(
+        gateway_response={}, is_success=True, searchable_key="ExternalID"
+    )
+
+    # then
+    order = Order.objects.get(pk=payment_dummy.order_id)
+    assert "externalid" in order.search_document
+
+
+def test_order_search_document_updated_on_user_update(order, customer_user):
+    # when
+    customer_user.first_name = "Alice"
+    customer_user.save(update_fields=["first_name"])
+
+    # then
+    order.refresh_from_db()
+    assert "alice" in order.search_document
+    assert "leslie" not in order.search_document
+
+
+def test_order_search_document_updated_on_user_delete(order, customer_user):
+    # when
+    customer_user.delete()
+
+    # then
+    order.refresh_from_db()
+    assert order.user is None
+    assert "leslie" not in order.search_document
+    assert "test@example.com" in order.search_document
+
+
+def test_order_search_document_updated_on_match_with_new_user(order, customer_user):
+    # given
+    order.user = None
+    order.user_email = customer_user.email
+    order.save(update_fields=["user", "user_email"])
+    assert "leslie" not in order.search_document
+
+    # when
+    match_orders_with_new_user(customer_user)
+
+    # then
+    order.refresh_from_db()
+    assert order.user == customer_user
+    assert "leslie" in order.search_document
+
+
+def test_order_search_document_not_updated_on_unrelated_update(order):
+    # given
+    Order.objects.filter(pk=order.pk).update(search_document="")
+
+    # when
+    order.customer_note = "Note"
+    order.save(update_fields=["customer_note"])
+
+    # then
+    order.refresh_from_db()
+    assert order.search_document == ""
+
+
+def test_update_orders_search_document(order, order_list):
+    # given
+    Order.objects.filter(pk=order.pk).update(search_document="")
+
+    # when
+    updated_count = update_orders_search_document(Order.objects.all(), batch_size=1)
+
+    # then
+    assert updated_count == 1
+    order.refresh_from_db()
+    assert "test@example.com" in order.search_document
@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from prices import Money, TaxedMoney
+
+from ...plugins.manager import get_plugins_manager
+from ...tests.utils import flush_post_commit_hooks
+from .. import OrderStatus, SalesRollupPeriod
+from ..actions import cancel_order
+from ..models import Order, OrderSalesRollup, ProductVariantSalesRollup
+from ..sales_rollups import get_period_start, get_sales_total, update_sales_rollups
+
+
+@pytest.fixture
+def orders_usd(order_list):
+    for order in order_list:
+        order.currency = "USD"
+    Order.objects.bulk_update(order_list, ["currency"])
+    return order_list
+
+
+def _move_order(order, created):
+    order.created = created
+    Order.objects.filter(pk=order.pk).update(created=created)
+
+
+@pytest.mark.parametrize(
+    "period, expected_start",
+    [
+        (SalesRollupPeriod.HOUR, datetime(2021, 4, 12, 9, tzinfo=pytz.utc)),
+        (SalesRollupPeriod.DAY, datetime(2021, 4, 12, tzinfo=pytz.utc)),
+    ],
+)
+def test_get_period_start(period, expected_start):
+    # given
+    date = pytz.timezone("Europe/Warsaw").localize(datetime(2021, 4, 12, 11, 30, 5))
+
+    # when
+    start = get_period_start(date, period)
+
+    # then
+    assert start == expected_start
+
+
+def test_update_sales_rollups(order_with_lines, channel_USD):
+    # given
+    order = order_with_lines
+
+    # when
+    update_sales_rollups([order])
+
+    # then
+    for period in [SalesRollupPeriod.HOUR, SalesRollupPeriod.DAY]:
+        rollup = OrderSalesRollup.objects.get(channel=channel_USD, period=period)
+        assert rollup.start == get_period_start(order.created, period)
+        assert rollup.orders_count == 1
+        assert rollup.total == order.total
+        variant_rollups = ProductVariantSalesRollup.objects.filter(
+            channel=channel_USD, period=period
+        )
+        assert {(r.variant_id, r.quantity) for r in variant_rollups} == {
+            (line.variant_id, line.quantity) for line in order.lines.all()
+        }
+
+
+def test_update_sales_rollups_sums_hours_of_the_day(
+    order_with_lines, orders_usd, channel_USD
+):
+    # given
+    day = datetime(2021, 4, 12, tzinfo=pytz.utc)
+    orders = [order_with_lines, *orders_usd]
+    for hour, order in enumerate(orders):
+        _move_order(order, day + timedelta(hours=hour, minutes=30))
+
+    # when
+    update_sales_rollups(orders)
+
+    # then
+    assert (
+        OrderSalesRollup.objects.filter(
+            channel=channel_USD, period=SalesRollupPeriod.HOUR
+        ).count()
+        == 4
+    )
+    day_rollup = OrderSalesRollup.objects.get(
+        channel=channel_USD, period=SalesRollupPeriod.DAY
+    )
+    assert day_rollup.start == day
+    assert day_rollup.orders_count == 4
+    assert day_rollup.total == sum(
+        (order.total for order in orders), TaxedMoney(Money(0, "USD"), Money(0, "USD"))
+    )
+
+
+def test_update_sales_rollups_is_idempotent(order_with_lines, channel_USD):
+    # given
+    order = order_with_lines
+    update_sales_rollups([order])
+
+    # when
+    update_sales_rollups([order])
+
+    # then
+    rollup = OrderSalesRollup.objects.get(
+        channel=channel_USD, period=SalesRollupPeriod.DAY
+    )
+    assert rollup.orders_count == 1
+    assert rollup.total == order.total
+
+
+def test_update_sales_rollups_applies_changes_of_order(
+    order_with_lines, orders_usd, channel_USD
+):
+    # given
+    order, other_order = order_with_lines, orders_usd[0]
+    update_sales_rollups([order, other_order])
+    line = order.lines.first()
+    line.quantity += 2
+    line.save(update_fields=["quantity"])
+    order.total_gross_amount += 10
+    order.save(update_fields=["total_gross_amount"])
+
+    # when
+    update_sales_rollups([order])
+
+    # then
+    rollup = OrderSalesRollup.objects.get(
+        channel=channel_USD, period=SalesRollupPeriod.DAY
+    )
+    assert rollup.orders_count == 2
+    assert rollup.total_gross_amount == (
+        order.total_gross_amount + other_order.total_gross_amount
+    )
+    variant_rollup = ProductVariantSalesRollup.objects.get(
+        channel=channel_USD, period=SalesRollupPeriod.HOUR, variant=line.variant
+    )
+    assert variant_rollup.quantity == line.quantity
+
+
+def test_update_sales_rollups_locks_only_the_order(order_with_lines):
+    # when
+    with CaptureQueriesContext(connection) as ctx:
+        update_sales_rollups([order_with_lines])
+
+    # then
+    locking_queries = [
+        query["sql"] for query in ctx.captured_queries if "FOR UPDATE" in query["sql"]
+    ]
+    assert len(locking_queries) == 1
+    assert 'FOR UPDATE OF "order_order"' in locking_queries[0]
+
+
+def test_update_sales_rollups_skips_draft_and_canceled_orders(
+    order_with_lines, orders_usd, channel_USD
+):
+    # given
+    draft_order, canceled_order = orders_usd[:2]
+    draft_order.status = OrderStatus.DRAFT
+    draft_order.save(update_fields=["status"])
+    canceled_order.status = OrderStatus.CANCELED
+    canceled_order.save(update_fields=["status"])
+    orders = [order_with_lines, draft_order, canceled_order]
+
+    # when
+    update_sales_rollups(orders)
+
+    # then
+    rollup = OrderSalesRollup.objects.get(
+        channel=channel_USD, period=SalesRollupPeriod.DAY
+    )
+    assert rollup.orders_count == 1
+    assert rollup.total == order_with_lines.total
+
+
+def test_cancel_order_updates_sales_rollups(order_with_lines, channel_USD):
+    # given
+    order = order_with_lines
+    update_sales_rollups([order])
+
+    # when
+    cancel_order(order, None, get_plugins_manager())
+    flush_post_commit_hooks()
+
+    # then
+    assert not OrderSalesRollup.objects.filter(channel=channel_USD).exists()
+    assert not ProductVariantSalesRollup.objects.filter(channel=channel_USD).exists()
+
+
+def test_get_sales_total(order_with_lines, orders_usd, channel_USD):
+    # given
+    today = get_period_start(order_with_lines.created, SalesRollupPeriod.DAY)
+    old_order = orders_usd[0]
+    _move_order(old_order, today - timedelta(days=40))
+    update_sales_rollups([order_with_lines, old_order])
+
+    # when
+    total = get_sales_total(channel_USD, today)
+
+    # then
+    assert total == order_with_lines.total
+
+
+def test_backfill_sales_rollups(order_with_lines, orders_usd, channel_USD):
+    # given
+    _move_order(orders_usd[0], order_with_lines.created - timedelta(days=3))
+    update_sales_rollups([order_with_lines, *orders_usd])
+    expected_rollups = set(
+        OrderSalesRollup.objects.values_list(
+            "channel_id", "period", "start", "orders_count", "total_gross_amount"
+        )
+    )
+    OrderSalesRollup.objects.update(orders_count=100)
+    ProductVariantSalesRollup.objects.all().delete()
+
+    # when
+    call_command("backfill_sales_rollups")
+
+    # then
+    assert expected_rollups == set(
+        OrderSalesRollup.objects.values_list(
+            "channel_id", "period", "start", "orders_count", "total_gross_amount"
+        )
+    )
+    assert ProductVariantSalesRollup.objects.exists()
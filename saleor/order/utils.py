@@ -27,6 +27,7 @@ from ..warehouse.management import (
 )
 from ..warehouse.models import Warehouse
 from . import events
+from .search import update_orders_search_document
 
 if TYPE_CHECKING:
     from ..plugins.manager import PluginsManager
@@ -605,7 +606,13 @@ def get_voucher_discount_for_order(order: Order) -> Money:
 
 
 def match_orders_with_new_user(user: User) -> None:
-    Order.objects.confirmed().filter(user_email=user.email, user=None).update(user=user)
+    orders = Order.objects.confirmed().filter(user_email=user.email, user=None)
+    order_pks = list(orders.values_list("pk", flat=True))
+    if not order_pks:
+        return
+    # The update skips signals, so the search documents are updated explicitly.
+    Order.objects.filter(pk__in=order_pks).update(user=user)
+    update_orders_search_document(Order.objects.filter(pk__in=order_pks))
 
 
 def get_total_order_discount(order: Order) -> Money:
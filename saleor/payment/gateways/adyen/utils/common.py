@@ -14,6 +14,7 @@ from .....checkout.calculations import (
     checkout_line_total,
     checkout_shipping_price,
     checkout_total,
+    get_checkout_lines_prices_cache_key,
 )
 from .....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from .....checkout.models import Checkout
@@ -198,6 +199,9 @@ def append_klarna_data(payment_information: "PaymentData", payment_data: dict):
     payment_data["shopperReference"] = payment_information.customer_email
     payment_data["countryCode"] = country_code
     line_items = []
+    prices_cache_key = get_checkout_lines_prices_cache_key(
+        manager=manager, checkout_info=checkout_info, lines=lines, discounts=discounts
+    )
     for line_info in lines:
         total = checkout_line_total(
             manager=manager,
@@ -205,6 +209,7 @@ def append_klarna_data(payment_information: "PaymentData", payment_data: dict):
             lines=lines,
             checkout_line_info=line_info,
             discounts=discounts,
+            prices_cache_key=prices_cache_key,
         )
         address = checkout_info.shipping_address or checkout_info.billing_address
         unit_price = manager.calculate_checkout_line_unit_price(
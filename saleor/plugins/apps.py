@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 
 if TYPE_CHECKING:
@@ -14,11 +15,41 @@ class PluginConfig(AppConfig):
     verbose_name = "Plugins"
 
     def ready(self):
+        from django_prices_vatlayer.models import VAT
+
+        from .models import PluginConfiguration
+        from .signals import (
+            invalidate_plugins_configuration_handler,
+            invalidate_vat_rates_handler,
+        )
+
         plugins = getattr(settings, "PLUGINS", [])
 
         for plugin_path in plugins:
             self.load_and_check_plugin(plugin_path)
 
+        post_save.connect(
+            invalidate_plugins_configuration_handler,
+            sender=PluginConfiguration,
+            dispatch_uid="invalidate_plugins_configuration_on_save",
+        )
+        post_delete.connect(
+            invalidate_plugins_configuration_handler,
+            sender=PluginConfiguration,
+            dispatch_uid="invalidate_plugins_configuration_on_delete",
+        )
+        # Rates are also updated by the `get_vat_rates` command.
+        post_save.connect(
+            invalidate_vat_rates_handler,
+            sender=VAT,
+            dispatch_uid="invalidate_vat_rates_on_save",
+        )
+        post_delete.connect(
+            invalidate_vat_rates_handler,
+            sender=VAT,
+            dispatch_uid="invalidate_vat_rates_on_delete",
+        )
+
     def load_and_check_plugin(self, plugin_path: str):
         try:
             plugin = import_string(plugin_path)
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from dataclasses import dataclass
@@ -33,6 +34,9 @@ CACHE_KEY = "avatax_request_id_"
 TAX_CODES_CACHE_KEY = "avatax_tax_codes_cache_key"
 TIMEOUT = 10  # API HTTP Requests Timeout
 
+# Fields of the transaction which don't change its taxes
+TRANSACTION_IDENTITY_FIELDS = ("code", "email")
+
 # Common carrier code used to identify the line as a shipping service
 COMMON_CARRIER_CODE = "FR020100"
 
@@ -165,27 +169,32 @@ def _validate_checkout(
     )
 
 
-def _retrieve_from_cache(token):
-    taxes_cache_key = CACHE_KEY + token
-    cached_data = cache.get(taxes_cache_key)
-    return cached_data
-
+def get_taxes_cache_key(data: Dict[str, Dict], config: AvataxConfiguration) -> str:
+    """Return a cache key of the Avatax response to the request data.
 
-def taxes_need_new_fetch(data: Dict[str, Any], taxes_token: str) -> bool:
+    Sales orders are estimates which Avatax doesn't record, so their code and
+    customer are left out of the key and every checkout or draft order with the
+    same taxed data shares the response. Other transactions are kept apart, as
+    Avatax has to adjust each of them when they change.
+    """
+    transaction = dict(data["createTransactionModel"])
+    if transaction.get("type") == TransactionType.ORDER:
+        for field in TRANSACTION_IDENTITY_FIELDS:
+            transaction.pop(field, None)
+    key_data = [config.username_or_account, config.use_sandbox, transaction]
+    key_hash = hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return CACHE_KEY + key_hash
+
+
+def taxes_need_new_fetch(data: Dict[str, Any], config: AvataxConfiguration) -> bool:
     """Check if Avatax's taxes data need to be refetched.
 
-    The response from Avatax is stored in a cache. If an object doesn't exist in cache
-    or something has changed, taxes need to be refetched.
+    The response from Avatax is stored in a cache under a key of the request data.
+    If a response doesn't exist in cache, taxes need to be refetched.
     """
-    cached_data = _retrieve_from_cache(taxes_token)
-
-    if not cached_data:
-        return True
-
-    cached_request_data, _ = cached_data
-    if data != cached_request_data:
-        return True
-    return False
+    return cache.get(get_taxes_cache_key(data, config)) is None
 
 
 def append_line_to_data(
@@ -388,9 +397,7 @@ def generate_request_data_from_checkout(
     return data
 
 
-def _fetch_new_taxes_data(
-    data: Dict[str, Dict], data_cache_key: str, config: AvataxConfiguration
-):
+def _post_transaction(data: Dict[str, Dict], config: AvataxConfiguration):
     transaction_url = urljoin(
         get_api_url(config.use_sandbox), "transactions/createoradjust"
     )
@@ -400,31 +407,37 @@ def _fetch_new_taxes_data(
         span = scope.span
         span.set_tag(opentracing.tags.COMPONENT, "tax")
         span.set_tag("service.name", "avatax")
-        response = api_post_request(transaction_url, data, config)
+        return api_post_request(transaction_url, data, config)
+
+
+def _get_response_cache_time(response: Dict[str, Any]) -> int:
     if response and "error" not in response:
-        cache.set(data_cache_key, (data, response), CACHE_TIME)
-    else:
-        # cache failed response to limit hits to avatax.
-        cache.set(data_cache_key, (data, response), 10)
+        return CACHE_TIME
+    # cache failed response to limit hits to avatax.
+    return 10
+
+
+def _fetch_new_taxes_data(
+    data: Dict[str, Dict], data_cache_key: str, config: AvataxConfiguration
+):
+    response = _post_transaction(data, config)
+    cache.set(data_cache_key, response, _get_response_cache_time(response))
     return response
 
 
 def get_cached_response_or_fetch(
     data: Dict[str, Dict],
-    token_in_cache: str,
     config: AvataxConfiguration,
     force_refresh: bool = False,
 ):
     """Try to find response in cache.
 
-    Return cached response if requests data are the same. Fetch new data in other cases.
+    Return cached response of the same request data. Fetch new data in other cases.
     """
-    data_cache_key = CACHE_KEY + token_in_cache
-    if taxes_need_new_fetch(data, token_in_cache) or force_refresh:
+    data_cache_key = get_taxes_cache_key(data, config)
+    response = None if force_refresh else cache.get(data_cache_key)
+    if response is None:
         response = _fetch_new_taxes_data(data, data_cache_key, config)
-    else:
-        _, response = cache.get(data_cache_key)
-
     return response
 
 
@@ -437,7 +450,7 @@ def get_checkout_tax_data(
     data = generate_request_data_from_checkout(
         checkout_info, lines_info, config, discounts=discounts
     )
-    return get_cached_response_or_fetch(data, str(checkout_info.checkout.token), config)
+    return get_cached_response_or_fetch(data, config)
 
 
 def get_order_request_data(order: "Order", config: AvataxConfiguration):
@@ -464,9 +477,7 @@ def get_order_tax_data(
     order: "Order", config: AvataxConfiguration, force_refresh=False
 ) -> Dict[str, Any]:
     data = get_order_request_data(order, config)
-    response = get_cached_response_or_fetch(
-        data, "order_%s" % order.token, config, force_refresh
-    )
+    response = get_cached_response_or_fetch(data, config, force_refresh)
     error = response.get("error")
     if error:
         raise TaxError(error)
@@ -612,7 +612,7 @@ def test_checkout_needs_new_fetch(
     lines = fetch_checkout_lines(checkout_with_item)
     checkout_info = fetch_checkout_info(checkout_with_item, lines, [], manager)
     checkout_data = generate_request_data_from_checkout(checkout_info, lines, config)
-    assert taxes_need_new_fetch(checkout_data, str(checkout_with_item.token))
+    assert taxes_need_new_fetch(checkout_data, config)
 
 
 def test_taxes_need_new_fetch_uses_cached_data(
@@ -627,10 +627,8 @@ def test_taxes_need_new_fetch_uses_cached_data(
     lines = fetch_checkout_lines(checkout_with_item)
     checkout_info = fetch_checkout_info(checkout_with_item, lines, [], manager)
     checkout_data = generate_request_data_from_checkout(checkout_info, lines, config)
-    monkeypatch.setattr(
-        "saleor.plugins.avatax.cache.get", lambda x: [checkout_data, None]
-    )
-    assert not taxes_need_new_fetch(checkout_data, str(checkout_with_item.token))
+    monkeypatch.setattr("saleor.plugins.avatax.cache.get", lambda x: {"id": 0})
+    assert not taxes_need_new_fetch(checkout_data, config)
 
 
 @pytest.mark.vcr
@@ -6,7 +6,7 @@ from prices import Money, TaxedMoney
 
 from ....checkout.fetch import fetch_checkout_lines
 from ...manager import get_plugins_manager
-from .. import CACHE_KEY, generate_request_data_from_checkout
+from .. import generate_request_data_from_checkout, get_taxes_cache_key
 from ..plugin import AvataxPlugin
 
 
@@ -35,10 +35,7 @@ def test_calculate_checkout_total_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
 
@@ -50,7 +47,7 @@ def test_calculate_checkout_total_use_cache(
     # when
     assert result == TaxedMoney(net=Money("72.2", "USD"), gross=Money("75", "USD"))
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -122,10 +119,7 @@ def test_calculate_checkout_subtotal_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
 
@@ -137,7 +131,7 @@ def test_calculate_checkout_subtotal_use_cache(
     # when
     assert result == TaxedMoney(net=Money("64.07", "USD"), gross=Money("65", "USD"))
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -209,10 +203,7 @@ def test_calculate_checkout_shipping_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
 
@@ -224,7 +215,7 @@ def test_calculate_checkout_shipping_use_cache(
     # when
     assert result == TaxedMoney(net=Money("8.13", "USD"), gross=Money("10", "USD"))
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -297,10 +288,7 @@ def test_calculate_checkout_line_total_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
 
@@ -312,7 +300,7 @@ def test_calculate_checkout_line_total_use_cache(
     # when
     assert result == TaxedMoney(net=Money("4.07", "USD"), gross=Money("5", "USD"))
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -386,10 +374,7 @@ def test_calculate_checkout_line_unit_price_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
     quantity = checkout_line_info.line.quantity
@@ -409,7 +394,7 @@ def test_calculate_checkout_line_unit_price_use_cache(
     # when
     assert result == TaxedMoney(net=Money("4.07", "USD"), gross=Money("5", "USD"))
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -497,10 +482,7 @@ def test_get_checkout_line_tax_rate_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
     fake_unit_price = TaxedMoney(net=Money("2", "USD"), gross=Money("10", "USD"))
@@ -518,7 +500,7 @@ def test_get_checkout_line_tax_rate_use_cache(
     # when
     assert result == Decimal("0.23")
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -602,10 +584,7 @@ def test_get_checkout_shipping_tax_rate_use_cache(
         checkout_info, lines, plugin.config, []
     )
     mocked_cache = Mock(
-        return_value=(
-            avalara_request_data,
-            avalara_response_for_checkout_with_items_and_shipping,
-        )
+        return_value=avalara_response_for_checkout_with_items_and_shipping
     )
     monkeypatch.setattr("saleor.plugins.avatax.cache.get", mocked_cache)
     fake_shipping_price = TaxedMoney(net=Money("2", "USD"), gross=Money("10", "USD"))
@@ -618,7 +597,7 @@ def test_get_checkout_shipping_tax_rate_use_cache(
     # when
     assert result == Decimal("0.23")
 
-    avalara_cache_key = CACHE_KEY + str(checkout.token)
+    avalara_cache_key = get_taxes_cache_key(avalara_request_data, plugin.config)
     mocked_cache.assert_called_with(avalara_cache_key)
     mock_cache_set.assert_not_called()
 
@@ -0,0 +1,148 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+import pytest
+
+from ....checkout.fetch import fetch_checkout_lines
+from ....order import OrderStatus
+from ....order.models import Order, OrderLine
+from .. import AvataxConfiguration, get_checkout_tax_data, get_order_tax_data
+
+
+class AvataxStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.server.requests.append(json.loads(self.rfile.read(length)))
+        body = json.dumps(self.server.response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def avatax_stub_server(
+    monkeypatch, avalara_response_for_checkout_with_items_and_shipping
+):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AvataxStubHandler)
+    server.requests = []
+    server.response = avalara_response_for_checkout_with_items_and_shipping
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setattr(
+        "saleor.plugins.avatax.get_api_url",
+        lambda use_sandbox=True: f"http://{host}:{port}/api/v2/",
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def avatax_config():
+    return AvataxConfiguration(username_or_account="test", password_or_license="test")
+
+
+def _copy_order(order):
+    order_copy = Order.objects.get(pk=order.pk)
+    order_copy.pk = None
+    order_copy.token = ""
+    order_copy.save()
+    lines = list(order.lines.all())
+    for line in lines:
+        line.pk = None
+        line.order = order_copy
+    OrderLine.objects.bulk_create(lines)
+    return order_copy
+
+
+def test_checkouts_with_same_items_share_cached_taxes(
+    avatax_stub_server,
+    avatax_config,
+    checkout_with_items_and_shipping,
+    checkout_with_items_and_shipping_info,
+):
+    # given
+    checkout = checkout_with_items_and_shipping
+    checkout_info = checkout_with_items_and_shipping_info
+    lines = fetch_checkout_lines(checkout)
+    lookups = 5
+
+    # when
+    for _ in range(lookups):
+        checkout_info.checkout.token = uuid4()
+        get_checkout_tax_data(checkout_info, lines, [], avatax_config)
+
+    # then
+    assert len(avatax_stub_server.requests) == 1
+    hit_rate = 1 - len(avatax_stub_server.requests) / lookups
+    assert hit_rate == 0.8
+
+
+def test_checkout_taxes_fetched_again_after_taxed_data_change(
+    avatax_stub_server,
+    avatax_config,
+    checkout_with_items_and_shipping,
+    checkout_with_items_and_shipping_info,
+):
+    # given
+    checkout = checkout_with_items_and_shipping
+    checkout_info = checkout_with_items_and_shipping_info
+    get_checkout_tax_data(
+        checkout_info, fetch_checkout_lines(checkout), [], avatax_config
+    )
+    line = checkout.lines.first()
+    line.quantity += 1
+    line.save(update_fields=["quantity"])
+
+    # when
+    get_checkout_tax_data(
+        checkout_info, fetch_checkout_lines(checkout), [], avatax_config
+    )
+
+    # then
+    assert len(avatax_stub_server.requests) == 2
+
+
+def test_draft_orders_with_same_lines_share_cached_taxes(
+    avatax_stub_server, avatax_config, order_with_lines
+):
+    # given
+    order = order_with_lines
+    order.status = OrderStatus.DRAFT
+    order.save(update_fields=["status"])
+    get_order_tax_data(order, avatax_config)
+    other_order = _copy_order(order)
+
+    # when
+    get_order_tax_data(other_order, avatax_config)
+
+    # then
+    assert len(avatax_stub_server.requests) == 1
+
+
+def test_invoices_of_orders_with_same_lines_not_shared(
+    avatax_stub_server, avatax_config, order_with_lines
+):
+    # given
+    order = order_with_lines
+    get_order_tax_data(order, avatax_config)
+    other_order = _copy_order(order)
+
+    # when
+    get_order_tax_data(other_order, avatax_config)
+    get_order_tax_data(other_order, avatax_config)
+
+    # then
+    codes = [
+        request["createTransactionModel"]["code"]
+        for request in avatax_stub_server.requests
+    ]
+    assert codes == [order.token, other_order.token]
@@ -2,10 +2,14 @@ import logging
 import operator
 import os
 import re
-from dataclasses import dataclass
+import smtplib
+import threading
+import time
+from dataclasses import astuple, dataclass
 from decimal import Decimal, InvalidOperation
 from email.headerregistry import Address
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import dateutil.parser
 import html2text
@@ -13,7 +17,7 @@ import i18naddress
 import pybars
 from babel.numbers import format_currency
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, send_mail
 from django.core.mail.backends.smtp import EmailBackend
 from django_prices.utils.locale import get_locale_data
 
@@ -33,6 +37,10 @@ DEFAULT_TEMPLATE_HELP_TEXT = (
 DEFAULT_SUBJECT_HELP_TEXT = "An email subject built with Handlebars template language."
 DEFAULT_EMAIL_VALUE = "DEFAULT"
 DEFAULT_EMAIL_TIMEOUT = 5
+# Seconds after which an unused SMTP connection is reopened instead of reused, as
+# servers drop idle clients.
+EMAIL_CONNECTION_MAX_IDLE = 60
+COMPILED_TEMPLATES_CACHE_SIZE = 256
 
 
 @dataclass
@@ -178,45 +186,141 @@ def price(this, net_amount, gross_amount, currency, display_gross=False):
     return pybars.strlist([formatted_price])
 
 
-def send_email(
-    config: EmailConfig, recipient_list, context, subject="", template_str=""
-):
+EMAIL_TEMPLATE_HELPERS = {
+    "format_address": format_address,
+    "price": price,
+    "format_datetime": format_datetime,
+    "get_product_image_thumbnail": get_product_image_thumbnail,
+    "compare": compare,
+}
+
+
+@lru_cache(maxsize=COMPILED_TEMPLATES_CACHE_SIZE)
+def compile_template(template_str: str) -> Callable[..., str]:
+    """Compile the Handlebars template, reusing templates compiled before.
+
+    Compiled templates are cached by the template string, so a changed template is
+    compiled again.
+    """
+    return pybars.Compiler().compile(template_str)
+
+
+class PooledEmailBackend(EmailBackend):
+    """SMTP backend which keeps its connection open between messages.
+
+    A connection which was idle for too long, or which the server closed, is
+    reopened before sending.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_used = 0.0
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        with self._lock:
+            if (
+                self.connection
+                and time.monotonic() - self.last_used > EMAIL_CONNECTION_MAX_IDLE
+            ):
+                self.close()
+            # The parent closes only the connections it has opened itself.
+            self.open()
+            num_sent = super().send_messages(email_messages)
+            self.last_used = time.monotonic()
+        return num_sent
+
+    def _send(self, email_message):
+        try:
+            return super()._send(email_message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self.open()
+            return super()._send(email_message)
+
+
+# Process-wide SMTP connections, one for each email configuration.
+_email_backends: Dict[Tuple[Any, ...], PooledEmailBackend] = {}
+_email_backends_lock = threading.Lock()
+
+
+def get_email_backend(config: EmailConfig) -> PooledEmailBackend:
+    key = astuple(config)
+    with _email_backends_lock:
+        email_backend = _email_backends.get(key)
+        if email_backend is None:
+            email_backend = PooledEmailBackend(
+                host=config.host,
+                port=config.port,
+                username=config.username,
+                password=config.password,
+                use_ssl=config.use_ssl,
+                use_tls=config.use_tls,
+                timeout=DEFAULT_EMAIL_TIMEOUT,
+            )
+            _email_backends[key] = email_backend
+    return email_backend
+
+
+def close_email_backends():
+    with _email_backends_lock:
+        for email_backend in _email_backends.values():
+            email_backend.close()
+        _email_backends.clear()
+
+
+def _get_from_email(config: EmailConfig) -> str:
     sender_name = config.sender_name or ""
-    sender_address = config.sender_address
+    return str(Address(sender_name, addr_spec=config.sender_address))
 
-    from_email = str(Address(sender_name, addr_spec=sender_address))
 
-    email_backend = EmailBackend(
-        host=config.host,
-        port=config.port,
-        username=config.username,
-        password=config.password,
-        use_ssl=config.use_ssl,
-        use_tls=config.use_tls,
-        timeout=DEFAULT_EMAIL_TIMEOUT,
-    )
-    compiler = pybars.Compiler()
-    template = compiler.compile(template_str)
-    subject_template = compiler.compile(subject)
-    helpers = {
-        "format_address": format_address,
-        "price": price,
-        "format_datetime": format_datetime,
-        "get_product_image_thumbnail": get_product_image_thumbnail,
-        "compare": compare,
-    }
-    message = template(context, helpers=helpers)
-    subject_message = subject_template(context, helpers)
+def send_email(
+    config: EmailConfig, recipient_list, context, subject="", template_str=""
+):
+    template = compile_template(template_str)
+    subject_template = compile_template(subject)
+    message = template(context, helpers=EMAIL_TEMPLATE_HELPERS)
+    subject_message = subject_template(context, helpers=EMAIL_TEMPLATE_HELPERS)
     send_mail(
         subject_message,
         html2text.html2text(message),
-        from_email,
+        _get_from_email(config),
         recipient_list,
         html_message=message,
-        connection=email_backend,
+        connection=get_email_backend(config),
     )
 
 
+def send_emails(
+    config: EmailConfig,
+    recipients_with_context: Iterable[Tuple[List[str], dict]],
+    subject="",
+    template_str="",
+) -> int:
+    """Send the email rendered for each recipient list over a single connection.
+
+    Return the number of sent messages.
+    """
+    template = compile_template(template_str)
+    subject_template = compile_template(subject)
+    from_email = _get_from_email(config)
+    email_backend = get_email_backend(config)
+    email_messages = []
+    for recipient_list, context in recipients_with_context:
+        message = template(context, helpers=EMAIL_TEMPLATE_HELPERS)
+        email_message = EmailMultiAlternatives(
+            subject_template(context, helpers=EMAIL_TEMPLATE_HELPERS),
+            html2text.html2text(message),
+            from_email,
+            recipient_list,
+            connection=email_backend,
+        )
+        email_message.attach_alternative(message, "text/html")
+        email_messages.append(email_message)
+    return email_backend.send_messages(email_messages)
+
+
 def validate_email_config(config: EmailConfig):
     email_backend = EmailBackend(
         host=config.host,
@@ -370,6 +474,7 @@ def get_email_subject(
     return default
 
 
+@lru_cache(maxsize=None)
 def get_default_email_template(
     template_file_name: str, default_template_path: str
 ) -> str:
@@ -1,13 +1,12 @@
 from typing import Any, Optional
-from uuid import uuid4
 
-from django.core.files.base import ContentFile
+from django.db import transaction
 
-from ...core import JobStatus
 from ...invoice.models import Invoice
 from ...order.models import Order
 from ..base_plugin import BasePlugin
-from .utils import generate_invoice_number, generate_invoice_pdf
+from .tasks import generate_invoices_task
+from .utils import generate_invoice_number
 
 
 class InvoicingPlugin(BasePlugin):
@@ -24,14 +23,7 @@ class InvoicingPlugin(BasePlugin):
         previous_value: Any,
     ) -> Any:
         invoice.update_invoice(number=generate_invoice_number())
-        file_content, creation_date = generate_invoice_pdf(invoice)
-        invoice.created = creation_date
-        invoice.invoice_file.save(
-            f"invoice-{invoice.number}-order-{order.id}-{uuid4()}.pdf",
-            ContentFile(file_content),
-        )
-        invoice.status = JobStatus.SUCCESS
-        invoice.save(
-            update_fields=["created", "number", "invoice_file", "status", "updated_at"]
-        )
+        invoice.save(update_fields=["number", "updated_at"])
+        # The PDF is rendered in the background, the invoice stays pending until then.
+        transaction.on_commit(lambda: generate_invoices_task.delay([invoice.pk]))
         return invoice
@@ -0,0 +1,74 @@
+import logging
+from typing import List
+
+from ...celeryconf import app
+from ...core import JobStatus
+from ...invoice.models import Invoice
+from ...order import events as order_events
+from ...order.models import Order
+from .utils import (
+    chunk_products,
+    generate_invoice_number,
+    render_invoice_html,
+    save_invoice_pdf,
+)
+from .workers import write_invoice_pdfs
+
+logger = logging.getLogger(__name__)
+
+# Number of invoices whose rendered templates are kept in memory at once.
+INVOICES_CHUNK_SIZE = 100
+
+
+def _mark_invoice_failed(invoice: Invoice):
+    logger.exception("Generating invoice %s failed.", invoice.pk)
+    invoice.status = JobStatus.FAILED
+    invoice.message = "Generating the invoice failed."
+    invoice.save(update_fields=["status", "message", "updated_at"])
+
+
+def generate_invoices(invoices: List[Invoice]):
+    """Generate PDFs of the invoices.
+
+    An invoice which can't be generated is marked as failed, without stopping the
+    rest.
+    """
+    for chunk in chunk_products(invoices, INVOICES_CHUNK_SIZE):
+        rendered = []
+        for invoice in chunk:
+            try:
+                rendered.append((invoice, *render_invoice_html(invoice)))
+            except Exception:
+                _mark_invoice_failed(invoice)
+        pdfs = write_invoice_pdfs([template for _, template, _ in rendered])
+        for (invoice, _, creation_date), pdf in zip(rendered, pdfs):
+            try:
+                if isinstance(pdf, Exception):
+                    raise pdf
+                save_invoice_pdf(invoice, pdf, creation_date)
+            except Exception:
+                _mark_invoice_failed(invoice)
+                continue
+            order_events.invoice_generated_event(
+                order=invoice.order, user=None, invoice_number=invoice.number
+            )
+
+
+@app.task
+def generate_invoices_task(invoice_ids: List[int]):
+    invoices = Invoice.objects.filter(pk__in=invoice_ids).prefetch_related(
+        "order__lines",
+        "order__billing_address",
+        "order__shipping_address",
+        "order__user",
+    )
+    generate_invoices(list(invoices.order_by("pk")))
+
+
+@app.task
+def generate_order_invoices_task(order_ids: List[int]):
+    invoices = [
+        Invoice.objects.create(order=order, number=generate_invoice_number())
+        for order in Order.objects.filter(pk__in=order_ids).order_by("pk")
+    ]
+    generate_invoices_task([invoice.pk for invoice in invoices])
@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+from ...utils import render_invoice_html
+from ...workers import shutdown_invoice_pdf_workers, write_invoice_pdfs
+
+INVOICES_PER_RUN = 50
+
+
+@pytest.fixture
+def invoice_templates(fulfilled_order):
+    rendered_template, _ = render_invoice_html(fulfilled_order.invoices.first())
+    return [rendered_template] * INVOICES_PER_RUN
+
+
+@pytest.mark.parametrize("workers", [0, 2, 4])
+def test_invoice_pdfs_throughput(workers, invoice_templates, settings, record_property):
+    # given
+    settings.INVOICE_PDF_WORKERS = workers
+    # Warm up the workers, so their start isn't measured.
+    write_invoice_pdfs(invoice_templates[:1])
+
+    # when
+    start = time.perf_counter()
+    pdfs = write_invoice_pdfs(invoice_templates)
+    duration = time.perf_counter() - start
+    shutdown_invoice_pdf_workers()
+
+    # then
+    record_property("workers", workers)
+    record_property("invoices_per_second", INVOICES_PER_RUN / duration)
+    assert len(pdfs) == INVOICES_PER_RUN
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
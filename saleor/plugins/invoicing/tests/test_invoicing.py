@@ -30,12 +30,13 @@ def test_get_product_limit_first_page(product):
 
 @patch("saleor.plugins.invoicing.utils.HTML")
 @patch("saleor.plugins.invoicing.utils.get_template")
-@patch("saleor.plugins.invoicing.utils.os")
+@patch("saleor.plugins.invoicing.utils.get_invoice_stylesheet")
 def test_generate_invoice_pdf_for_order(
-    os_mock, get_template_mock, HTML_mock, fulfilled_order
+    get_invoice_stylesheet_mock, get_template_mock, HTML_mock, fulfilled_order
 ):
     get_template_mock.return_value.render = Mock(return_value="<html></html>")
-    os_mock.path.join.return_value = "test"
+    stylesheet, font_config = Mock(), Mock()
+    get_invoice_stylesheet_mock.return_value = (stylesheet, font_config)
 
     content, creation = generate_invoice_pdf(fulfilled_order.invoices.first())
 
@@ -44,7 +45,6 @@ def test_generate_invoice_pdf_for_order(
             "invoice": fulfilled_order.invoices.first(),
             "creation_date": datetime.now(tz=pytz.utc).strftime("%d %b %Y"),
             "order": fulfilled_order,
-            "font_path": "file://test",
             "products_first_page": list(fulfilled_order.lines.all()),
             "rest_of_products": [],
         }
@@ -52,6 +52,10 @@ def test_generate_invoice_pdf_for_order(
     HTML_mock.assert_called_once_with(
         string=get_template_mock.return_value.render.return_value
     )
+    HTML_mock.return_value.write_pdf.assert_called_once_with(
+        stylesheets=[stylesheet], font_config=font_config
+    )
+    assert content == HTML_mock.return_value.write_pdf.return_value
 
 
 def test_generate_invoice_number_invalid_numeration(fulfilled_order):
@@ -0,0 +1,189 @@
+from unittest.mock import Mock, patch
+
+from ....core import JobStatus
+from ....invoice.models import Invoice
+from ....order import OrderEvents
+from ...manager import get_plugins_manager
+from ..tasks import generate_invoices_task, generate_order_invoices_task
+from ..utils import render_invoice_html
+from ..workers import write_invoice_pdfs
+
+
+@patch("saleor.plugins.invoicing.plugin.generate_invoices_task.delay")
+@patch("saleor.plugins.invoicing.plugin.transaction")
+def test_invoice_request_generates_pdf_in_background(
+    transaction_mock, generate_invoices_task_delay_mock, settings, order_with_lines
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.invoicing.plugin.InvoicingPlugin"]
+    manager = get_plugins_manager()
+    invoice = Invoice.objects.create(order=order_with_lines)
+
+    # when
+    invoice = manager.invoice_request(
+        order=order_with_lines, invoice=invoice, number=None
+    )
+
+    # then
+    invoice.refresh_from_db()
+    assert invoice.number
+    assert invoice.status == JobStatus.PENDING
+    generate_invoices_task_delay_mock.assert_not_called()
+    on_commit_callback = transaction_mock.on_commit.call_args.args[0]
+    on_commit_callback()
+    generate_invoices_task_delay_mock.assert_called_once_with([invoice.pk])
+
+
+@patch("saleor.plugins.invoicing.tasks.write_invoice_pdfs")
+def test_generate_invoices_task(
+    write_invoice_pdfs_mock, media_root, order_with_lines, order_list
+):
+    # given
+    orders = [order_with_lines] + order_list
+    invoices = [
+        Invoice.objects.create(order=order, number=f"{order.pk}/01/2021")
+        for order in orders
+    ]
+    write_invoice_pdfs_mock.side_effect = lambda templates: [b"%PDF" for _ in templates]
+
+    # when
+    generate_invoices_task([invoice.pk for invoice in invoices])
+
+    # then
+    write_invoice_pdfs_mock.assert_called_once()
+    assert len(write_invoice_pdfs_mock.call_args.args[0]) == len(invoices)
+    for invoice, order in zip(invoices, orders):
+        invoice.refresh_from_db()
+        assert invoice.status == JobStatus.SUCCESS
+        assert invoice.invoice_file.read() == b"%PDF"
+        assert order.events.filter(
+            type=OrderEvents.INVOICE_GENERATED,
+            parameters__invoice_number=invoice.number,
+        ).exists()
+
+
+@patch("saleor.plugins.invoicing.tasks.write_invoice_pdfs")
+def test_generate_invoices_task_marks_failed_invoices(
+    write_invoice_pdfs_mock, media_root, order_with_lines, order_list
+):
+    # given
+    orders = [order_with_lines] + order_list
+    invoices = [
+        Invoice.objects.create(order=order, number=f"{order.pk}/01/2021")
+        for order in orders
+    ]
+    write_invoice_pdfs_mock.side_effect = lambda templates: [
+        Exception("Invalid template")
+    ] + [b"%PDF" for _ in templates[1:]]
+
+    # when
+    generate_invoices_task([invoice.pk for invoice in invoices])
+
+    # then
+    for invoice in invoices:
+        invoice.refresh_from_db()
+    assert invoices[0].status == JobStatus.FAILED
+    assert not invoices[0].invoice_file
+    assert not orders[0].events.filter(type=OrderEvents.INVOICE_GENERATED).exists()
+    assert {invoice.status for invoice in invoices[1:]} == {JobStatus.SUCCESS}
+
+
+@patch("saleor.plugins.invoicing.tasks.render_invoice_html")
+@patch("saleor.plugins.invoicing.tasks.write_invoice_pdfs")
+def test_generate_invoices_task_continues_after_render_failure(
+    write_invoice_pdfs_mock,
+    render_invoice_html_mock,
+    media_root,
+    order_with_lines,
+    order_list,
+):
+    # given
+    orders = [order_with_lines] + order_list
+    invoices = [
+        Invoice.objects.create(order=order, number=f"{order.pk}/01/2021")
+        for order in orders
+    ]
+    failing_invoice = invoices[1]
+
+    def render(invoice):
+        if invoice.pk == failing_invoice.pk:
+            raise Exception("Missing address")
+        return render_invoice_html(invoice)
+
+    render_invoice_html_mock.side_effect = render
+    write_invoice_pdfs_mock.side_effect = lambda templates: [b"%PDF" for _ in templates]
+
+    # when
+    generate_invoices_task([invoice.pk for invoice in invoices])
+
+    # then
+    assert len(write_invoice_pdfs_mock.call_args.args[0]) == len(invoices) - 1
+    failing_invoice.refresh_from_db()
+    assert failing_invoice.status == JobStatus.FAILED
+    assert (
+        Invoice.objects.filter(
+            pk__in=[invoice.pk for invoice in invoices], status=JobStatus.SUCCESS
+        ).count()
+        == len(invoices) - 1
+    )
+
+
+@patch("saleor.plugins.invoicing.tasks.write_invoice_pdfs")
+def test_generate_order_invoices_task(write_invoice_pdfs_mock, media_root, order_list):
+    # given
+    write_invoice_pdfs_mock.side_effect = lambda templates: [b"%PDF" for _ in templates]
+
+    # when
+    generate_order_invoices_task([order.pk for order in order_list])
+
+    # then
+    invoices = Invoice.objects.filter(order__in=order_list)
+    assert invoices.count() == len(order_list)
+    assert {invoice.status for invoice in invoices} == {JobStatus.SUCCESS}
+    assert len({invoice.number for invoice in invoices}) == len(order_list)
+
+
+@patch("saleor.plugins.invoicing.workers.write_invoice_pdf")
+def test_write_invoice_pdfs_without_workers(write_invoice_pdf_mock, settings):
+    # given
+    settings.INVOICE_PDF_WORKERS = 0
+    write_invoice_pdf_mock.side_effect = lambda template: template.encode()
+
+    # when
+    pdfs = write_invoice_pdfs(["<html>1</html>", "<html>2</html>"])
+
+    # then
+    assert pdfs == [b"<html>1</html>", b"<html>2</html>"]
+
+
+@patch("saleor.plugins.invoicing.workers.write_invoice_pdf")
+def test_write_invoice_pdfs_returns_errors_in_place(write_invoice_pdf_mock, settings):
+    # given
+    settings.INVOICE_PDF_WORKERS = 0
+    error = ValueError("Invalid template")
+    write_invoice_pdf_mock.side_effect = [error, b"%PDF"]
+
+    # when
+    pdfs = write_invoice_pdfs(["<html>1</html>", "<html>2</html>"])
+
+    # then
+    assert pdfs == [error, b"%PDF"]
+
+
+@patch("saleor.plugins.invoicing.workers._get_executor")
+@patch("saleor.plugins.invoicing.workers.current_billiard_process")
+@patch("saleor.plugins.invoicing.workers.write_invoice_pdf")
+def test_write_invoice_pdfs_in_prefork_pool_child(
+    write_invoice_pdf_mock, current_billiard_process_mock, get_executor_mock, settings
+):
+    # given
+    settings.INVOICE_PDF_WORKERS = 2
+    current_billiard_process_mock.return_value = Mock(daemon=True)
+    write_invoice_pdf_mock.side_effect = lambda template: template.encode()
+
+    # when
+    pdfs = write_invoice_pdfs(["<html>1</html>"])
+
+    # then
+    assert pdfs == [b"<html>1</html>"]
+    get_executor_mock.assert_not_called()
@@ -1,12 +1,18 @@
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
+from typing import Tuple
+from uuid import uuid4
 
 import pytz
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.template.loader import get_template
-from weasyprint import HTML
+from weasyprint import CSS, HTML
+from weasyprint.fonts import FontConfiguration
 
+from ...core import JobStatus
 from ...invoice.models import Invoice
 
 MAX_PRODUCTS_WITH_TABLE = 3
@@ -62,11 +68,22 @@ def get_product_limit_first_page(products):
     return MAX_PRODUCTS_WITHOUT_TABLE
 
 
-def generate_invoice_pdf(invoice):
-    font_path = os.path.join(
-        settings.PROJECT_ROOT, "templates", "invoices", "inter.ttf"
+@lru_cache(maxsize=None)
+def get_invoice_stylesheet() -> Tuple[CSS, FontConfiguration]:
+    """Return the parsed stylesheet of invoices with its fonts loaded.
+
+    Parsing the stylesheet and loading the fonts takes more time than rendering
+    most of the invoices, so it's done once per process.
+    """
+    stylesheet_path = os.path.join(
+        settings.PROJECT_ROOT, "templates", "invoices", "invoice.css"
     )
+    font_config = FontConfiguration()
+    stylesheet = CSS(filename=stylesheet_path, font_config=font_config)
+    return stylesheet, font_config
+
 
+def render_invoice_html(invoice) -> Tuple[str, datetime]:
     all_products = invoice.order.lines.all()
 
     product_limit_first_page = get_product_limit_first_page(all_products)
@@ -81,9 +98,33 @@ def generate_invoice_pdf(invoice):
             "invoice": invoice,
             "creation_date": creation_date.strftime("%d %b %Y"),
             "order": invoice.order,
-            "font_path": f"file://{font_path}",
             "products_first_page": products_first_page,
             "rest_of_products": rest_of_products,
         }
     )
-    return HTML(string=rendered_template).write_pdf(), creation_date
+    return rendered_template, creation_date
+
+
+def write_invoice_pdf(rendered_template: str) -> bytes:
+    stylesheet, font_config = get_invoice_stylesheet()
+    return HTML(string=rendered_template).write_pdf(
+        stylesheets=[stylesheet], font_config=font_config
+    )
+
+
+def generate_invoice_pdf(invoice):
+    rendered_template, creation_date = render_invoice_html(invoice)
+    return write_invoice_pdf(rendered_template), creation_date
+
+
+def save_invoice_pdf(invoice, file_content: bytes, creation_date: datetime):
+    invoice.created = creation_date
+    invoice.invoice_file.save(
+        f"invoice-{invoice.number}-order-{invoice.order_id}-{uuid4()}.pdf",
+        ContentFile(file_content),
+        save=False,
+    )
+    invoice.status = JobStatus.SUCCESS
+    invoice.save(
+        update_fields=["created", "number", "invoice_file", "status", "updated_at"]
+    )
@@ -0,0 +1,85 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Union
+
+from billiard.process import current_process as current_billiard_process
+from django.conf import settings
+
+from .utils import get_invoice_stylesheet, write_invoice_pdf
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def can_start_invoice_pdf_workers() -> bool:
+    """Return whether the current process can start its own pool of processes.
+
+    Children of the Celery prefork pool are daemonic. Processes forked by them
+    aren't cleaned up when the child is replaced, so PDFs are written in the
+    process of the task there. Use the solo or threads pool to run invoice tasks
+    with `INVOICE_PDF_WORKERS`.
+    """
+    return not (
+        multiprocessing.current_process().daemon or current_billiard_process().daemon
+    )
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Workers are forked, so they start with the stylesheet and fonts
+            # already loaded by this process.
+            get_invoice_stylesheet()
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.INVOICE_PDF_WORKERS,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=get_invoice_stylesheet,
+            )
+        return _executor
+
+
+def shutdown_invoice_pdf_workers():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def _write_invoice_pdf_or_error(rendered_template: str) -> Union[bytes, Exception]:
+    try:
+        return write_invoice_pdf(rendered_template)
+    except Exception as e:
+        return e
+
+
+def write_invoice_pdfs(
+    rendered_templates: Sequence[str],
+) -> List[Union[bytes, Exception]]:
+    """Return PDFs of the rendered invoice templates, in the same order.
+
+    A template which can't be written gets the raised exception instead of its
+    PDF, so it doesn't stop the rest. With `INVOICE_PDF_WORKERS` set, the PDFs are
+    written in parallel by a pool of processes which is kept for the next calls.
+    """
+    if not settings.INVOICE_PDF_WORKERS or not can_start_invoice_pdf_workers():
+        return [
+            _write_invoice_pdf_or_error(template) for template in rendered_templates
+        ]
+    try:
+        return list(
+            _get_executor().map(_write_invoice_pdf_or_error, rendered_templates)
+        )
+    except BrokenProcessPool:
+        # A pool with a killed worker can't be used anymore.
+        logger.warning("Invoice PDF workers were terminated.", exc_info=True)
+        shutdown_invoice_pdf_workers()
+        return [
+            _write_invoice_pdf_or_error(template) for template in rendered_templates
+        ]
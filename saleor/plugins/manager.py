@@ -1,9 +1,23 @@
+import time
+from copy import deepcopy
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
@@ -14,7 +28,7 @@ from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxType, zero_taxed_money
 from ..discount import DiscountInfo
-from .base_plugin import ExternalAccessTokens
+from .base_plugin import BasePlugin, ExternalAccessTokens
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -41,33 +55,158 @@ if TYPE_CHECKING:
         ProductVariant,
         ProductVariantChannelListing,
     )
-    from .base_plugin import BasePlugin
 
 
 NotifyEventTypeChoice = str
 
+PLUGINS_CONFIGURATION_VERSION_CACHE_KEY = "plugins_configuration_version"
+
+# Plugin class with its stored configuration and active flag. The configuration is
+# None when the plugin has no `PluginConfiguration` row and should use defaults.
+PluginSpec = Tuple[Type["BasePlugin"], Optional[list], Optional[bool]]
+
+# Process-wide cache of loaded plugin specs, keyed by the plugin paths. Each entry
+# holds the configuration version it was loaded for.
+_plugins_specs_cache: Dict[Tuple[str, ...], Tuple[int, List[PluginSpec]]] = {}
+# Process-wide cache of single plugin configurations, keyed by the plugin ID.
+_plugin_configurations_cache: Dict[str, Tuple[int, Optional[PluginConfiguration]]] = {}
+
+
+def get_plugins_configuration_version() -> int:
+    return cache.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, 0)
+
+
+def invalidate_plugins_configuration():
+    """Force all workers to reload plugin configurations.
+
+    The version is shared through the cache backend, so other processes notice the
+    change on their next `get_plugins_manager` call. It requires a cache shared by
+    all processes; with the default local memory cache, other processes keep their
+    configurations until restarted. The version is bumped again once the
+    transaction is committed, as other processes could load the configurations
+    before the changes were visible.
+    """
+
+    def bump_version():
+        cache.set(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        _plugins_specs_cache.clear()
+        _plugin_configurations_cache.clear()
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def _load_plugins_specs(plugins: List[str]) -> List[PluginSpec]:
+    with opentracing.global_tracer().start_active_span("_load_plugins_specs"):
+        all_configs = {pc.identifier: pc for pc in PluginConfiguration.objects.all()}
+        specs: List[PluginSpec] = []
+        for plugin_path in plugins:
+            PluginClass = import_string(plugin_path)
+            existing_config = all_configs.get(PluginClass.PLUGIN_ID)
+            if existing_config:
+                specs.append(
+                    (
+                        PluginClass,
+                        existing_config.configuration,
+                        existing_config.active,
+                    )
+                )
+            else:
+                specs.append((PluginClass, None, None))
+        return specs
+
+
+def get_cached_plugin_configuration(
+    identifier: str,
+) -> Optional[PluginConfiguration]:
+    """Return the stored configuration of the plugin, cached per process.
+
+    It's meant for code running outside of the plugins manager, e.g. email tasks
+    which need the configured templates of every sent message.
+    """
+    version = get_plugins_configuration_version()
+    cached = _plugin_configurations_cache.get(identifier)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    plugin_configuration = PluginConfiguration.objects.filter(
+        identifier=identifier
+    ).first()
+    _plugin_configurations_cache[identifier] = (version, plugin_configuration)
+    return plugin_configuration
+
+
+# Hooks as defined by `BasePlugin`, they all return `NotImplemented`.
+_BASE_PLUGIN_METHODS = {
+    name: attr for name, attr in vars(BasePlugin).items() if callable(attr)
+}
+
+
+def overrides_method(plugin: "BasePlugin", method_name: str) -> bool:
+    """Return whether calling the method on the plugin can return a value."""
+    method = getattr(type(plugin), method_name, NotImplemented)
+    if method is NotImplemented:
+        return False
+    return method is not _BASE_PLUGIN_METHODS.get(method_name)
+
+
+def get_plugins_specs(plugins: List[str]) -> List[PluginSpec]:
+    """Return plugin classes with their configuration, cached per process.
+
+    The cache entry is reused as long as the shared configuration version does not
+    change, which saves importing the plugins and querying `PluginConfiguration`
+    on every request.
+    """
+    key = tuple(plugins)
+    version = get_plugins_configuration_version()
+    cached = _plugins_specs_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    specs = _load_plugins_specs(plugins)
+    _plugins_specs_cache[key] = (version, specs)
+    return specs
+
 
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
     plugins: List["BasePlugin"] = []
+    plugins_by_method: Dict[str, List["BasePlugin"]] = {}
 
     def __init__(self, plugins: List[str]):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self.plugins = []
-            all_configs = self._get_all_plugin_configs()
-            for plugin_path in plugins:
-                with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
-                    PluginClass = import_string(plugin_path)
-                    if PluginClass.PLUGIN_ID in all_configs:
-                        existing_config = all_configs[PluginClass.PLUGIN_ID]
-                        plugin_config = existing_config.configuration
-                        active = existing_config.active
-                    else:
+            for PluginClass, plugin_config, active in get_plugins_specs(plugins):
+                with opentracing.global_tracer().start_active_span(
+                    f"{PluginClass.__module__}.{PluginClass.__name__}"
+                ):
+                    if plugin_config is None:
                         plugin_config = PluginClass.DEFAULT_CONFIGURATION
                         active = PluginClass.get_default_active()
-                    plugin = PluginClass(configuration=plugin_config, active=active)
+                    # Plugins update their configuration in place, so every manager
+                    # gets its own copy of the cached one.
+                    plugin = PluginClass(
+                        configuration=deepcopy(plugin_config), active=active
+                    )
                 self.plugins.append(plugin)
+            self.plugins_by_method = {}
+
+    def get_plugins_for_method(self, method_name: str) -> List["BasePlugin"]:
+        """Return plugins which implement the method, in the order of declaration.
+
+        Plugins inherit `NotImplemented` returning methods from `BasePlugin`, so
+        hooks can skip every plugin which doesn't override the called method. The
+        list is built on the first call of the method. Inactive plugins are kept,
+        as each plugin checks whether it's active on its own.
+        """
+        plugins = self.plugins_by_method.get(method_name)
+        if plugins is None:
+            plugins = [
+                plugin
+                for plugin in self.plugins
+                if overrides_method(plugin, method_name)
+            ]
+            self.plugins_by_method[method_name] = plugins
+        return plugins
 
     def __run_method_on_plugins(
         self, method_name: str, default_value: Any, *args, **kwargs
@@ -77,10 +216,12 @@ class PluginsManager(PaymentInterface):
             f"PluginsManager.{method_name}"
         ):
             value = default_value
-            for plugin in self.plugins:
-                value = self.__run_method_on_single_plugin(
-                    plugin, method_name, value, *args, **kwargs
+            for plugin in self.get_plugins_for_method(method_name):
+                returned_value = getattr(plugin, method_name)(
+                    *args, **kwargs, previous_value=value
                 )
+                if returned_value is not NotImplemented:
+                    value = returned_value
             return value
 
     def __run_method_on_single_plugin(
@@ -641,14 +782,6 @@ class PluginsManager(PaymentInterface):
             " payment method is inaccessible!"
         )
 
-    def _get_all_plugin_configs(self):
-        with opentracing.global_tracer().start_active_span("_get_all_plugin_configs"):
-            if not hasattr(self, "_plugin_configs"):
-                self._plugin_configs = {
-                    pc.identifier: pc for pc in PluginConfiguration.objects.all()
-                }
-            return self._plugin_configs
-
     # FIXME these methods should be more generic
 
     def assign_tax_code_to_object_meta(
@@ -0,0 +1,10 @@
+from .manager import invalidate_plugins_configuration
+from .vatlayer import invalidate_vat_rates
+
+
+def invalidate_plugins_configuration_handler(sender, instance, **kwargs):
+    invalidate_plugins_configuration()
+
+
+def invalidate_vat_rates_handler(sender, instance, **kwargs):
+    invalidate_vat_rates()
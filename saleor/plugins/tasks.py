@@ -0,0 +1,92 @@
+import hashlib
+import json
+import logging
+from typing import Any, List
+
+from celery import Task
+from django.conf import settings
+from django.core.cache import cache
+
+from ..celeryconf import app
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_QUEUE_PREFIX = "email-batch"
+
+
+def get_email_batch_key(task_name: str, config: dict) -> str:
+    config_hash = hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{EMAIL_BATCH_QUEUE_PREFIX}-{task_name}-{config_hash}"
+
+
+def get_broker_connection():
+    return app.pool.acquire(block=True)
+
+
+def delay_email_task(task: Task, recipient: Any, payload: dict, config: dict):
+    """Send the email in the background, together with similar emails if enabled.
+
+    With `EMAIL_BATCH_WINDOW` set, emails of the same task and configuration are
+    buffered in a queue of the Celery broker and sent by a single task after the
+    window passes. Without a broker, tasks run eagerly and aren't batched.
+    """
+    if not settings.EMAIL_BATCH_WINDOW or settings.CELERY_TASK_ALWAYS_EAGER:
+        task.delay(recipient, payload, config)
+        return
+    queue_email_job(task.name, [recipient, payload, config])
+
+
+def queue_email_job(task_name: str, args: List[Any], attempt: int = 0):
+    batch_key = get_email_batch_key(task_name, args[-1])
+    with get_broker_connection() as connection:
+        with connection.SimpleQueue(batch_key, serializer="json") as queue:
+            queue.put({"args": args, "attempt": attempt})
+    _schedule_email_batch(task_name, batch_key)
+
+
+def _schedule_email_batch(task_name: str, batch_key: str):
+    # The flag only saves sending a task per email. Jobs are kept by the broker,
+    # so a batch task scheduled more than once finds the queue empty.
+    window = settings.EMAIL_BATCH_WINDOW
+    if cache.add(f"{batch_key}-scheduled", True, timeout=window):
+        send_email_batch_task.apply_async((task_name, batch_key), countdown=window)
+
+
+@app.task
+def send_email_batch_task(task_name: str, batch_key: str):
+    """Send emails buffered in the broker queue of a task and configuration.
+
+    Emails are sent one after another by the same worker, so they share the email
+    connection and the compiled template. An email which fails is queued again
+    to the next batch, without stopping the rest of this one. Jobs are acknowledged
+    only once they were handled, so the broker delivers them again if the worker
+    dies.
+    """
+    cache.delete(f"{batch_key}-scheduled")
+    task = app.tasks[task_name]
+    with get_broker_connection() as connection:
+        with connection.SimpleQueue(batch_key, serializer="json") as queue:
+            # Emails queued while the batch is being sent wait for the next one.
+            for _ in range(queue.qsize()):
+                try:
+                    message = queue.get_nowait()
+                except queue.Empty:
+                    break
+                job = message.payload
+                try:
+                    task(*job["args"])
+                except Exception:
+                    logger.warning(
+                        "Sending email by %s failed.", task_name, exc_info=True
+                    )
+                    if job["attempt"] < settings.EMAIL_BATCH_MAX_RETRIES:
+                        queue.put({"args": job["args"], "attempt": job["attempt"] + 1})
+                    else:
+                        logger.error("Giving up sending email by %s.", task_name)
+                message.ack()
+            has_pending_jobs = bool(queue.qsize())
+
+    if has_pending_jobs:
+        _schedule_email_batch(task_name, batch_key)
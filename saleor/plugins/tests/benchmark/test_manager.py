@@ -0,0 +1,57 @@
+import timeit
+
+import pytest
+
+from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ...manager import PluginsManager
+
+CALCULATIONS_PER_RUN = 1000
+
+# A plugin overriding the checkout hooks followed by plugins which only listen to
+# other events, as it is in the usual setup.
+PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"] + [
+    "saleor.plugins.tests.sample_plugins.ActivePlugin"
+] * 9
+
+
+@pytest.mark.parametrize("plugins_count", [0, 3, 10])
+def test_checkout_line_calculations_cost(
+    plugins_count, checkout_with_item, discount_info, record_property
+):
+    # given
+    manager = PluginsManager(plugins=PLUGINS[:plugins_count])
+    lines = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(
+        checkout_with_item, lines, [discount_info], manager
+    )
+    line_info = lines[0]
+    address = checkout_with_item.shipping_address
+
+    def calculate_line():
+        total = manager.calculate_checkout_line_total(
+            checkout_info, lines, line_info, address, [discount_info]
+        )
+        manager.calculate_checkout_line_unit_price(
+            total,
+            line_info.line.quantity,
+            checkout_info,
+            lines,
+            line_info,
+            address,
+            [discount_info],
+        )
+        manager.get_checkout_line_tax_rate(
+            checkout_info, lines, line_info, address, [discount_info], total
+        )
+
+    # when
+    duration = timeit.timeit(calculate_line, number=CALCULATIONS_PER_RUN)
+
+    # then
+    record_property("plugins_count", plugins_count)
+    record_property("seconds_per_line", duration / CALCULATIONS_PER_RUN)
+    expected_plugins = 1 if plugins_count else 0
+    assert (
+        len(manager.get_plugins_for_method("calculate_checkout_line_total"))
+        == expected_plugins
+    )
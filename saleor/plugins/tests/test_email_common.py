@@ -0,0 +1,156 @@
+import smtplib
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ..email_common import (
+    EMAIL_CONNECTION_MAX_IDLE,
+    EmailConfig,
+    close_email_backends,
+    compile_template,
+    get_email_backend,
+    send_email,
+    send_emails,
+)
+from ..manager import get_cached_plugin_configuration
+from ..models import PluginConfiguration
+
+TEMPLATE = "<html><body>Hello {{ name }}</body></html>"
+
+
+@pytest.fixture
+def email_config():
+    return EmailConfig(
+        host="localhost", port="25", sender_address="noreply@example.com"
+    )
+
+
+@pytest.fixture
+def smtp_mock():
+    close_email_backends()
+    with patch("django.core.mail.backends.smtp.smtplib.SMTP") as smtp_mock:
+        smtp_mock.return_value.sendmail.return_value = {}
+        yield smtp_mock
+    close_email_backends()
+
+
+def test_compile_template_reuses_compiled_template():
+    # given
+    compile_template.cache_clear()
+    template = compile_template(TEMPLATE)
+
+    # when
+    with patch("saleor.plugins.email_common.pybars.Compiler") as compiler_mock:
+        cached_template = compile_template(TEMPLATE)
+
+    # then
+    assert cached_template is template
+    compiler_mock.assert_not_called()
+    assert cached_template({"name": "John"}) == ("<html><body>Hello John</body></html>")
+
+
+def test_send_email_reuses_connection(email_config, smtp_mock):
+    # when
+    for name in ["John", "Jane"]:
+        send_email(
+            email_config,
+            ["customer@example.com"],
+            {"name": name},
+            subject="Hello",
+            template_str=TEMPLATE,
+        )
+
+    # then
+    smtp_mock.assert_called_once()
+    assert smtp_mock.return_value.sendmail.call_count == 2
+    smtp_mock.return_value.quit.assert_not_called()
+
+
+def test_send_email_reconnects_after_disconnect(email_config, smtp_mock):
+    # given
+    smtp_mock.return_value.sendmail.side_effect = [
+        smtplib.SMTPServerDisconnected(),
+        {},
+    ]
+
+    # when
+    send_email(
+        email_config,
+        ["customer@example.com"],
+        {"name": "John"},
+        subject="Hello",
+        template_str=TEMPLATE,
+    )
+
+    # then
+    assert smtp_mock.call_count == 2
+    assert smtp_mock.return_value.sendmail.call_count == 2
+
+
+def test_send_email_reconnects_idle_connection(email_config, smtp_mock):
+    # given
+    send_email(email_config, ["customer@example.com"], {}, template_str=TEMPLATE)
+    email_backend = get_email_backend(email_config)
+    email_backend.last_used = time.monotonic() - EMAIL_CONNECTION_MAX_IDLE - 1
+
+    # when
+    send_email(email_config, ["customer@example.com"], {}, template_str=TEMPLATE)
+
+    # then
+    assert smtp_mock.call_count == 2
+    smtp_mock.return_value.quit.assert_called_once()
+
+
+def test_send_emails(email_config, smtp_mock):
+    # given
+    recipients_with_context = [
+        (["john@example.com"], {"name": "John"}),
+        (["jane@example.com"], {"name": "Jane"}),
+    ]
+
+    # when
+    sent_count = send_emails(
+        email_config,
+        recipients_with_context,
+        subject="Hello {{ name }}",
+        template_str=TEMPLATE,
+    )
+
+    # then
+    assert sent_count == 2
+    smtp_mock.assert_called_once()
+    calls = smtp_mock.return_value.sendmail.call_args_list
+    assert [call.args[1] for call in calls] == [
+        ["john@example.com"],
+        ["jane@example.com"],
+    ]
+    assert b"Hello Jane" in calls[1].args[2]
+
+
+def test_get_cached_plugin_configuration(plugin_configuration, assert_num_queries):
+    # given
+    identifier = plugin_configuration.identifier
+    get_cached_plugin_configuration(identifier)
+
+    # when
+    with assert_num_queries(0):
+        cached_configuration = get_cached_plugin_configuration(identifier)
+
+    # then
+    assert cached_configuration == plugin_configuration
+
+
+def test_get_cached_plugin_configuration_after_change(plugin_configuration):
+    # given
+    identifier = plugin_configuration.identifier
+    get_cached_plugin_configuration(identifier)
+
+    # when
+    plugin_configuration.active = False
+    plugin_configuration.save(update_fields=["active"])
+
+    # then
+    assert get_cached_plugin_configuration(identifier).active is False
+    PluginConfiguration.objects.all().delete()
+    assert get_cached_plugin_configuration(identifier) is None
@@ -1,5 +1,6 @@
 import json
 from decimal import Decimal
+from unittest import mock
 
 import pytest
 from django.http import HttpResponseNotFound, JsonResponse
@@ -10,8 +11,15 @@ from ...checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ...core.taxes import TaxType
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
+from ...tests.utils import flush_post_commit_hooks
 from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import (
+    PluginsManager,
+    get_plugins_configuration_version,
+    get_plugins_manager,
+    get_plugins_specs,
+    invalidate_plugins_configuration,
+)
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ActiveDummyPaymentGateway,
@@ -442,10 +450,13 @@ def test_manager_get_plugin_configurations(plugin_configuration):
         "saleor.plugins.tests.sample_plugins.PluginSample",
         "saleor.plugins.tests.sample_plugins.PluginInactive",
     ]
-    manager = PluginsManager(plugins=plugins)
-    plugin_configs = manager._plugin_configs.values()
-    assert len(plugin_configs) == 1
-    assert set(plugin_configs) == set(list(PluginConfiguration.objects.all()))
+    specs = get_plugins_specs(plugins)
+    assert [(plugin_class, active) for plugin_class, _, active in specs] == [
+        (PluginSample, plugin_configuration.active),
+        (PluginInactive, None),
+    ]
+    assert specs[0][1] == plugin_configuration.configuration
+    assert specs[1][1] is None
 
 
 def test_manager_get_plugin_configuration(plugin_configuration):
@@ -469,6 +480,83 @@ def test_manager_save_plugin_configuration(plugin_configuration):
     assert not plugin_configuration.active
 
 
+def test_manager_get_plugins_for_method_returns_overriding_plugins():
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+        "saleor.plugins.tests.sample_plugins.ActivePlugin",
+    ]
+    manager = PluginsManager(plugins=plugins)
+    plugin_sample = manager.get_plugin(PluginSample.PLUGIN_ID)
+    plugin_inactive = manager.get_plugin(PluginInactive.PLUGIN_ID)
+
+    assert manager.get_plugins_for_method("calculate_checkout_line_total") == [
+        plugin_sample
+    ]
+    assert manager.get_plugins_for_method("external_obtain_access_tokens") == [
+        plugin_sample,
+        plugin_inactive,
+    ]
+    assert manager.get_plugins_for_method("order_updated") == []
+
+
+@mock.patch("saleor.plugins.base_plugin.BasePlugin.order_updated")
+def test_manager_runs_hooks_patched_on_base_plugin(mocked_order_updated, order):
+    plugins = ["saleor.plugins.tests.sample_plugins.ActivePlugin"]
+    manager = PluginsManager(plugins=plugins)
+
+    manager.order_updated(order)
+
+    mocked_order_updated.assert_called_once_with(order, previous_value=None)
+
+
+def test_get_plugins_manager_reuses_cached_configuration(
+    settings, plugin_configuration, assert_num_queries
+):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    get_plugins_manager()
+    with assert_num_queries(0):
+        manager = get_plugins_manager()
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_save_plugin_configuration_invalidates_cached_configuration(
+    settings, plugin_configuration
+):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_plugins_manager()
+    manager.save_plugin_configuration(PluginSample.PLUGIN_ID, {"active": False})
+    plugin = get_plugins_manager().get_plugin(PluginSample.PLUGIN_ID)
+    assert not plugin.active
+
+
+def test_invalidate_plugins_configuration_again_on_commit(
+    settings, plugin_configuration, assert_num_queries
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    invalidate_plugins_configuration()
+    version = get_plugins_configuration_version()
+    # Configurations loaded before the commit could miss the changes.
+    get_plugins_manager()
+
+    # when
+    flush_post_commit_hooks()
+
+    # then
+    assert get_plugins_configuration_version() != version
+    with assert_num_queries(1):
+        get_plugins_manager()
+
+
+def test_cached_plugins_do_not_share_configuration(settings, plugin_configuration):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    first_plugin = get_plugins_manager().get_plugin(PluginSample.PLUGIN_ID)
+    first_plugin.configuration[0]["value"] = "changed"
+    second_plugin = get_plugins_manager().get_plugin(PluginSample.PLUGIN_ID)
+    assert second_plugin.configuration[0]["value"] != "changed"
+
+
 def test_plugin_updates_configuration_shape(
     new_config,
     new_config_structure,
@@ -0,0 +1,202 @@
+from unittest import mock
+
+import pytest
+from kombu import Connection
+from kombu.transport import memory
+
+from ..tasks import (
+    delay_email_task,
+    get_email_batch_key,
+    queue_email_job,
+    send_email_batch_task,
+)
+from ..user_email.tasks import (
+    send_account_confirmation_email_task,
+    send_password_reset_email_task,
+)
+
+EMAIL_CONFIG = {
+    "host": "localhost",
+    "port": "1025",
+    "username": None,
+    "password": None,
+    "use_ssl": False,
+    "use_tls": False,
+}
+
+
+@pytest.fixture
+def email_batches_enabled(settings, monkeypatch):
+    settings.EMAIL_BATCH_WINDOW = 5
+    settings.EMAIL_BATCH_MAX_RETRIES = 1
+    settings.CELERY_TASK_ALWAYS_EAGER = False
+    monkeypatch.setattr(
+        "saleor.plugins.tasks.get_broker_connection",
+        lambda: Connection("memory://"),
+    )
+    yield
+    memory.Channel.queues.clear()
+
+
+def _get_batch_key(task, config=EMAIL_CONFIG):
+    return get_email_batch_key(task.name, config)
+
+
+def _pop_queued_jobs(batch_key):
+    jobs = []
+    with Connection("memory://") as connection:
+        with connection.SimpleQueue(batch_key) as queue:
+            for _ in range(queue.qsize()):
+                message = queue.get_nowait()
+                jobs.append(message.payload)
+                message.ack()
+    return jobs
+
+
+@mock.patch(
+    "saleor.plugins.user_email.tasks.send_account_confirmation_email_task.delay"
+)
+def test_delay_email_task_without_batching(mocked_delay, settings):
+    # given
+    settings.EMAIL_BATCH_WINDOW = 0
+    payload = {"recipient_email": "user@example.com"}
+
+    # when
+    delay_email_task(
+        send_account_confirmation_email_task,
+        "user@example.com",
+        payload,
+        EMAIL_CONFIG,
+    )
+
+    # then
+    mocked_delay.assert_called_once_with("user@example.com", payload, EMAIL_CONFIG)
+
+
+@mock.patch(
+    "saleor.plugins.user_email.tasks.send_account_confirmation_email_task.delay"
+)
+def test_delay_email_task_without_broker(mocked_delay, settings):
+    # given
+    settings.EMAIL_BATCH_WINDOW = 5
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    payload = {"recipient_email": "user@example.com"}
+
+    # when
+    delay_email_task(
+        send_account_confirmation_email_task,
+        "user@example.com",
+        payload,
+        EMAIL_CONFIG,
+    )
+
+    # then
+    mocked_delay.assert_called_once_with("user@example.com", payload, EMAIL_CONFIG)
+
+
+@mock.patch("saleor.plugins.tasks.send_email_batch_task.apply_async")
+@mock.patch("saleor.plugins.user_email.tasks.send_email")
+def test_delay_email_task_schedules_single_batch(
+    mocked_send_email, mocked_apply_async, email_batches_enabled
+):
+    # given
+    task = send_account_confirmation_email_task
+    recipients = ["user1@example.com", "user2@example.com", "user3@example.com"]
+
+    # when
+    for recipient in recipients:
+        delay_email_task(task, recipient, {"recipient_email": recipient}, EMAIL_CONFIG)
+
+    # then
+    mocked_send_email.assert_not_called()
+    batch_key = _get_batch_key(task)
+    mocked_apply_async.assert_called_once_with((task.name, batch_key), countdown=5)
+
+    # when
+    send_email_batch_task(task.name, batch_key)
+
+    # then
+    assert [
+        call.kwargs["recipient_list"] for call in mocked_send_email.call_args_list
+    ] == [[recipient] for recipient in recipients]
+    assert _pop_queued_jobs(batch_key) == []
+
+
+@mock.patch("saleor.plugins.tasks.send_email_batch_task.apply_async")
+def test_delay_email_task_groups_by_task_and_config(
+    mocked_apply_async, email_batches_enabled
+):
+    # given
+    other_config = {**EMAIL_CONFIG, "host": "smtp.example.com"}
+
+    # when
+    for task, config in [
+        (send_account_confirmation_email_task, EMAIL_CONFIG),
+        (send_account_confirmation_email_task, other_config),
+        (send_password_reset_email_task, EMAIL_CONFIG),
+        (send_password_reset_email_task, EMAIL_CONFIG),
+    ]:
+        delay_email_task(task, "user@example.com", {}, config)
+
+    # then
+    assert [call.args[0] for call in mocked_apply_async.call_args_list] == [
+        (
+            send_account_confirmation_email_task.name,
+            _get_batch_key(send_account_confirmation_email_task),
+        ),
+        (
+            send_account_confirmation_email_task.name,
+            _get_batch_key(send_account_confirmation_email_task, other_config),
+        ),
+        (
+            send_password_reset_email_task.name,
+            _get_batch_key(send_password_reset_email_task),
+        ),
+    ]
+    assert len(_pop_queued_jobs(_get_batch_key(send_password_reset_email_task))) == 2
+
+
+@mock.patch("saleor.plugins.tasks.send_email_batch_task.apply_async")
+@mock.patch("saleor.plugins.user_email.tasks.send_email")
+def test_send_email_batch_task_isolates_failures(
+    mocked_send_email, mocked_apply_async, email_batches_enabled
+):
+    # given
+    task = send_account_confirmation_email_task
+    batch_key = _get_batch_key(task)
+    for recipient in ["failing@example.com", "user@example.com"]:
+        delay_email_task(task, recipient, {}, EMAIL_CONFIG)
+    mocked_send_email.side_effect = [Exception("Connection lost"), None]
+    mocked_apply_async.reset_mock()
+
+    # when
+    send_email_batch_task(task.name, batch_key)
+
+    # then
+    assert mocked_send_email.call_count == 2
+    assert mocked_send_email.call_args.kwargs["recipient_list"] == ["user@example.com"]
+    mocked_apply_async.assert_called_once_with((task.name, batch_key), countdown=5)
+    assert _pop_queued_jobs(batch_key) == [
+        {"args": ["failing@example.com", {}, EMAIL_CONFIG], "attempt": 1}
+    ]
+
+
+@mock.patch("saleor.plugins.tasks.send_email_batch_task.apply_async")
+@mock.patch("saleor.plugins.user_email.tasks.send_email")
+def test_send_email_batch_task_gives_up_after_max_retries(
+    mocked_send_email, mocked_apply_async, email_batches_enabled
+):
+    # given
+    task = send_account_confirmation_email_task
+    batch_key = _get_batch_key(task)
+    queue_email_job(task.name, ["user@example.com", {}, EMAIL_CONFIG], attempt=1)
+    mocked_send_email.side_effect = Exception("Connection lost")
+    mocked_apply_async.reset_mock()
+
+    # when
+    send_email_batch_task(task.name, batch_key)
+
+    # then
+    mocked_send_email.assert_called_once()
+    mocked_apply_async.assert_not_called()
+    assert _pop_queued_jobs(batch_key) == []
@@ -10,12 +10,13 @@ from ..email_common import (
     get_email_template_or_default,
     send_email,
 )
+from ..manager import get_cached_plugin_configuration
 from ..models import PluginConfiguration
 from . import constants
 
 
 def get_plugin_configuration() -> Optional[PluginConfiguration]:
-    return PluginConfiguration.objects.filter(identifier=constants.PLUGIN_ID).first()
+    return get_cached_plugin_configuration(constants.PLUGIN_ID)
 
 
 @app.task
@@ -1,6 +1,13 @@
+import threading
+import time
 from dataclasses import dataclass
-from typing import List, Optional
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from babel.numbers import get_currency_precision
+from django.core.cache import cache
+from django.db import transaction
+from django_prices_vatlayer.models import VAT
 from django_prices_vatlayer.utils import get_tax_for_rate, get_tax_rates_for_country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
@@ -64,6 +71,11 @@ class TaxRateType:
 
 
 DEFAULT_TAX_RATE_NAME = TaxRateType.STANDARD
+VAT_RATES_VERSION_CACHE_KEY = "vatlayer_rates_version"
+
+# Process-wide taxes of all countries with the version they were loaded for.
+_taxes_table: Optional[Tuple[int, Dict[str, dict]]] = None
+_taxes_table_lock = threading.Lock()
 
 
 @dataclass
@@ -105,15 +117,12 @@ def apply_tax_to_price(taxes, rate_name, base):
     return tax_to_apply(base, keep_gross=keep_gross)
 
 
-def get_taxes_for_country(country):
-    tax_rates = get_tax_rates_for_country(country.code)
-    if tax_rates is None:
-        return None
-
+def _get_taxes_from_rates(tax_rates):
     taxes = {
         DEFAULT_TAX_RATE_NAME: {
             "value": tax_rates["standard_rate"],
             "tax": get_tax_for_rate(tax_rates),
+            "fraction": _get_tax_fraction(tax_rates["standard_rate"]),
         }
     }
     if tax_rates["reduced_rates"]:
@@ -122,6 +131,9 @@ def get_taxes_for_country(country):
                 rate_name: {
                     "value": tax_rates["reduced_rates"][rate_name],
                     "tax": get_tax_for_rate(tax_rates, rate_name),
+                    "fraction": _get_tax_fraction(
+                        tax_rates["reduced_rates"][rate_name]
+                    ),
                 }
                 for rate_name in tax_rates["reduced_rates"]
             }
@@ -129,6 +141,105 @@ def get_taxes_for_country(country):
     return taxes
 
 
+def _get_tax_fraction(rate) -> Decimal:
+    # Same as the fraction used by the taxes of django_prices_vatlayer.
+    return Decimal(1) + Decimal(rate / 100)
+
+
+def get_taxes_for_country(country):
+    tax_rates = get_tax_rates_for_country(country.code)
+    if tax_rates is None:
+        return None
+    return _get_taxes_from_rates(tax_rates)
+
+
+def get_vat_rates_version() -> Optional[int]:
+    version = cache.get(VAT_RATES_VERSION_CACHE_KEY)
+    if version is None:
+        # A new version is used when the key was never set or got evicted, so
+        # tables loaded for an old version are never used again.
+        cache.add(VAT_RATES_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VAT_RATES_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_vat_rates():
+    """Force all processes to reload their tables of taxes.
+
+    The version is bumped again once the transaction is committed, as other
+    processes could load the table before the changes were visible.
+    """
+
+    def bump_version():
+        global _taxes_table
+        cache.set(VAT_RATES_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        _taxes_table = None
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def get_cached_taxes_for_country(country_code: str):
+    """Return taxes of the country from the table shared by the whole process.
+
+    Rates of all countries are loaded with a single query and kept until the
+    rates are changed, in any process.
+    """
+    global _taxes_table
+    version = get_vat_rates_version()
+    taxes_table = _taxes_table
+    if taxes_table is None or taxes_table[0] != version:
+        with _taxes_table_lock:
+            taxes_table = _taxes_table
+            if taxes_table is None or taxes_table[0] != version:
+                taxes_table = (
+                    version,
+                    {
+                        code: _get_taxes_from_rates(tax_rates)
+                        for code, tax_rates in VAT.objects.values_list(
+                            "country_code", "data"
+                        )
+                    },
+                )
+                _taxes_table = taxes_table
+    return taxes_table[1].get(country_code)
+
+
+def get_tax_fraction_by_name(taxes, rate_name) -> Optional[Decimal]:
+    """Return the multiplier of net prices for the rate, None if it's not taxed."""
+    if not taxes or not rate_name:
+        return None
+    tax = taxes.get(rate_name) or taxes[DEFAULT_TAX_RATE_NAME]
+    return tax["fraction"]
+
+
+def apply_tax_fractions_to_amounts(
+    amounts: Sequence[Decimal],
+    fractions: Sequence[Optional[Decimal]],
+    currency: str,
+    keep_gross: bool,
+) -> Tuple[List[Decimal], List[Decimal]]:
+    """Return net and gross amounts of prices with their taxes applied.
+
+    It calculates the same amounts as `apply_tax_to_price` for each of the prices,
+    but in a single pass over plain decimals, without building money objects.
+    Amounts without a fraction are left untaxed.
+    """
+    exp = Decimal("0.1") ** get_currency_precision(currency)
+    net_amounts = []
+    gross_amounts = []
+    for amount, fraction in zip(amounts, fractions):
+        net_amount = gross_amount = amount
+        if fraction is not None:
+            if keep_gross:
+                net_amount = (amount / fraction).quantize(exp, rounding=ROUND_HALF_UP)
+            else:
+                gross_amount = (amount * fraction).quantize(exp, rounding=ROUND_HALF_UP)
+        net_amounts.append(net_amount)
+        gross_amounts.append(gross_amount)
+    return net_amounts, gross_amounts
+
+
 def get_tax_rate_by_name(rate_name, taxes=None):
     """Return value of tax rate for current taxes."""
     if not taxes or not rate_name:
@@ -1,3 +1,4 @@
+import operator
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
 
@@ -14,7 +15,8 @@ from django_prices_vatlayer.utils import (
 from prices import Money, TaxedMoney, TaxedMoneyRange
 
 from ...checkout import calculations
-from ...core.taxes import TaxType
+from ...core.prices import quantize_price
+from ...core.taxes import TaxType, include_taxes_in_prices, zero_taxed_money
 from ...graphql.core.utils.error_codes import PluginErrorCode
 from ...product.models import ProductType
 from ..base_plugin import BasePlugin, ConfigurationTypeField
@@ -23,9 +25,12 @@ from . import (
     DEFAULT_TAX_RATE_NAME,
     TaxRateType,
     VatlayerConfiguration,
+    apply_tax_fractions_to_amounts,
     apply_tax_to_price,
+    get_cached_taxes_for_country,
+    get_tax_fraction_by_name,
     get_taxed_shipping_price,
-    get_taxes_for_country,
+    invalidate_vat_rates,
 )
 
 if TYPE_CHECKING:
@@ -120,7 +125,6 @@ class VatlayerPlugin(BasePlugin):
             excluded_countries=excluded_countries,
             countries_from_origin=countries_from_origin,
         )
-        self._cached_taxes = {}
 
     def _skip_plugin(
         self, previous_value: Union[TaxedMoney, TaxedMoneyRange, Decimal]
@@ -152,13 +156,7 @@ class VatlayerPlugin(BasePlugin):
 
         manager = get_plugins_manager()
         return (
-            calculations.checkout_subtotal(
-                manager=manager,
-                checkout_info=checkout_info,
-                lines=lines,
-                address=address,
-                discounts=discounts,
-            )
+            self._calculate_checkout_subtotal(checkout_info, lines, address, discounts)
             + calculations.checkout_shipping_price(
                 manager=manager,
                 checkout_info=checkout_info,
@@ -169,11 +167,56 @@ class VatlayerPlugin(BasePlugin):
             - checkout_info.checkout.discount
         )
 
+    def _calculate_checkout_subtotal(
+        self,
+        checkout_info: "CheckoutInfo",
+        lines: List["CheckoutLineInfo"],
+        address: Optional["Address"],
+        discounts: List["DiscountInfo"],
+    ) -> TaxedMoney:
+        """Calculate the subtotal with taxes applied to all lines in a single pass.
+
+        It's equal to the sum of `calculate_checkout_line_total` of the lines.
+        """
+        currency = checkout_info.checkout.currency
+        if not lines:
+            return zero_taxed_money(currency)
+
+        country = address.country if address else None
+        unit_amounts = []
+        fractions = []
+        for line_info in lines:
+            price = line_info.variant.get_price(
+                line_info.product,
+                line_info.collections,
+                checkout_info.channel,
+                line_info.channel_listing,
+                discounts,
+            )
+            taxes, tax_rate = self.__get_tax_data_for_product(
+                line_info.product, country
+            )
+            unit_amounts.append(price.amount)
+            fractions.append(get_tax_fraction_by_name(taxes, tax_rate))
+
+        net_amounts, gross_amounts = apply_tax_fractions_to_amounts(
+            unit_amounts,
+            fractions,
+            currency,
+            keep_gross=include_taxes_in_prices(),
+        )
+        quantities = [line_info.line.quantity for line_info in lines]
+        subtotal = TaxedMoney(
+            net=Money(sum(map(operator.mul, net_amounts, quantities)), currency),
+            gross=Money(sum(map(operator.mul, gross_amounts, quantities)), currency),
+        )
+        return quantize_price(subtotal, currency)
+
     def _get_taxes_for_country(self, country: Country):
-        """Try to fetch cached taxes on the plugin level.
+        """Return taxes of the country the prices should be taxed for.
 
-        If the plugin doesn't have cached taxes for a given country it will fetch it
-        from cache or db.
+        Taxes come from the table of rates shared by the whole process, it's reloaded
+        only after the rates change.
         """
         if not country:
             origin_country_code = self.config.origin_country
@@ -194,13 +237,7 @@ class VatlayerPlugin(BasePlugin):
         if country_code in self.config.excluded_countries:
             return None
 
-        if country_code in self._cached_taxes:
-            return self._cached_taxes[country_code]
-
-        country = Country(country_code)
-        taxes = get_taxes_for_country(country)
-        self._cached_taxes[country_code] = taxes
-        return taxes
+        return get_cached_taxes_for_country(country_code)
 
     def calculate_checkout_shipping(
         self,
@@ -504,6 +541,7 @@ class VatlayerPlugin(BasePlugin):
         if not self.active:
             return previous_value
         fetch_rates(self.config.access_key)
+        invalidate_vat_rates()
         return True
 
     @classmethod
@@ -1,11 +1,11 @@
 from decimal import Decimal
-from unittest.mock import Mock
 from urllib.parse import urlparse
 
 import pytest
 from django.core.exceptions import ValidationError
 from django.test import override_settings
 from django_countries.fields import Country
+from django_prices_vatlayer.models import VAT
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ....checkout import calculations
@@ -18,10 +18,14 @@ from ...manager import get_plugins_manager
 from ...models import PluginConfiguration
 from ...vatlayer import (
     DEFAULT_TAX_RATE_NAME,
+    apply_tax_fractions_to_amounts,
     apply_tax_to_price,
+    get_cached_taxes_for_country,
+    get_tax_fraction_by_name,
     get_tax_rate_by_name,
     get_taxed_shipping_price,
     get_taxes_for_country,
+    invalidate_vat_rates,
 )
 from ..plugin import VatlayerPlugin
 
@@ -185,13 +189,8 @@ def test_apply_tax_to_price_no_taxes_raise_typeerror_for_invalid_type():
 
 
 def test_vatlayer_plugin_caches_taxes(
-    vatlayer, monkeypatch, product, address, channel_USD
+    vatlayer, assert_num_queries, product, address, channel_USD
 ):
-    mocked_taxes = Mock(wraps=get_taxes_for_country)
-    monkeypatch.setattr(
-        "saleor.plugins.vatlayer.plugin.get_taxes_for_country", mocked_taxes
-    )
-
     manager = get_plugins_manager()
     plugin = manager.get_plugin(VatlayerPlugin.PLUGIN_ID)
     variant = product.variants.first()
@@ -201,8 +200,132 @@ def test_vatlayer_plugin_caches_taxes(
     plugin.apply_taxes_to_product(
         product, price, address.country, TaxedMoney(price, price)
     )
-    plugin.apply_taxes_to_shipping(price, address, TaxedMoney(price, price))
-    assert mocked_taxes.call_count == 1
+    other_plugin = get_plugins_manager().get_plugin(VatlayerPlugin.PLUGIN_ID)
+
+    with assert_num_queries(0):
+        plugin.apply_taxes_to_shipping(price, address, TaxedMoney(price, price))
+        other_plugin.apply_taxes_to_product(
+            product, price, Country("PL"), TaxedMoney(price, price)
+        )
+
+
+def test_get_cached_taxes_for_country_loads_all_countries_once(
+    vatlayer, assert_num_queries, compare_taxes
+):
+    # given
+    get_cached_taxes_for_country("PL")
+
+    # when
+    with assert_num_queries(0):
+        pl_taxes = get_cached_taxes_for_country("PL")
+        de_taxes = get_cached_taxes_for_country("DE")
+        fr_taxes = get_cached_taxes_for_country("FR")
+
+    # then
+    compare_taxes(pl_taxes, get_taxes_for_country(Country("PL")))
+    compare_taxes(de_taxes, get_taxes_for_country(Country("DE")))
+    assert fr_taxes is None
+
+
+def test_get_cached_taxes_for_country_reloaded_after_rates_change(vatlayer):
+    # given
+    assert get_cached_taxes_for_country("DE")[DEFAULT_TAX_RATE_NAME]["value"] == 19
+    vat = VAT.objects.get(country_code="DE")
+    vat.data["standard_rate"] = 20
+
+    # when
+    vat.save()
+
+    # then
+    assert get_cached_taxes_for_country("DE")[DEFAULT_TAX_RATE_NAME]["value"] == 20
+
+
+def test_get_cached_taxes_for_country_reloaded_after_invalidation(vatlayer):
+    # given
+    get_cached_taxes_for_country("DE")
+    VAT.objects.filter(country_code="DE").update(
+        data={"standard_rate": 20, "reduced_rates": None}
+    )
+
+    # when
+    invalidate_vat_rates()
+
+    # then
+    assert get_cached_taxes_for_country("DE")[DEFAULT_TAX_RATE_NAME]["value"] == 20
+
+
+def test_fetch_taxes_data_reloads_taxes_table(vatlayer, monkeypatch):
+    # given
+    def mocked_fetch_rates(access_key):
+        VAT.objects.filter(country_code="DE").update(
+            data={"standard_rate": 20, "reduced_rates": None}
+        )
+
+    monkeypatch.setattr(
+        "saleor.plugins.vatlayer.plugin.fetch_rates", mocked_fetch_rates
+    )
+    get_cached_taxes_for_country("DE")
+    manager = get_plugins_manager()
+
+    # when
+    manager.fetch_taxes_data()
+
+    # then
+    assert get_cached_taxes_for_country("DE")[DEFAULT_TAX_RATE_NAME]["value"] == 20
+
+
+@pytest.mark.parametrize("taxes_in_prices", [True, False])
+def test_apply_tax_fractions_to_amounts(site_settings, vatlayer, taxes_in_prices):
+    # given
+    taxes = get_taxes_for_country(Country("PL"))
+    site_settings.include_taxes_in_prices = taxes_in_prices
+    site_settings.save()
+    prices = [
+        (Money("10.00", "USD"), DEFAULT_TAX_RATE_NAME),
+        (Money("12.99", "USD"), "foodstuffs"),
+        (Money("0.03", "USD"), "medical"),
+        (Money("7.45", "USD"), "unexisting tax rate"),
+        (Money("3.50", "USD"), None),
+    ]
+
+    # when
+    net_amounts, gross_amounts = apply_tax_fractions_to_amounts(
+        [price.amount for price, _ in prices],
+        [get_tax_fraction_by_name(taxes, rate_name) for _, rate_name in prices],
+        "USD",
+        keep_gross=taxes_in_prices,
+    )
+
+    # then
+    expected = [
+        apply_tax_to_price(taxes, rate_name, price) for price, rate_name in prices
+    ]
+    assert net_amounts == [price.net.amount for price in expected]
+    assert gross_amounts == [price.gross.amount for price in expected]
+
+
+@pytest.mark.parametrize("taxes_in_prices", [True, False])
+def test_calculate_checkout_subtotal_in_single_pass(
+    site_settings, vatlayer, checkout_with_items, address, taxes_in_prices
+):
+    # given
+    site_settings.include_taxes_in_prices = taxes_in_prices
+    site_settings.save()
+    manager = get_plugins_manager()
+    plugin = manager.get_plugin(VatlayerPlugin.PLUGIN_ID)
+    lines = fetch_checkout_lines(checkout_with_items)
+    manager.assign_tax_code_to_object_meta(lines[0].product, "foodstuffs")
+    lines[0].product.save()
+    checkout_info = fetch_checkout_info(checkout_with_items, lines, [], manager)
+
+    # when
+    subtotal = plugin._calculate_checkout_subtotal(checkout_info, lines, address, [])
+
+    # then
+    assert subtotal.net != subtotal.gross
+    assert subtotal == manager.calculate_checkout_subtotal(
+        checkout_info, lines, address, []
+    )
 
 
 @pytest.mark.parametrize(
@@ -1,21 +1,19 @@
 import json
 from typing import TYPE_CHECKING, Any, List, Optional
 
+from django.db import transaction
+
 from ...core.utils.json_serializer import CustomJsonEncoder
 from ...webhook.event_types import WebhookEventType
 from ...webhook.payloads import (
-    generate_checkout_payload,
-    generate_customer_payload,
-    generate_fulfillment_payload,
     generate_invoice_payload,
-    generate_order_payload,
     generate_page_payload,
     generate_product_deleted_payload,
-    generate_product_payload,
     generate_product_variant_payload,
 )
+from ...webhook.utils import is_event_subscribed
 from ..base_plugin import BasePlugin
-from .tasks import trigger_webhooks_for_event
+from .tasks import trigger_webhooks_for_event, trigger_webhooks_for_instance
 
 if TYPE_CHECKING:
     from ...account.models import User
@@ -36,29 +34,36 @@ class WebhookPlugin(BasePlugin):
         super().__init__(*args, **kwargs)
         self.active = True
 
+    @staticmethod
+    def _trigger_webhooks_for_instance(event_type: str, instance: Any):
+        # The payload is generated by the worker, and only when the event has
+        # subscribers. The task is sent once the instance is committed, so the
+        # worker can load it.
+        if is_event_subscribed(event_type):
+            instance_pk = instance.pk
+            transaction.on_commit(
+                lambda: trigger_webhooks_for_instance.delay(event_type, instance_pk)
+            )
+
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_CREATED, order)
 
     def order_confirmed(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CONFIRMED, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_CONFIRMED, order)
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_FULLY_PAID, order)
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_UPDATED, order)
 
     def invoice_request(
         self,
@@ -69,76 +74,65 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.INVOICE_REQUESTED, invoice_data
-        )
+        self._trigger_webhooks_for_instance(WebhookEventType.INVOICE_REQUESTED, invoice)
 
     def invoice_delete(self, invoice: "Invoice", previous_value: Any):
         if not self.active:
             return previous_value
+        if not is_event_subscribed(WebhookEventType.INVOICE_DELETED):
+            return previous_value
         invoice_data = generate_invoice_payload(invoice)
         trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_DELETED, invoice_data)
 
     def invoice_sent(self, invoice: "Invoice", email: str, previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_SENT, invoice_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.INVOICE_SENT, invoice)
 
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_CANCELLED, order)
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.ORDER_FULFILLED, order)
 
     def fulfillment_created(self, fulfillment: "Fulfillment", previous_value):
         if not self.active:
             return previous_value
-        fulfillment_data = generate_fulfillment_payload(fulfillment)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.FULFILLMENT_CREATED, fulfillment_data
+        self._trigger_webhooks_for_instance(
+            WebhookEventType.FULFILLMENT_CREATED, fulfillment
         )
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        customer_data = generate_customer_payload(customer)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CUSTOMER_CREATED, customer_data
-        )
+        self._trigger_webhooks_for_instance(WebhookEventType.CUSTOMER_CREATED, customer)
 
     def customer_updated(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        customer_data = generate_customer_payload(customer)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CUSTOMER_UPDATED, customer_data
-        )
+        self._trigger_webhooks_for_instance(WebhookEventType.CUSTOMER_UPDATED, customer)
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.PRODUCT_CREATED, product)
 
     def product_updated(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_UPDATED, product_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.PRODUCT_UPDATED, product)
 
     def product_deleted(
         self, product: "Product", variants: List[int], previous_value: Any
     ) -> Any:
         if not self.active:
             return previous_value
+        if not is_event_subscribed(WebhookEventType.PRODUCT_DELETED):
+            return previous_value
         product_data = generate_product_deleted_payload(product, variants)
         trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_DELETED, product_data)
 
@@ -147,9 +141,8 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        product_variant_data = generate_product_variant_payload(product_variant)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.PRODUCT_VARIANT_CREATED, product_variant_data
+        self._trigger_webhooks_for_instance(
+            WebhookEventType.PRODUCT_VARIANT_CREATED, product_variant
         )
 
     def product_variant_updated(
@@ -157,9 +150,8 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        product_variant_data = generate_product_variant_payload(product_variant)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.PRODUCT_VARIANT_UPDATED, product_variant_data
+        self._trigger_webhooks_for_instance(
+            WebhookEventType.PRODUCT_VARIANT_UPDATED, product_variant
         )
 
     def product_variant_deleted(
@@ -167,6 +159,8 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
+        if not is_event_subscribed(WebhookEventType.PRODUCT_VARIANT_DELETED):
+            return previous_value
         product_variant_data = generate_product_variant_payload(product_variant)
         trigger_webhooks_for_event.delay(
             WebhookEventType.PRODUCT_VARIANT_DELETED, product_variant_data
@@ -175,22 +169,18 @@ class WebhookPlugin(BasePlugin):
     def checkout_created(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_CREATED, checkout_data
-        )
+        self._trigger_webhooks_for_instance(WebhookEventType.CHECKOUT_CREATED, checkout)
 
     def checkout_updated(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_UPDATED, checkout_data
-        )
+        self._trigger_webhooks_for_instance(WebhookEventType.CHECKOUT_UPDATED, checkout)
 
     def notify(self, event: "NotifyEventType", payload: dict, previous_value) -> Any:
         if not self.active:
             return previous_value
+        if not is_event_subscribed(WebhookEventType.NOTIFY_USER):
+            return previous_value
         data = {"notify_event": event, "payload": payload}
         trigger_webhooks_for_event.delay(
             WebhookEventType.NOTIFY_USER, json.dumps(data, cls=CustomJsonEncoder)
@@ -199,17 +189,17 @@ class WebhookPlugin(BasePlugin):
     def page_created(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        page_data = generate_page_payload(page)
-        trigger_webhooks_for_event.delay(WebhookEventType.PAGE_CREATED, page_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.PAGE_CREATED, page)
 
     def page_updated(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        page_data = generate_page_payload(page)
-        trigger_webhooks_for_event.delay(WebhookEventType.PAGE_UPDATED, page_data)
+        self._trigger_webhooks_for_instance(WebhookEventType.PAGE_UPDATED, page)
 
     def page_deleted(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
+        if not is_event_subscribed(WebhookEventType.PAGE_DELETED):
+            return previous_value
         page_data = generate_page_payload(page)
         trigger_webhooks_for_event.delay(WebhookEventType.PAGE_DELETED, page_data)
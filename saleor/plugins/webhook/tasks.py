@@ -1,22 +1,82 @@
 import logging
+import threading
+from collections import defaultdict
 from enum import Enum
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, List, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import boto3
 import requests
+from django.conf import settings
 from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
+from ...account.models import User
 from ...celeryconf import app
+from ...checkout.models import Checkout
+from ...invoice.models import Invoice
+from ...order.models import Fulfillment, Order
+from ...page.models import Page
+from ...product.models import Product, ProductVariant
 from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_customer_payload,
+    generate_fulfillment_payload,
+    generate_invoice_payload,
+    generate_order_payload,
+    generate_page_payload,
+    generate_product_payload,
+    generate_product_variant_payload,
+)
 from . import signature_for_payload
 
 logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 10
 
+# Keep-alive sessions reused by all deliveries of a worker, one per target host.
+_http_sessions: Dict[Tuple[str, str], requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+# Sessions are shared by all webhooks of a host, so cookies set by a response to
+# one app must not be sent with requests to another.
+_reject_all_cookies_policy = DefaultCookiePolicy(allowed_domains=[])
+
+
+# Events which payloads are generated by the worker from the instance primary key.
+INSTANCE_EVENTS_PAYLOADS = {
+    WebhookEventType.ORDER_CREATED: (Order, generate_order_payload),
+    WebhookEventType.ORDER_CONFIRMED: (Order, generate_order_payload),
+    WebhookEventType.ORDER_FULLY_PAID: (Order, generate_order_payload),
+    WebhookEventType.ORDER_UPDATED: (Order, generate_order_payload),
+    WebhookEventType.ORDER_CANCELLED: (Order, generate_order_payload),
+    WebhookEventType.ORDER_FULFILLED: (Order, generate_order_payload),
+    WebhookEventType.INVOICE_REQUESTED: (Invoice, generate_invoice_payload),
+    WebhookEventType.INVOICE_SENT: (Invoice, generate_invoice_payload),
+    WebhookEventType.FULFILLMENT_CREATED: (Fulfillment, generate_fulfillment_payload),
+    WebhookEventType.CUSTOMER_CREATED: (User, generate_customer_payload),
+    WebhookEventType.CUSTOMER_UPDATED: (User, generate_customer_payload),
+    WebhookEventType.PRODUCT_CREATED: (Product, generate_product_payload),
+    WebhookEventType.PRODUCT_UPDATED: (Product, generate_product_payload),
+    WebhookEventType.PRODUCT_VARIANT_CREATED: (
+        ProductVariant,
+        generate_product_variant_payload,
+    ),
+    WebhookEventType.PRODUCT_VARIANT_UPDATED: (
+        ProductVariant,
+        generate_product_variant_payload,
+    ),
+    WebhookEventType.CHECKOUT_CREATED: (Checkout, generate_checkout_payload),
+    WebhookEventType.CHECKOUT_UPDATED: (Checkout, generate_checkout_payload),
+    WebhookEventType.PAGE_CREATED: (Page, generate_page_payload),
+    WebhookEventType.PAGE_UPDATED: (Page, generate_page_payload),
+}
+
 
 class WebhookSchemes(str, Enum):
     HTTP = "http"
@@ -44,10 +104,85 @@ def trigger_webhooks_for_event(event_type, data):
         "app__permissions__content_type"
     )
 
+    if not settings.WEBHOOK_BATCH_DELIVERY:
+        for webhook in webhooks:
+            send_webhook_request.delay(
+                webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+            )
+        return
+
+    # Webhooks of the same host are delivered by a single task, which sends all of
+    # them through one keep-alive connection.
+    webhooks_by_host = defaultdict(list)
     for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+        host = urlparse(webhook.target_url).netloc.lower()
+        webhooks_by_host[host].append(
+            (webhook.pk, webhook.target_url, webhook.secret_key)
+        )
+    for host_webhooks in webhooks_by_host.values():
+        batch_size = settings.WEBHOOK_BATCH_SIZE
+        for index in range(0, len(host_webhooks), batch_size):
+            batch = host_webhooks[index : index + batch_size]  # noqa: E203
+            send_webhook_requests_batch.delay(batch, event_type, data)
+
+
+@app.task
+def trigger_webhooks_for_instance(event_type, instance_pk):
+    """Generate the payload of the event from the current state of the instance."""
+    model, generate_payload = INSTANCE_EVENTS_PAYLOADS[event_type]
+    instance = model.objects.filter(pk=instance_pk).first()
+    if instance is None:
+        logger.warning(
+            "Skipping %r webhooks, %s with pk %r does not exist",
+            event_type,
+            model.__name__,
+            instance_pk,
         )
+        return
+    trigger_webhooks_for_event(event_type, generate_payload(instance))
+
+
+def get_http_session(target_url: str) -> requests.Session:
+    parts = urlparse(target_url)
+    key = (parts.scheme.lower(), parts.netloc.lower())
+    session = _http_sessions.get(key)
+    if session is None:
+        with _http_sessions_lock:
+            session = _http_sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.cookies.set_policy(_reject_all_cookies_policy)
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=settings.WEBHOOK_POOL_MAXSIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_sessions[key] = session
+    return session
+
+
+def clear_clients_cache():
+    with _http_sessions_lock:
+        for session in _http_sessions.values():
+            session.close()
+        _http_sessions.clear()
+    get_sqs_client.cache_clear()
+    get_pubsub_client.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def get_sqs_client(region, access_key_id, secret_access_key):
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pubsub_client():
+    return pubsub_v1.PublisherClient()
 
 
 def send_webhook_using_http(target_url, message, domain, signature, event_type):
@@ -58,7 +193,7 @@ def send_webhook_using_http(target_url, message, domain, signature, event_type):
         "X-Saleor-Signature": signature,
     }
 
-    response = requests.post(
+    response = get_http_session(target_url).post(
         target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
     )
     response.raise_for_status()
@@ -70,12 +205,7 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
+    client = get_sqs_client(region, parts.username, parts.password)
     queue_url = urlunparse(
         ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
     )
@@ -97,7 +227,7 @@ def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_client()
     topic_name = parts.path[1:]  # drop the leading slash
     client.publish(
         topic_name,
@@ -114,10 +244,47 @@ def send_webhook_using_google_cloud_pubsub(
     retry_kwargs={"max_retries": 5},
 )
 def send_webhook_request(webhook_id, target_url, secret, event_type, data):
-    parts = urlparse(target_url)
     domain = Site.objects.get_current().domain
     message = data.encode("utf-8")
     signature = signature_for_payload(message, secret)
+    deliver_webhook(webhook_id, target_url, message, domain, signature, event_type)
+
+
+@app.task
+def send_webhook_requests_batch(
+    webhooks: List[Tuple[int, str, str]], event_type: str, data: str
+):
+    """Deliver an event to many webhooks sharing the same target host.
+
+    A failed delivery doesn't stop the batch, it's retried in a separate task.
+    """
+    domain = Site.objects.get_current().domain
+    message = data.encode("utf-8")
+    signatures: Dict[str, str] = {}
+    for webhook_id, target_url, secret in webhooks:
+        if secret not in signatures:
+            signatures[secret] = signature_for_payload(message, secret)
+        try:
+            deliver_webhook(
+                webhook_id, target_url, message, domain, signatures[secret], event_type
+            )
+        except RequestException:
+            logger.warning(
+                "[Webhook ID:%r] Failed to send payload to %r, retrying",
+                webhook_id,
+                target_url,
+            )
+            send_webhook_request.delay(webhook_id, target_url, secret, event_type, data)
+        except Exception:
+            logger.exception(
+                "[Webhook ID:%r] Failed to send payload to %r",
+                webhook_id,
+                target_url,
+            )
+
+
+def deliver_webhook(webhook_id, target_url, message, domain, signature, event_type):
+    parts = urlparse(target_url)
     if parts.scheme.lower() in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
         send_webhook_using_http(target_url, message, domain, signature, event_type)
     elif parts.scheme.lower() == WebhookSchemes.AWS_SQS:
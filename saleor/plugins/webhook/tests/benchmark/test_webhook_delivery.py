@@ -0,0 +1,71 @@
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ....webhook.event_types import WebhookEventType
+from ...tasks import WEBHOOK_TIMEOUT, send_webhook_using_http
+
+DELIVERIES_PER_RUN = 200
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%s/webhook/" % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def send_webhook_without_session(target_url, message, domain, signature, event_type):
+    headers = {
+        "Content-Type": "application/json",
+        "X-Saleor-Event": event_type,
+        "X-Saleor-Domain": domain,
+        "X-Saleor-Signature": signature,
+    }
+    response = requests.post(
+        target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
+    )
+    response.raise_for_status()
+
+
+@pytest.mark.parametrize(
+    "send_webhook", [send_webhook_without_session, send_webhook_using_http]
+)
+def test_webhook_http_delivery_cost(send_webhook, webhook_stub_url, record_property):
+    # given
+    message = b'{"id": "T3JkZXI6MQ=="}'
+
+    def deliver():
+        send_webhook(
+            webhook_stub_url,
+            message,
+            "mirumee.com",
+            "",
+            WebhookEventType.ORDER_CREATED,
+        )
+
+    # when
+    duration = timeit.timeit(deliver, number=DELIVERIES_PER_RUN)
+
+    # then
+    record_property("delivery", send_webhook.__name__)
+    record_property("seconds_per_delivery", duration / DELIVERIES_PER_RUN)
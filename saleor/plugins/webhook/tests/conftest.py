@@ -0,0 +1,10 @@
+import pytest
+
+from ..tasks import clear_clients_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_webhook_clients():
+    clear_clients_cache()
+    yield
+    clear_clients_cache()
@@ -1,11 +1,13 @@
 import json
 from unittest import mock
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 import graphene
 import pytest
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
 from freezegun import freeze_time
+from requests.exceptions import RequestException
 
 from ....account.notifications import (
     get_default_user_payload,
@@ -16,19 +18,21 @@ from ....core.notifications import get_site_context
 from ....core.notify_events import NotifyEventType
 from ....core.utils.json_serializer import CustomJsonEncoder
 from ....core.utils.url import prepare_url
+from ....tests.utils import flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import (
-    generate_checkout_payload,
-    generate_customer_payload,
     generate_invoice_payload,
     generate_order_payload,
     generate_page_payload,
     generate_product_deleted_payload,
-    generate_product_payload,
     generate_product_variant_payload,
 )
 from ...manager import get_plugins_manager
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.tasks import (
+    send_webhook_requests_batch,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_instance,
+)
 
 first_url = "http://www.example.com/first/"
 third_url = "http://www.example.com/third/"
@@ -91,92 +95,257 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     assert target_url_calls == expected_target_urls
 
 
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_requests_batch.delay")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+def test_trigger_webhooks_for_event_in_batches_per_host(
+    mock_request, mock_batch_request, app, permission_manage_orders, settings
+):
+    # given
+    settings.WEBHOOK_BATCH_DELIVERY = True
+    settings.WEBHOOK_BATCH_SIZE = 2
+    app.permissions.add(permission_manage_orders)
+    target_urls = [
+        "http://www.example.com/first/",
+        "http://www.example.com/second/",
+        "http://www.example.com/third/",
+        "http://other.example.com/",
+    ]
+    for target_url in target_urls:
+        webhook = app.webhooks.create(target_url=target_url)
+        webhook.events.create(event_type=WebhookEventType.ORDER_CREATED)
+
+    # when
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, data="{}")
+
+    # then
+    mock_request.assert_not_called()
+    batches = [call[0][0] for call in mock_batch_request.call_args_list]
+    assert sorted(len(batch) for batch in batches) == [1, 1, 2]
+    assert {url for batch in batches for _, url, _ in batch} == set(target_urls)
+    for batch in batches:
+        assert len({urlparse(url).netloc for _, url, _ in batch}) == 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_send_webhook_requests_batch_retries_failed_delivery(
+    mock_send_using_http, mock_request, site_settings
+):
+    # given
+    mock_send_using_http.side_effect = [RequestException(), None]
+    webhooks = [
+        (1, "http://www.example.com/first/", "secret"),
+        (2, "http://www.example.com/second/", "secret"),
+    ]
+
+    # when
+    send_webhook_requests_batch(webhooks, WebhookEventType.ORDER_CREATED, "{}")
+
+    # then
+    assert mock_send_using_http.call_count == 2
+    mock_request.assert_called_once_with(
+        1,
+        "http://www.example.com/first/",
+        "secret",
+        WebhookEventType.ORDER_CREATED,
+        "{}",
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+def test_trigger_webhooks_for_instance_generates_payload(
+    mock_request, webhook, order_with_lines, permission_manage_orders
+):
+    # given
+    webhook.app.permissions.add(permission_manage_orders)
+
+    # when
+    trigger_webhooks_for_instance(WebhookEventType.ORDER_CREATED, order_with_lines.pk)
+
+    # then
+    mock_request.assert_called_once_with(
+        webhook.pk,
+        webhook.target_url,
+        webhook.secret_key,
+        WebhookEventType.ORDER_CREATED,
+        generate_order_payload(order_with_lines),
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deleted_instance(mock_trigger, order_with_lines):
+    # given
+    order_pk = order_with_lines.pk
+    order_with_lines.delete()
+
+    # when
+    trigger_webhooks_for_instance(WebhookEventType.ORDER_UPDATED, order_pk)
+
+    # then
+    mock_trigger.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.plugin.generate_invoice_payload")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_events_without_subscribers_are_skipped(
+    mocked_instance_trigger,
+    mocked_webhook_trigger,
+    mocked_generate_payload,
+    webhook,
+    settings,
+    order_with_lines,
+    fulfilled_order,
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    invoice = fulfilled_order.invoices.first()
+
+    # when
+    manager.order_updated(order_with_lines)
+    manager.invoice_delete(invoice)
+    flush_post_commit_hooks()
+
+    # then
+    mocked_instance_trigger.assert_not_called()
+    mocked_webhook_trigger.assert_not_called()
+    mocked_generate_payload.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_subscribed_event_types_are_invalidated(
+    mocked_webhook_trigger, webhook, settings, order_with_lines
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    manager.order_updated(order_with_lines)
+    flush_post_commit_hooks()
+    mocked_webhook_trigger.assert_not_called()
+
+    # when
+    webhook.events.create(event_type=WebhookEventType.ORDER_UPDATED)
+    manager.order_updated(order_with_lines)
+    flush_post_commit_hooks()
+
+    # then
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
+    )
+
+
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_webhooks_for_instance_triggered_after_commit(
+    mocked_webhook_trigger, any_webhook, settings, order_with_lines
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    # when
+    with transaction.atomic():
+        manager.order_updated(order_with_lines)
+
+        # then
+        mocked_webhook_trigger.assert_not_called()
+
+    flush_post_commit_hooks()
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
+    )
+
+
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_order_created(mocked_webhook_trigger, any_webhook, settings, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_created(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CREATED, expected_data
+        WebhookEventType.ORDER_CREATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_confirmed(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_order_confirmed(
+    mocked_webhook_trigger, any_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_confirmed(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CONFIRMED, expected_data
+        WebhookEventType.ORDER_CONFIRMED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_customer_created(mocked_webhook_trigger, any_webhook, settings, customer_user):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_created(customer_user)
+    flush_post_commit_hooks()
 
-    expected_data = generate_customer_payload(customer_user)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CUSTOMER_CREATED, expected_data
+        WebhookEventType.CUSTOMER_CREATED, customer_user.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_updated(mocked_webhook_trigger, settings, customer_user):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_customer_updated(mocked_webhook_trigger, any_webhook, settings, customer_user):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_updated(customer_user)
+    flush_post_commit_hooks()
 
-    expected_data = generate_customer_payload(customer_user)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CUSTOMER_UPDATED, expected_data
+        WebhookEventType.CUSTOMER_UPDATED, customer_user.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_order_fully_paid(
+    mocked_webhook_trigger, any_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_fully_paid(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_FULLY_PAID, expected_data
+        WebhookEventType.ORDER_FULLY_PAID, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_product_created(mocked_webhook_trigger, any_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_created(product)
+    flush_post_commit_hooks()
 
-    expected_data = generate_product_payload(product)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_CREATED, expected_data
+        WebhookEventType.PRODUCT_CREATED, product.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_updated(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_product_updated(mocked_webhook_trigger, any_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_updated(product)
+    flush_post_commit_hooks()
 
-    expected_data = generate_product_payload(product)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_UPDATED, expected_data
+        WebhookEventType.PRODUCT_UPDATED, product.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_deleted(mocked_webhook_trigger, settings, product):
+def test_product_deleted(mocked_webhook_trigger, any_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
 
@@ -202,32 +371,38 @@ def test_product_deleted(mocked_webhook_trigger, settings, product):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_variant_created(mocked_webhook_trigger, settings, variant):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_product_variant_created(
+    mocked_webhook_trigger, any_webhook, settings, variant
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_variant_created(variant)
+    flush_post_commit_hooks()
 
-    expected_data = generate_product_variant_payload(variant)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_VARIANT_CREATED, expected_data
+        WebhookEventType.PRODUCT_VARIANT_CREATED, variant.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_variant_updated(mocked_webhook_trigger, settings, variant):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_product_variant_updated(
+    mocked_webhook_trigger, any_webhook, settings, variant
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_variant_updated(variant)
+    flush_post_commit_hooks()
 
-    expected_data = generate_product_variant_payload(variant)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_VARIANT_UPDATED, expected_data
+        WebhookEventType.PRODUCT_VARIANT_UPDATED, variant.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_variant_deleted(mocked_webhook_trigger, settings, variant):
+def test_product_variant_deleted(
+    mocked_webhook_trigger, any_webhook, settings, variant
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_variant_deleted(variant)
@@ -238,80 +413,86 @@ def test_product_variant_deleted(mocked_webhook_trigger, settings, variant):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_order_updated(mocked_webhook_trigger, any_webhook, settings, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_updated(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_UPDATED, expected_data
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_order_cancelled(
+    mocked_webhook_trigger, any_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_cancelled(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CANCELLED, expected_data
+        WebhookEventType.ORDER_CANCELLED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_checkout_created(
+    mocked_webhook_trigger, any_webhook, settings, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_created(checkout_with_items)
+    flush_post_commit_hooks()
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_CREATED, expected_data
+        WebhookEventType.CHECKOUT_CREATED, checkout_with_items.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_checkout_updated(
+    mocked_webhook_trigger, any_webhook, settings, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_updated(checkout_with_items)
+    flush_post_commit_hooks()
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_UPDATED, expected_data
+        WebhookEventType.CHECKOUT_UPDATED, checkout_with_items.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_created(mocked_webhook_trigger, settings, page):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_page_created(mocked_webhook_trigger, any_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.page_created(page)
+    flush_post_commit_hooks()
 
-    expected_data = generate_page_payload(page)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PAGE_CREATED, expected_data
+        WebhookEventType.PAGE_CREATED, page.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_updated(mocked_webhook_trigger, settings, page):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_page_updated(mocked_webhook_trigger, any_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.page_updated(page)
+    flush_post_commit_hooks()
 
-    expected_data = generate_page_payload(page)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PAGE_UPDATED, expected_data
+        WebhookEventType.PAGE_UPDATED, page.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_deleted(mocked_webhook_trigger, settings, page):
+def test_page_deleted(mocked_webhook_trigger, any_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     page_id = page.id
@@ -326,20 +507,23 @@ def test_page_deleted(mocked_webhook_trigger, settings, page):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_invoice_request(
+    mocked_webhook_trigger, any_webhook, settings, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
     manager.invoice_request(fulfilled_order, invoice, invoice.number)
-    expected_data = generate_invoice_payload(invoice)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.INVOICE_REQUESTED, expected_data
+        WebhookEventType.INVOICE_REQUESTED, invoice.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_delete(mocked_webhook_trigger, any_webhook, settings, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -350,21 +534,22 @@ def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_instance.delay")
+def test_invoice_sent(mocked_webhook_trigger, any_webhook, settings, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
     manager.invoice_sent(invoice, fulfilled_order.user.email)
-    expected_data = generate_invoice_payload(invoice)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.INVOICE_SENT, expected_data
+        WebhookEventType.INVOICE_SENT, invoice.pk
     )
 
 
 @freeze_time("2020-03-18 12:00:00")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_notify_user(mocked_webhook_trigger, settings, customer_user):
+def test_notify_user(mocked_webhook_trigger, any_webhook, settings, customer_user):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
 
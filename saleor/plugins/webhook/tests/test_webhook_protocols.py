@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock, patch
+from http.client import HTTPMessage
+from unittest.mock import ANY, MagicMock, patch
 
 import boto3
 import pytest
@@ -6,10 +7,11 @@ import requests
 from django.core.serializers import serialize
 from google.cloud.pubsub_v1 import PublisherClient
 from kombu.asynchronous.aws.sqs.connection import AsyncSQSConnection
+from requests.cookies import extract_cookies_to_jar
 
 from ....webhook.event_types import WebhookEventType
 from ...webhook import signature_for_payload
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.tasks import get_http_session, trigger_webhooks_for_event
 
 
 def test_trigger_webhooks_with_aws_sqs(
@@ -173,7 +175,9 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
+)
 def test_trigger_webhooks_with_http(
     mock_request,
     webhook,
@@ -198,6 +202,7 @@ def test_trigger_webhooks_with_http(
     }
 
     mock_request.assert_called_once_with(
+        ANY,
         webhook.target_url,
         data=bytes(expected_data, "utf-8"),
         headers=expected_headers,
@@ -206,7 +211,9 @@ def test_trigger_webhooks_with_http(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
+)
 def test_trigger_webhooks_with_http_and_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
@@ -229,8 +236,28 @@ def test_trigger_webhooks_with_http_and_secret_key(
     }
 
     mock_request.assert_called_once_with(
+        ANY,
         webhook.target_url,
         data=bytes(expected_data, "utf-8"),
         headers=expected_headers,
         timeout=10,
     )
+
+
+def test_http_session_rejects_cookies():
+    # given
+    target_url = "https://webhook.site/48978b64-4efb-43d5-a334-451a1d164009"
+    session = get_http_session(target_url)
+    headers = HTTPMessage()
+    headers["Set-Cookie"] = "sessionid=secret; Path=/"
+    response = MagicMock(_original_response=MagicMock(msg=headers))
+
+    # when
+    extract_cookies_to_jar(
+        session.cookies, requests.Request("POST", target_url).prepare(), response
+    )
+
+    # then
+    assert not session.cookies
+    request = session.prepare_request(requests.Request("POST", target_url))
+    assert "Cookie" not in request.headers
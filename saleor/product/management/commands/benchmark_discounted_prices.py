@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ....channel.models import Channel
+from ....discount.utils import fetch_active_discounts
+from ...models import Product
+from ...utils.variant_prices import (
+    DISCOUNTED_PRICES_BATCH_SIZE,
+    get_products_batches,
+    update_product_discounted_price,
+    update_products_discounted_prices_for_batch,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the time of recalculating discounted prices product by product "
+        "with the batch update."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Number of products to recalculate.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DISCOUNTED_PRICES_BATCH_SIZE,
+            help="Number of products updated at once by the batch update.",
+        )
+
+    def handle(self, *args, **options):
+        discounts = fetch_active_discounts()
+        channels = {channel.id: channel for channel in Channel.objects.all()}
+        product_ids = list(
+            Product.objects.order_by("pk").values_list("pk", flat=True)[
+                : options["limit"]
+            ]
+        )
+        products = Product.objects.filter(pk__in=product_ids)
+
+        def update_per_product():
+            for product in products.prefetch_related("channel_listings__channel"):
+                update_product_discounted_price(product, discounts)
+
+        def update_in_batches():
+            for products_batch in get_products_batches(products, options["batch_size"]):
+                update_products_discounted_prices_for_batch(
+                    products_batch, discounts, channels
+                )
+
+        self.stdout.write(
+            f"Recalculating discounted prices of {len(product_ids)} products."
+        )
+        for name, update in [
+            ("per product", update_per_product),
+            ("in batches", update_in_batches),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                update()
+                duration = time.perf_counter() - start
+            self.stdout.write(
+                f"{name}: {duration:.3f}s, {len(queries.captured_queries)} queries"
+            )
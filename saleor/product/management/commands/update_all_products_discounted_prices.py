@@ -3,9 +3,13 @@ import logging
 from django.core.management.base import BaseCommand
 from tqdm import tqdm
 
+from ....channel.models import Channel
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_discounted_price
+from ...utils.variant_prices import (
+    get_products_batches,
+    update_products_discounted_prices_for_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +19,14 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         self.stdout.write('Updating "discounted_price" field of all the products.')
-        # Fetching the discounts just once and reusing them
+        # Fetching the discounts and channels just once and reusing them
         discounts = fetch_active_discounts()
+        channels = {channel.id: channel for channel in Channel.objects.all()}
         # Run the update on all the products with "progress bar" (tqdm)
         qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_discounted_price(product, discounts=discounts)
+        with tqdm(total=qs.count()) as progress:
+            for products_batch in get_products_batches(qs):
+                update_products_discounted_prices_for_batch(
+                    products_batch, discounts, channels
+                )
+                progress.update(len(products_batch))
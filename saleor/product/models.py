@@ -356,7 +356,11 @@ class Product(SeoModel, ModelWithMetadata):
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
-        indexes = [GinIndex(fields=["search_vector"])]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            # Composite indexes of the sorting fields used for paginating products.
+            models.Index(fields=["name", "slug"], name="product_name_slug_idx"),
+        ]
         indexes.extend(ModelWithMetadata.Meta.indexes)
 
     def __iter__(self):
@@ -418,9 +422,7 @@ class ProductVariantQueryset(models.QuerySet):
     def annotate_quantities(self):
         return self.annotate(
             quantity=Coalesce(Sum("stocks__quantity"), 0),
-            quantity_allocated=Coalesce(
-                Sum("stocks__allocations__quantity_allocated"), 0
-            ),
+            quantity_allocated=Coalesce(Sum("stocks__quantity_allocated"), 0),
         )
 
     def available_in_channel(self, channel_slug):
@@ -1,13 +1,16 @@
-from unittest.mock import patch
-
 from django.core.management import call_command
+from django.db.models import Min, Q
 from prices import Money
 
+from ..models import Product, ProductChannelListing, ProductVariantChannelListing
 from ..tasks import (
     update_products_discounted_prices_of_catalogues,
     update_products_discounted_prices_task,
 )
-from ..utils.variant_prices import update_product_discounted_price
+from ..utils.variant_prices import (
+    update_product_discounted_price,
+    update_products_discounted_prices,
+)
 
 
 def test_update_product_discounted_price(product, channel_USD):
@@ -125,15 +128,72 @@ def test_update_products_discounted_prices_task(product_list):
         assert product_channel_listing.discounted_price == price
 
 
-@patch(
-    "saleor.product.management.commands"
-    ".update_all_products_discounted_prices"
-    ".update_product_discounted_price"
-)
 def test_management_commmand_update_all_products_discounted_price(
-    mock_update_product_discounted_price, product_list
+    product_list, channel_USD
 ):
+    # given
+    price = Money("0.01", "USD")
+    ProductVariantChannelListing.objects.filter(channel=channel_USD).update(
+        price_amount=price.amount
+    )
+
+    # when
     call_command("update_all_products_discounted_prices")
-    call_args_list = mock_update_product_discounted_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+
+    # then
+    for product in product_list:
+        product_channel_listing = product.channel_listings.get(channel=channel_USD)
+        assert product_channel_listing.discounted_price == price
+
+
+def test_update_products_discounted_prices_matches_per_product_update(
+    product_list, discount_info, channel_USD
+):
+    # given
+    products = Product.objects.filter(pk__in=[product.pk for product in product_list])
+    listings = ProductChannelListing.objects.filter(product__in=products)
+    for product in products:
+        update_product_discounted_price(product, [discount_info])
+    expected_prices = {
+        listing.pk: listing.discounted_price_amount for listing in listings
+    }
+    listings.update(discounted_price_amount=None)
+
+    # when
+    update_products_discounted_prices(products, [discount_info])
+
+    # then
+    assert {
+        listing.pk: listing.discounted_price_amount for listing in listings
+    } == expected_prices
+    # all products belong to the discounted category
+    for listing in listings.filter(channel=channel_USD).annotate(
+        min_variant_price_amount=Min(
+            "product__variants__channel_listings__price_amount",
+            filter=Q(product__variants__channel_listings__channel=channel_USD),
+        )
+    ):
+        assert listing.discounted_price_amount < listing.min_variant_price_amount
+
+
+def test_update_products_discounted_prices_number_of_queries(
+    product_list, discount_info, capture_queries
+):
+    # given
+    single_product = Product.objects.filter(pk=product_list[0].pk)
+    all_products = Product.objects.filter(
+        pk__in=[product.pk for product in product_list]
+    )
+    ProductChannelListing.objects.update(discounted_price_amount=None)
+
+    # when
+    with capture_queries() as single_product_queries:
+        update_products_discounted_prices(single_product, [discount_info])
+    ProductChannelListing.objects.update(discounted_price_amount=None)
+    with capture_queries() as all_products_queries:
+        update_products_discounted_prices(all_products, [discount_info])
+
+    # then
+    assert len(all_products_queries.captured_queries) == len(
+        single_product_queries.captured_queries
+    )
@@ -1,13 +1,33 @@
 import operator
 from collections import defaultdict
 from functools import reduce
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from django.db.models import Min
 from django.db.models.query_utils import Q
 from prices import Money
 
-from ...discount.utils import calculate_discounted_price, fetch_active_discounts
-from ..models import Product, ProductChannelListing, ProductVariantChannelListing
+from ...channel.models import Channel
+from ...discount.models import NotApplicable
+from ...discount.utils import (
+    calculate_discounted_price,
+    fetch_active_discounts,
+    get_product_discount_on_sale,
+)
+from ..models import (
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductVariantChannelListing,
+)
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from django.db.models import QuerySet
+
+    from ...discount import DiscountInfo
+
+DISCOUNTED_PRICES_BATCH_SIZE = 1000
 
 
 def _get_variant_prices_in_channels_dict(product):
@@ -64,12 +84,122 @@ def update_product_discounted_price(product, discounts=None):
     )
 
 
+def _get_products_collections_dict(product_ids: List[int]) -> Dict[int, Set[int]]:
+    collections_dict: Dict[int, Set[int]] = defaultdict(set)
+    collection_products = CollectionProduct.objects.filter(
+        product_id__in=product_ids
+    ).values_list("product_id", "collection_id")
+    for product_id, collection_id in collection_products:
+        collections_dict[product_id].add(collection_id)
+    return collections_dict
+
+
+def _get_products_min_variant_prices_dict(
+    product_ids: List[int],
+) -> Dict[Tuple[int, int], Money]:
+    """Return the cheapest variant price of products per channel.
+
+    Sale discounts never change the order of prices, so the discounted price of the
+    cheapest variant is the product's discounted price.
+    """
+    variant_listings = (
+        ProductVariantChannelListing.objects.filter(
+            variant__product_id__in=product_ids, price_amount__isnull=False
+        )
+        .values("variant__product_id", "channel_id", "currency")
+        .annotate(min_price_amount=Min("price_amount"))
+        .order_by()
+    )
+    prices_dict: Dict[Tuple[int, int], Money] = {}
+    for listing in variant_listings:
+        key = (listing["variant__product_id"], listing["channel_id"])
+        price = Money(listing["min_price_amount"], listing["currency"])
+        if key not in prices_dict or price < prices_dict[key]:
+            prices_dict[key] = price
+    return prices_dict
+
+
+def _get_sale_discounted_price(
+    price: Money,
+    product: Product,
+    collection_ids: Set[int],
+    discounts: Iterable["DiscountInfo"],
+    channel: Channel,
+) -> Money:
+    discounted_prices = []
+    for discount in discounts:
+        try:
+            discount_value = get_product_discount_on_sale(
+                product, collection_ids, discount, channel
+            )
+        except NotApplicable:
+            continue
+        discounted_prices.append(discount_value(price))
+    return min(discounted_prices, default=price)
+
+
+def update_products_discounted_prices_for_batch(
+    products: List[Product],
+    discounts: Iterable["DiscountInfo"],
+    channels: Dict[int, Channel],
+):
+    """Update discounted prices of the given products in all their channels.
+
+    Variant prices, collections and channel listings of all products are fetched
+    at once and the changed listings are saved with a single bulk update.
+    """
+    products_dict = {product.id: product for product in products}
+    product_ids = list(products_dict.keys())
+    collections_dict = _get_products_collections_dict(product_ids)
+    prices_dict = _get_products_min_variant_prices_dict(product_ids)
+
+    changed_products_channels_to_update = []
+    for product_channel_listing in ProductChannelListing.objects.filter(
+        product_id__in=product_ids
+    ):
+        product_id = product_channel_listing.product_id
+        channel_id = product_channel_listing.channel_id
+        price = prices_dict.get((product_id, channel_id))
+        if price is None:
+            continue
+        product_discounted_price = _get_sale_discounted_price(
+            price,
+            products_dict[product_id],
+            collections_dict[product_id],
+            discounts,
+            channels[channel_id],
+        )
+        if product_channel_listing.discounted_price != product_discounted_price:
+            product_channel_listing.discounted_price_amount = (
+                product_discounted_price.amount
+            )
+            changed_products_channels_to_update.append(product_channel_listing)
+    ProductChannelListing.objects.bulk_update(
+        changed_products_channels_to_update, ["discounted_price_amount"]
+    )
+
+
+def get_products_batches(
+    products: "QuerySet", batch_size: int = DISCOUNTED_PRICES_BATCH_SIZE
+) -> Iterator[List[Product]]:
+    """Iterate over products in batches ordered by the primary key."""
+    products = products.order_by("pk").only("id", "category_id")
+    last_pk = 0
+    while True:
+        batch = list(products.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        yield batch
+        last_pk = batch[-1].pk
+
+
 def update_products_discounted_prices(products, discounts=None):
     if discounts is None:
         discounts = fetch_active_discounts()
+    channels = {channel.id: channel for channel in Channel.objects.all()}
 
-    for product in products.prefetch_related("channel_listings"):
-        update_product_discounted_price(product, discounts)
+    for products_batch in get_products_batches(products):
+        update_products_discounted_prices_for_batch(products_batch, discounts, channels)
 
 
 def update_products_discounted_prices_of_catalogues(
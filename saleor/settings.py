@@ -163,6 +163,13 @@ if ENABLE_SSL:
 
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
+# Seconds for which emails of the plugins are collected in queues of the Celery
+# broker and then sent by a single task per template and configuration, 0 sends
+# each email by its own task.
+EMAIL_BATCH_WINDOW = int(os.environ.get("EMAIL_BATCH_WINDOW", 0))
+# Number of times a batched email which failed to be sent is queued again.
+EMAIL_BATCH_MAX_RETRIES = int(os.environ.get("EMAIL_BATCH_MAX_RETRIES", 3))
+
 MEDIA_ROOT = os.path.join(PROJECT_ROOT, "media")
 MEDIA_URL = os.environ.get("MEDIA_URL", "/media/")
 
@@ -187,6 +194,9 @@ loaders = [
     "django.template.loaders.filesystem.Loader",
     "django.template.loaders.app_directories.Loader",
 ]
+# Compiled templates are kept in memory unless they are being worked on.
+if not DEBUG:
+    loaders = [("django.template.loaders.cached.Loader", loaders)]
 
 TEMPLATES_DIR = os.path.join(PROJECT_ROOT, "templates")
 TEMPLATES = [
@@ -397,6 +407,51 @@ TEST_RUNNER = "saleor.tests.runner.PytestTestRunner"
 
 PLAYGROUND_ENABLED = get_bool_from_env("PLAYGROUND_ENABLED", True)
 
+# Number of parsed and validated GraphQL documents kept in memory by each worker.
+GRAPHQL_QUERY_CACHE_SIZE = int(os.environ.get("GRAPHQL_QUERY_CACHE_SIZE", 1000))
+
+# Queries exceeding these limits are rejected before execution, 0 disables a limit.
+# Fields cost 1, or more when calculated by plugins (see `saleor.graphql.query_cost`),
+# fields of connections are multiplied by `first` or `last` and of other lists by
+# their expected length. The largest list queries of the dashboard cost about 110000
+# at 100 rows per page (shipping zones with countries and methods, products with
+# channel listings and pricing), with the depth up to 10, the defaults leave twice
+# as much.
+GRAPHQL_QUERY_MAX_COST = int(os.environ.get("GRAPHQL_QUERY_MAX_COST", 250000))
+GRAPHQL_QUERY_MAX_DEPTH = int(os.environ.get("GRAPHQL_QUERY_MAX_DEPTH", 20))
+
+# How `totalCount` of connections is calculated: "exact" counts all matching rows,
+# "cached" caches exact counts by the SQL query and "estimate" uses the estimate of
+# the query planner unless it is lower than the threshold.
+GRAPHQL_TOTAL_COUNT_STRATEGY = os.environ.get("GRAPHQL_TOTAL_COUNT_STRATEGY", "exact")
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", 60)
+)
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 10000)
+)
+
+# Seconds for which calculated checkout prices are cached, 0 disables the cache.
+CHECKOUT_PRICES_CACHE_TIMEOUT = int(os.environ.get("CHECKOUT_PRICES_CACHE_TIMEOUT", 0))
+# Number of checkout states whose prices are also kept in memory by each worker.
+CHECKOUT_PRICES_LOCAL_CACHE_SIZE = int(
+    os.environ.get("CHECKOUT_PRICES_LOCAL_CACHE_SIZE", 1000)
+)
+
+# Number of processes rendering invoice PDFs of each worker, 0 renders them in the
+# process of the task. Children of the Celery prefork pool can't start them, so
+# it needs workers running the solo or threads pool.
+INVOICE_PDF_WORKERS = int(os.environ.get("INVOICE_PDF_WORKERS", 0))
+
+# Allocate stocks with conditional updates of single stocks instead of locking all
+# stocks of ordered variants upfront, which reduces contention on popular variants.
+# Checkouts reserve stocks in a transaction committed before the order is created.
+OPTIMISTIC_STOCK_ALLOCATION = get_bool_from_env("OPTIMISTIC_STOCK_ALLOCATION", False)
+# Number of attempts to allocate an order line when its stocks change concurrently.
+OPTIMISTIC_STOCK_ALLOCATION_MAX_ATTEMPTS = int(
+    os.environ.get("OPTIMISTIC_STOCK_ALLOCATION_MAX_ATTEMPTS", 5)
+)
+
 ALLOWED_HOSTS = get_list(os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1"))
 ALLOWED_GRAPHQL_ORIGINS = get_list(os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*"))
 
@@ -489,6 +544,13 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", None)
 
+# Deliver webhooks of an event in one task per target host, up to the given number
+# of webhooks per task, instead of one task per webhook.
+WEBHOOK_BATCH_DELIVERY = get_bool_from_env("WEBHOOK_BATCH_DELIVERY", False)
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 50))
+# Maximum number of keep-alive connections to a single webhook target host.
+WEBHOOK_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_POOL_MAXSIZE", 10))
+
 # Change this value if your application is running behind a proxy,
 # e.g. HTTP_CF_Connecting_IP for Cloudflare or X_FORWARDED_FOR
 REAL_IP_ENVIRON = os.environ.get("REAL_IP_ENVIRON", "REMOTE_ADDR")
@@ -583,6 +645,9 @@ if "JAEGER_AGENT_HOST" in os.environ:
 REDIS_URL = os.environ.get("REDIS_URL")
 if REDIS_URL:
     CACHE_URL = os.environ.setdefault("CACHE_URL", REDIS_URL)
+# Process-wide caches, e.g. of plugin configurations and active discounts, are
+# invalidated through versions stored in this cache. Running more than one process
+# requires a cache shared by all of them, as the default local memory cache isn't.
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
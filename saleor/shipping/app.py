@@ -0,0 +1,43 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class ShippingAppConfig(AppConfig):
+    name = "saleor.shipping"
+
+    def ready(self):
+        from .models import (
+            ShippingMethod,
+            ShippingMethodChannelListing,
+            ShippingMethodPostalCodeRule,
+            ShippingZone,
+        )
+        from .signals import invalidate_shipping_index_handler
+
+        for model in (
+            ShippingZone,
+            ShippingMethod,
+            ShippingMethodChannelListing,
+            ShippingMethodPostalCodeRule,
+        ):
+            model_name = model._meta.model_name
+            post_save.connect(
+                invalidate_shipping_index_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_shipping_index_on_{model_name}_save",
+            )
+            post_delete.connect(
+                invalidate_shipping_index_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_shipping_index_on_{model_name}_delete",
+            )
+        m2m_changed.connect(
+            invalidate_shipping_index_handler,
+            sender=ShippingZone.channels.through,
+            dispatch_uid="invalidate_shipping_index_on_zone_channels_change",
+        )
+        m2m_changed.connect(
+            invalidate_shipping_index_handler,
+            sender=ShippingMethod.excluded_products.through,
+            dispatch_uid="invalidate_shipping_index_on_excluded_products_change",
+        )
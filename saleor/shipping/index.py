@@ -0,0 +1,253 @@
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from measurement.measures import Weight
+from prices import Money
+
+from . import PostalCodeRuleInclusionType, ShippingMethodType
+from .postal_codes import get_postal_code_key
+
+SHIPPING_INDEX_VERSION_CACHE_KEY = "shipping_index_version"
+
+# Process-wide cache of channel indexes with the version they were built for.
+_channel_indexes: Dict[int, Tuple[Optional[int], "ChannelShippingIndex"]] = {}
+
+
+class PostalCodeIntervals:
+    """Postal code ranges answering whether any of them contains a code.
+
+    Ranges are sorted by their start together with the running maximum of their
+    ends, so a lookup is a single binary search.
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[Any, Optional[Any]]]):
+        self.starts: List[Any] = []
+        # None stands for a range without the end.
+        self.max_ends: List[Optional[Any]] = []
+        max_end: Optional[Any] = None
+        for index, (start, end) in enumerate(sorted(ranges, key=lambda r: r[0])):
+            if index == 0:
+                max_end = end
+            elif max_end is not None:
+                max_end = None if end is None else max(max_end, end)
+            self.starts.append(start)
+            self.max_ends.append(max_end)
+
+    def contains(self, key: Any) -> bool:
+        position = bisect_right(self.starts, key)
+        if not position:
+            return False
+        max_end = self.max_ends[position - 1]
+        return max_end is None or key <= max_end
+
+
+@dataclass(frozen=True)
+class PostalCodeRules:
+    inclusion_type: str
+    intervals: PostalCodeIntervals
+
+    def is_applicable(self, postal_code_key: Any) -> bool:
+        if self.inclusion_type == PostalCodeRuleInclusionType.INCLUDE:
+            return postal_code_key is not None and self.intervals.contains(
+                postal_code_key
+            )
+        if self.inclusion_type == PostalCodeRuleInclusionType.EXCLUDE:
+            return postal_code_key is None or not self.intervals.contains(
+                postal_code_key
+            )
+        # Shipping methods with complex rules are not supported for now
+        return False
+
+
+@dataclass(frozen=True)
+class ShippingMethodEntry:
+    shipping_method_id: int
+    type: str
+    currency: str
+    price_amount: Decimal
+    minimum_order_price_amount: Optional[Decimal]
+    maximum_order_price_amount: Optional[Decimal]
+    minimum_order_weight: Optional[Weight]
+    maximum_order_weight: Optional[Weight]
+    excluded_product_ids: FrozenSet[int]
+    postal_code_rules: Optional[PostalCodeRules]
+
+    def is_applicable(
+        self,
+        price: Money,
+        weight: Weight,
+        product_ids: Iterable[int],
+        postal_code_key: Any,
+    ) -> bool:
+        if self.currency != price.currency:
+            return False
+        if self.type == ShippingMethodType.PRICE_BASED:
+            if self.minimum_order_price_amount is None:
+                return False
+            if self.minimum_order_price_amount > price.amount:
+                return False
+            if (
+                self.maximum_order_price_amount is not None
+                and self.maximum_order_price_amount < price.amount
+            ):
+                return False
+        elif self.type == ShippingMethodType.WEIGHT_BASED:
+            if (
+                self.minimum_order_weight is not None
+                and self.minimum_order_weight > weight
+            ):
+                return False
+            if (
+                self.maximum_order_weight is not None
+                and self.maximum_order_weight < weight
+            ):
+                return False
+        else:
+            return False
+        if self.excluded_product_ids and not self.excluded_product_ids.isdisjoint(
+            product_ids
+        ):
+            return False
+        if self.postal_code_rules is not None:
+            return self.postal_code_rules.is_applicable(postal_code_key)
+        return True
+
+
+class ChannelShippingIndex:
+    """Shipping methods of a channel grouped by the countries of their zones.
+
+    The index holds everything needed to decide if a shipping method can be used
+    for a checkout or an order, so finding applicable methods doesn't query the
+    database. It is cached per process and rebuilt when shipping models change.
+    """
+
+    def __init__(self, entries_by_country: Dict[str, List[ShippingMethodEntry]]):
+        for entries in entries_by_country.values():
+            entries.sort(key=lambda e: (e.price_amount, e.shipping_method_id))
+        self.entries_by_country = entries_by_country
+
+    def get_applicable_shipping_method_ids(
+        self,
+        country_code: str,
+        price: Money,
+        weight: Weight,
+        product_ids: Iterable[int],
+        postal_code: Optional[str],
+    ) -> List[int]:
+        """Return IDs of applicable shipping methods ordered by their price."""
+        product_ids = set(product_ids)
+        postal_code_key = get_postal_code_key(country_code, postal_code)
+        return [
+            entry.shipping_method_id
+            for entry in self.entries_by_country.get(country_code, [])
+            if entry.is_applicable(price, weight, product_ids, postal_code_key)
+        ]
+
+
+def _compile_postal_code_rules(country_code, rules) -> Optional[PostalCodeRules]:
+    if not rules:
+        return None
+    inclusion_types = {rule.inclusion_type for rule in rules}
+    inclusion_type = inclusion_types.pop() if len(inclusion_types) == 1 else ""
+    ranges = []
+    for rule in rules:
+        start = get_postal_code_key(country_code, rule.start)
+        if start is None:
+            # Rules with a start in a different format never match.
+            continue
+        ranges.append((start, get_postal_code_key(country_code, rule.end)))
+    return PostalCodeRules(inclusion_type, PostalCodeIntervals(ranges))
+
+
+def build_channel_shipping_index(channel_id: int) -> ChannelShippingIndex:
+    from .models import (
+        ShippingMethod,
+        ShippingMethodChannelListing,
+        ShippingMethodPostalCodeRule,
+    )
+
+    listings = list(
+        ShippingMethodChannelListing.objects.filter(
+            channel_id=channel_id,
+            shipping_method__shipping_zone__channels__id=channel_id,
+        ).select_related("shipping_method__shipping_zone")
+    )
+    method_ids = [listing.shipping_method_id for listing in listings]
+
+    excluded_products = defaultdict(set)
+    excluded_products_relations = ShippingMethod.excluded_products.through.objects
+    for method_id, product_id in excluded_products_relations.filter(
+        shippingmethod_id__in=method_ids
+    ).values_list("shippingmethod_id", "product_id"):
+        excluded_products[method_id].add(product_id)
+
+    postal_code_rules = defaultdict(list)
+    for rule in ShippingMethodPostalCodeRule.objects.filter(
+        shipping_method_id__in=method_ids
+    ):
+        postal_code_rules[rule.shipping_method_id].append(rule)
+
+    entries_by_country: Dict[str, List[ShippingMethodEntry]] = defaultdict(list)
+    for listing in listings:
+        method = listing.shipping_method
+        for country in method.shipping_zone.countries:
+            entries_by_country[country.code].append(
+                ShippingMethodEntry(
+                    shipping_method_id=method.pk,
+                    type=method.type,
+                    currency=listing.currency,
+                    price_amount=listing.price_amount,
+                    minimum_order_price_amount=listing.minimum_order_price_amount,
+                    maximum_order_price_amount=listing.maximum_order_price_amount,
+                    minimum_order_weight=method.minimum_order_weight,
+                    maximum_order_weight=method.maximum_order_weight,
+                    excluded_product_ids=frozenset(excluded_products[method.pk]),
+                    postal_code_rules=_compile_postal_code_rules(
+                        country.code, postal_code_rules[method.pk]
+                    ),
+                )
+            )
+    return ChannelShippingIndex(entries_by_country)
+
+
+def get_shipping_index_version() -> Optional[int]:
+    version = cache.get(SHIPPING_INDEX_VERSION_CACHE_KEY)
+    if version is None:
+        # A new version is used when the key was never set or got evicted, so
+        # indexes built for an old version are never used again.
+        cache.add(SHIPPING_INDEX_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(SHIPPING_INDEX_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_shipping_index():
+    """Force all processes to rebuild their shipping indexes.
+
+    The version is bumped again once the transaction is committed, as other
+    processes could build the index before the changes were visible.
+    """
+
+    def bump_version():
+        cache.set(SHIPPING_INDEX_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        _channel_indexes.clear()
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def get_channel_shipping_index(channel_id: int) -> ChannelShippingIndex:
+    version = get_shipping_index_version()
+    cached = _channel_indexes.get(channel_id)
+    # Without a version, e.g. with a dummy cache backend, changes can't be noticed
+    # so the index is built every time.
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1]
+    index = build_channel_shipping_index(channel_id)
+    _channel_indexes[channel_id] = (version, index)
+    return index
@@ -20,7 +20,7 @@ from ..core.weight import (
     zero_weight,
 )
 from . import PostalCodeRuleInclusionType, ShippingMethodType
-from .postal_codes import filter_shipping_methods_by_postal_code_rules
+from .index import get_channel_shipping_index
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -167,16 +167,19 @@ class ShippingMethodQueryset(models.QuerySet):
             instance_product_ids = set(lines.values_list("variant__product", flat=True))
         else:
             instance_product_ids = {line.product.id for line in lines}
-        applicable_methods = self.applicable_shipping_methods(
+        # Applicable methods are found in the in-memory index of the channel, the
+        # database is only queried for the matching shipping methods.
+        applicable_method_ids = get_channel_shipping_index(
+            channel_id
+        ).get_applicable_shipping_method_ids(
+            country_code=country_code,
             price=price,
-            channel_id=channel_id,
             weight=instance.get_total_weight(lines),
-            country_code=country_code or instance.shipping_address.country.code,
             product_ids=instance_product_ids,
-        ).prefetch_related("postal_code_rules")
-
-        return filter_shipping_methods_by_postal_code_rules(
-            applicable_methods, instance.shipping_address
+            postal_code=instance.shipping_address.postal_code,
+        )
+        return self.applicable_shipping_methods_by_channel(
+            self.filter(pk__in=applicable_method_ids), channel_id
         )
 
 
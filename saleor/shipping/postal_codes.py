@@ -2,6 +2,15 @@ import re
 
 from . import PostalCodeRuleInclusionType
 
+UK_POSTAL_CODE_PATTERN = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
+IRISH_POSTAL_CODE_PATTERN = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
+UK_POSTAL_CODE_COUNTRIES = {
+    "GB",  # United Kingdom
+    "IM",  # Isle of Man
+    "GG",  # Guernsey
+    "JE",  # Jersey
+}
+
 
 def group_values(pattern, *values):
     result = []
@@ -46,8 +55,7 @@ def check_uk_postal_code(code, start, end):
 
     Example postal codes: BH20 2BC  (UK), IM16 7HF  (Isle of Man).
     """
-    pattern = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(UK_POSTAL_CODE_PATTERN, code, start, end)
     # replace second item of each tuple with it's value casted to int
     code, start, end = cast_tuple_index_to_type(1, int, code, start, end)
     return compare_values(code, start, end)
@@ -58,8 +66,7 @@ def check_irish_postal_code(code, start, end):
 
     Example postal codes: A65 2F0A, A61 2F0G.
     """
-    pattern = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(IRISH_POSTAL_CODE_PATTERN, code, start, end)
     return compare_values(code, start, end)
 
 
@@ -71,6 +78,22 @@ def check_any_postal_code(code, start, end):
     return compare_values(code, start, end)
 
 
+def get_postal_code_key(country, code):
+    """Return the postal code in the form compared by `check_postal_code_in_range`.
+
+    Return None for codes which don't match the country format.
+    """
+    if country in UK_POSTAL_CODE_COUNTRIES:
+        (key,) = cast_tuple_index_to_type(
+            1, int, *group_values(UK_POSTAL_CODE_PATTERN, code)
+        )
+    elif country == "IE":
+        (key,) = group_values(IRISH_POSTAL_CODE_PATTERN, code)
+    else:
+        key = code
+    return key or None
+
+
 def check_postal_code_in_range(country, code, start, end):
     country_func_map = {
         "GB": check_uk_postal_code,  # United Kingdom
@@ -0,0 +1,5 @@
+from .index import invalidate_shipping_index
+
+
+def invalidate_shipping_index_handler(sender, **kwargs):
+    invalidate_shipping_index()
@@ -0,0 +1,178 @@
+import pytest
+from measurement.measures import Weight
+from prices import Money
+
+from .. import PostalCodeRuleInclusionType
+from ..index import (
+    PostalCodeIntervals,
+    get_channel_shipping_index,
+    get_shipping_index_version,
+)
+from ..models import ShippingMethod, ShippingMethodChannelListing, ShippingMethodType
+
+
+@pytest.mark.parametrize(
+    "key, contains",
+    [(0, False), (1, True), (3, True), (4, False), (5, True), (100, True)],
+)
+def test_postal_code_intervals_contains(key, contains):
+    intervals = PostalCodeIntervals([(5, None), (1, 2), (2, 3)])
+
+    assert intervals.contains(key) is contains
+
+
+def test_postal_code_intervals_without_ranges():
+    assert PostalCodeIntervals([]).contains(1) is False
+
+
+def _get_applicable_ids(channel, price, weight=Weight(kg=5), **kwargs):
+    params = {
+        "country_code": "PL",
+        "price": Money(price, channel.currency_code),
+        "weight": weight,
+        "product_ids": [],
+        "postal_code": None,
+    }
+    params.update(kwargs)
+    return get_channel_shipping_index(channel.id).get_applicable_shipping_method_ids(
+        **params
+    )
+
+
+@pytest.mark.parametrize("price", [0, 5, 10, 15, 100])
+def test_index_matches_applicable_shipping_methods(
+    price, shipping_zone, channel_USD, product
+):
+    # given
+    price_method = shipping_zone.shipping_methods.get()
+    capped_method = shipping_zone.shipping_methods.create(
+        type=ShippingMethodType.PRICE_BASED
+    )
+    weight_method = shipping_zone.shipping_methods.create(
+        minimum_order_weight=Weight(kg=1),
+        maximum_order_weight=Weight(kg=10),
+        type=ShippingMethodType.WEIGHT_BASED,
+    )
+    excluded_method = shipping_zone.shipping_methods.create(
+        type=ShippingMethodType.WEIGHT_BASED
+    )
+    excluded_method.excluded_products.add(product)
+    for method, price_amount, min_price, max_price in [
+        (capped_method, 5, 5, 10),
+        (weight_method, 7, None, None),
+        (excluded_method, 1, None, None),
+    ]:
+        ShippingMethodChannelListing.objects.create(
+            shipping_method=method,
+            channel=channel_USD,
+            currency=channel_USD.currency_code,
+            price_amount=price_amount,
+            minimum_order_price_amount=min_price,
+            maximum_order_price_amount=max_price,
+        )
+    price_method.channel_listings.update(price_amount=3)
+
+    # when
+    index_ids = _get_applicable_ids(channel_USD, price, product_ids=[product.id])
+
+    # then
+    expected_methods = ShippingMethod.objects.applicable_shipping_methods(
+        price=Money(price, "USD"),
+        weight=Weight(kg=5),
+        country_code="PL",
+        channel_id=channel_USD.id,
+        product_ids=[product.id],
+    )
+    assert index_ids == [method.pk for method in expected_methods]
+
+
+def test_index_skips_zones_without_channel(shipping_zone, channel_USD):
+    # given
+    shipping_zone.channels.clear()
+
+    # when
+    index_ids = _get_applicable_ids(channel_USD, 10)
+
+    # then
+    assert index_ids == []
+
+
+def test_index_skips_countries_outside_zone(shipping_zone, channel_USD):
+    # given
+    shipping_zone.countries = ["DE"]
+    shipping_zone.save(update_fields=["countries"])
+
+    # when
+    index_ids = _get_applicable_ids(channel_USD, 10)
+
+    # then
+    assert index_ids == []
+
+
+@pytest.mark.parametrize(
+    "inclusion_type, postal_code, applicable",
+    [
+        (PostalCodeRuleInclusionType.INCLUDE, "BH3 2BC", True),
+        (PostalCodeRuleInclusionType.INCLUDE, "BH20 2BC", False),
+        (PostalCodeRuleInclusionType.INCLUDE, None, False),
+        (PostalCodeRuleInclusionType.EXCLUDE, "BH3 2BC", False),
+        (PostalCodeRuleInclusionType.EXCLUDE, "BH20 2BC", True),
+        (PostalCodeRuleInclusionType.EXCLUDE, None, True),
+    ],
+)
+def test_index_postal_code_rules(
+    inclusion_type, postal_code, applicable, shipping_zone, channel_USD
+):
+    # given
+    method = shipping_zone.shipping_methods.get()
+    method.postal_code_rules.create(
+        start="BH2 1AA", end="BH4 9ZZ", inclusion_type=inclusion_type
+    )
+
+    # when
+    index_ids = _get_applicable_ids(
+        channel_USD, 10, country_code="GB", postal_code=postal_code
+    )
+
+    # then
+    assert (method.pk in index_ids) is applicable
+
+
+def test_index_is_cached(shipping_zone, channel_USD, assert_num_queries):
+    # given
+    get_channel_shipping_index(channel_USD.id)
+
+    # when
+    with assert_num_queries(0):
+        index = get_channel_shipping_index(channel_USD.id)
+
+    # then
+    assert index is get_channel_shipping_index(channel_USD.id)
+
+
+def test_index_invalidated_on_shipping_changes(shipping_zone, channel_USD):
+    # given
+    method = shipping_zone.shipping_methods.get()
+    version = get_shipping_index_version()
+    assert _get_applicable_ids(channel_USD, 10) == [method.pk]
+
+    # when
+    method.channel_listings.get().delete()
+
+    # then
+    assert get_shipping_index_version() != version
+    assert _get_applicable_ids(channel_USD, 10) == []
+
+
+def test_index_invalidated_on_excluded_products_change(
+    shipping_zone, channel_USD, product
+):
+    # given
+    method = shipping_zone.shipping_methods.get()
+    assert _get_applicable_ids(channel_USD, 10, product_ids=[product.id]) == [method.pk]
+
+    # when
+    method.excluded_products.add(product)
+
+    # then
+    assert _get_applicable_ids(channel_USD, 10, product_ids=[product.id]) == []
@@ -14,6 +14,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.postgres.search import SearchVector
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -38,6 +39,7 @@ from ..attribute.models import (
 from ..attribute.utils import associate_attribute_values_to_instance
 from ..checkout.fetch import fetch_checkout_info
 from ..checkout.models import Checkout
+from ..checkout.prices_cache import clear_local_checkout_prices
 from ..checkout.utils import add_variant_to_checkout
 from ..core import JobStatus
 from ..core.payments import PaymentInterface
@@ -64,12 +66,13 @@ from ..order.events import (
     order_added_products_event,
 )
 from ..order.models import FulfillmentStatus, Order, OrderEvent, OrderLine
+from ..order.sales_rollups import update_sales_rollups
 from ..order.utils import recalculate_order
 from ..page.models import Page, PageTranslation, PageType
 from ..payment import ChargeStatus, TransactionKind
 from ..payment.interface import GatewayConfig, PaymentData
 from ..payment.models import Payment
-from ..plugins.manager import get_plugins_manager
+from ..plugins.manager import get_plugins_manager, invalidate_plugins_configuration
 from ..plugins.models import PluginConfiguration
 from ..plugins.vatlayer.plugin import VatlayerPlugin
 from ..product import ProductMediaTypes
@@ -100,6 +103,7 @@ from ..shipping.models import (
     ShippingZone,
 )
 from ..site.models import SiteSettings
+from ..warehouse.management import recalculate_stocks_quantity_allocated
 from ..warehouse.models import Allocation, Stock, Warehouse
 from ..webhook.event_types import WebhookEventType
 from ..webhook.models import Webhook
@@ -214,6 +218,14 @@ def setup_dummy_gateways(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Objects cached by previous tests are rolled back without signals.
+    cache.clear()
+    clear_local_checkout_prices()
+    invalidate_plugins_configuration()
+
+
 @pytest.fixture
 def sample_gateway(settings):
     settings.PLUGINS += [
@@ -2227,6 +2239,7 @@ def order_line_with_allocation_in_many_stocks(
             Allocation(order_line=order_line, stock=stocks[1], quantity_allocated=1),
         ]
     )
+    recalculate_stocks_quantity_allocated()
 
     return order_line
 
@@ -2268,6 +2281,7 @@ def order_line_with_one_allocation(
     Allocation.objects.create(
         order_line=order_line, stock=stocks[0], quantity_allocated=1
     )
+    recalculate_stocks_quantity_allocated()
 
     return order_line
 
@@ -2347,6 +2361,7 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    recalculate_stocks_quantity_allocated()
 
     product = Product.objects.create(
         name="Test product 2",
@@ -2392,6 +2407,7 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    recalculate_stocks_quantity_allocated()
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_USD
@@ -2511,6 +2527,7 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    recalculate_stocks_quantity_allocated()
 
     product = Product.objects.create(
         name="Test product 2 in PLN channel",
@@ -2556,6 +2573,7 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    recalculate_stocks_quantity_allocated()
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_PLN
@@ -2577,6 +2595,11 @@ def order_with_lines_channel_PLN(
     return order
 
 
+@pytest.fixture
+def orders_sales_rollups(order_with_lines, order_with_lines_channel_PLN):
+    update_sales_rollups([order_with_lines, order_with_lines_channel_PLN])
+
+
 @pytest.fixture
 def order_with_line_without_inventory_tracking(
     order, variant_without_inventory_tracking
@@ -2694,6 +2717,7 @@ def fulfillment(fulfilled_order):
 @pytest.fixture
 def draft_order(order_with_lines):
     Allocation.objects.filter(order_line__order=order_with_lines).delete()
+    recalculate_stocks_quantity_allocated()
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.save(update_fields=["status"])
     return order_with_lines
@@ -3611,6 +3635,15 @@ def webhook(app):
     return webhook
 
 
+@pytest.fixture
+def any_webhook(app):
+    webhook = Webhook.objects.create(
+        name="Any webhook", app=app, target_url="http://www.example.com/any"
+    )
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @pytest.fixture
 def fake_payment_interface(mocker):
     return mocker.Mock(spec=PaymentInterface)
@@ -3714,9 +3747,11 @@ def stock(variant, warehouse):
 
 @pytest.fixture
 def allocation(order_line, stock):
-    return Allocation.objects.create(
+    allocation = Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    recalculate_stocks_quantity_allocated()
+    return allocation
 
 
 @pytest.fixture
@@ -3767,7 +3802,7 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
-    return Allocation.objects.bulk_create(
+    allocations = Allocation.objects.bulk_create(
         [
             Allocation(
                 order_line=lines[0], stock=stock, quantity_allocated=lines[0].quantity
@@ -3780,6 +3815,8 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
+    recalculate_stocks_quantity_allocated()
+    return allocations
 
 
 @pytest.fixture
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
@@ -13,8 +13,8 @@ if TYPE_CHECKING:
 
 def _get_available_quantity(stocks: StockQuerySet) -> int:
     results = stocks.aggregate(
-        total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
+        total_quantity=Coalesce(Sum("quantity"), 0),
+        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0),
     )
     total_quantity = results["total_quantity"]
     quantity_allocated = results["quantity_allocated"]
@@ -22,6 +22,43 @@ def _get_available_quantity(stocks: StockQuerySet) -> int:
     return max(total_quantity - quantity_allocated, 0)
 
 
+def get_available_quantities_bulk(
+    variant_ids: Iterable[int], country_code: str, channel_slug: Optional[str]
+) -> Dict[int, int]:
+    """Return available quantities of variants in given country and channel.
+
+    Quantities of all variants are fetched in a single query. Variants without any
+    stock in the country and channel are omitted from the result.
+    """
+    stocks = (
+        Stock.objects.for_country_and_channel(country_code, channel_slug)
+        .filter(product_variant_id__in=variant_ids)
+        .annotate_available_quantity()
+        .values_list("product_variant_id", "available_quantity")
+    )
+    quantities: Dict[int, int] = defaultdict(int)
+    for variant_id, available_quantity in stocks:
+        quantities[variant_id] += available_quantity
+    return {variant_id: max(quantity, 0) for variant_id, quantity in quantities.items()}
+
+
+def get_products_in_stock_bulk(
+    product_ids: Iterable[int], country_code: str, channel_slug: Optional[str]
+) -> Set[int]:
+    """Return IDs of products with any variant available in given country and channel.
+
+    Availability of all products is checked in a single query.
+    """
+    stocks = (
+        Stock.objects.for_country_and_channel(country_code, channel_slug)
+        .filter(product_variant__product_id__in=product_ids)
+        .annotate_available_quantity()
+        .filter(available_quantity__gt=0)
+        .values_list("product_variant__product_id", flat=True)
+    )
+    return set(stocks)
+
+
 def check_stock_quantity(
     variant: "ProductVariant", country_code: str, channel_slug: str, quantity: int
 ):
@@ -31,13 +68,10 @@ def check_stock_quantity(
     exception.
     """
     if variant.track_inventory:
-        stocks = Stock.objects.get_variant_stocks_for_country(
-            country_code, channel_slug, variant
-        )
-        if not stocks:
-            raise InsufficientStock([InsufficientStockData(variant=variant)])
-
-        if quantity > _get_available_quantity(stocks):
+        available_quantity = get_available_quantities_bulk(
+            [variant.pk], country_code, channel_slug
+        ).get(variant.pk)
+        if available_quantity is None or quantity > available_quantity:
             raise InsufficientStock([InsufficientStockData(variant=variant)])
 
 
@@ -90,7 +124,6 @@ def is_product_in_stock(
     product: "Product", country_code: str, channel_slug: str
 ) -> bool:
     """Check if there is any variant of given product available in given country."""
-    stocks = Stock.objects.get_product_stocks_for_country_and_channel(
-        country_code, channel_slug, product
-    ).annotate_available_quantity()
-    return any(stocks.values_list("available_quantity", flat=True))
+    return product.pk in get_products_in_stock_bulk(
+        [product.pk], country_code, channel_slug
+    )
@@ -1,33 +1,61 @@
 from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Dict, Iterable, List, cast
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, cast
 
+from django.conf import settings
 from django.db import transaction
-from django.db.models import F, Sum
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
 
 from ..core.exceptions import AllocationError, InsufficientStock, InsufficientStockData
 from ..order import OrderLineData
 from ..product.models import ProductVariant
-from .models import Allocation, Stock, Warehouse
+from .models import Allocation, Stock, StockQuerySet, Warehouse
 
 if TYPE_CHECKING:
     from ..order.models import Order, OrderLine
 
 
-StockData = namedtuple("StockData", ["pk", "quantity"])
+StockData = namedtuple("StockData", ["pk", "quantity", "quantity_allocated"])
+
+
+@dataclass
+class StockReservation:
+    """Quantities reserved in stocks before allocating them to order lines.
+
+    `quantities` maps pks of variants to quantities reserved in their stocks, keyed
+    by stock pk. `allocation_pks` are set once the reservation is allocated.
+    """
+
+    quantities: Dict[int, Dict[int, int]]
+    allocation_pks: List[int] = field(default_factory=list)
+
+
+def _update_stocks_quantity_allocated(quantities: Dict[int, int]):
+    """Change allocated quantities of stocks by given values, keyed by stock pk."""
+    stocks = [
+        Stock(pk=stock_pk, quantity_allocated=F("quantity_allocated") + quantity)
+        for stock_pk, quantity in quantities.items()
+        if quantity
+    ]
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
 
 
 @transaction.atomic
 def allocate_stocks(
-    order_lines_info: Iterable["OrderLineData"], country_code: str, channel_slug: str
+    order_lines_info: Iterable["OrderLineData"],
+    country_code: str,
+    channel_slug: str,
+    stock_reservation: Optional[StockReservation] = None,
 ):
     """Allocate stocks for given `order_lines` in given country.
 
-    Function lock for update all stocks and allocations for variants in
-    given country and order by pk. Next, generate the dictionary
-    ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
+    Function lock for update all stocks for variants in given country and order by pk.
     Iterate by stocks and allocate as many items as needed or available in stock
     for order line, until allocated all required quantity for the order line.
     If there is less quantity in stocks then rise InsufficientStock exception.
+    Quantities of `stock_reservation` are allocated without touching the stocks,
+    if they match the order lines.
     """
     # allocation only applied to order lines with variants with track inventory
     # set to True
@@ -35,6 +63,15 @@ def allocate_stocks(
     if not order_lines_info:
         return
 
+    if stock_reservation and _allocate_reserved_stocks(
+        order_lines_info, stock_reservation
+    ):
+        return
+
+    if settings.OPTIMISTIC_STOCK_ALLOCATION:
+        _allocate_stocks_optimistically(order_lines_info, country_code, channel_slug)
+        return
+
     variants = [line_info.variant for line_info in order_lines_info]
 
     stocks = list(
@@ -42,24 +79,8 @@ def allocate_stocks(
         .for_country_and_channel(country_code, channel_slug)
         .filter(product_variant__in=variants)
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity")
+        .values("product_variant", "pk", "quantity", "quantity_allocated")
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
-
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated_sum"
-        ]
-
     variant_to_stocks: Dict[str, List[StockData]] = defaultdict(list)
     for stock_data in stocks:
         variant = stock_data.pop("product_variant")
@@ -73,7 +94,6 @@ def allocate_stocks(
         insufficient_stock, allocation_items = _create_allocations(
             line_info,
             stock_allocations,
-            quantity_allocation_for_stocks,
             insufficient_stock,
         )
         allocations.extend(allocation_items)
@@ -83,24 +103,25 @@ def allocate_stocks(
 
     if allocations:
         Allocation.objects.bulk_create(allocations)
+        allocated_quantities: Dict[int, int] = defaultdict(int)
+        for allocation in allocations:
+            allocated_quantities[allocation.stock_id] += allocation.quantity_allocated
+        _update_stocks_quantity_allocated(allocated_quantities)
 
 
 def _create_allocations(
     line_info: "OrderLineData",
     stocks: List[StockData],
-    quantity_allocation_for_stocks: dict,
     insufficient_stock: List[InsufficientStockData],
 ):
     quantity = line_info.quantity
     quantity_allocated = 0
     allocations = []
     for stock_data in stocks:
-        quantity_allocated_in_stock = quantity_allocation_for_stocks.get(
-            stock_data.pk, 0
+        quantity_available_in_stock = (
+            stock_data.quantity - stock_data.quantity_allocated
         )
 
-        quantity_available_in_stock = stock_data.quantity - quantity_allocated_in_stock
-
         quantity_to_allocate = min(
             (quantity - quantity_allocated), quantity_available_in_stock
         )
@@ -126,6 +147,180 @@ def _create_allocations(
         return insufficient_stock, []
 
 
+def _allocate_stocks_optimistically(
+    order_lines_info: Iterable["OrderLineData"], country_code: str, channel_slug: str
+):
+    """Allocate stocks for given `order_lines` without locking them upfront.
+
+    Stocks are read without a lock and the quantity to allocate in each of them is
+    reserved with an update which succeeds only if the stock still has it available.
+    When a stock was changed concurrently, the rest of the line quantity is planned
+    again from fresh stocks, up to OPTIMISTIC_STOCK_ALLOCATION_MAX_ATTEMPTS times.
+    Quantities reserved for a line are released when it cannot be fully allocated,
+    by rolling back the transaction.
+    """
+    insufficient_stock: List[InsufficientStockData] = []
+    allocations: List[Allocation] = []
+    for line_info in order_lines_info:
+        reserved_quantities = _reserve_stocks_for_variant(
+            line_info.variant.pk,  # type: ignore
+            line_info.quantity,
+            country_code,
+            channel_slug,
+        )
+        if reserved_quantities is None:
+            insufficient_stock.append(
+                InsufficientStockData(
+                    variant=line_info.variant, order_line=line_info.line
+                )
+            )
+            continue
+        allocations.extend(
+            Allocation(
+                order_line=line_info.line,
+                stock_id=stock_pk,
+                quantity_allocated=quantity,
+            )
+            for stock_pk, quantity in reserved_quantities.items()
+        )
+
+    if insufficient_stock:
+        raise InsufficientStock(insufficient_stock)
+
+    Allocation.objects.bulk_create(allocations)
+
+
+def _reserve_stocks_for_variant(
+    variant_id: int, quantity: int, country_code: str, channel_slug: str
+) -> Optional[Dict[int, int]]:
+    """Reserve the quantity of the variant and return reserved quantity by stock pk.
+
+    Return None if the stocks don't have enough available quantity.
+    """
+    quantity_to_reserve = quantity
+    reserved_quantities: Dict[int, int] = defaultdict(int)
+    for _attempt in range(settings.OPTIMISTIC_STOCK_ALLOCATION_MAX_ATTEMPTS):
+        stocks = (
+            Stock.objects.for_country_and_channel(country_code, channel_slug)
+            .filter(product_variant_id=variant_id)
+            .order_by("pk")
+            .values_list("pk", "quantity", "quantity_allocated")
+        )
+        planned_quantities = []
+        quantity_to_plan = quantity_to_reserve
+        for stock_pk, stock_quantity, quantity_allocated in stocks:
+            quantity_to_allocate = min(
+                quantity_to_plan, stock_quantity - quantity_allocated
+            )
+            if quantity_to_allocate > 0:
+                planned_quantities.append((stock_pk, quantity_to_allocate))
+                quantity_to_plan -= quantity_to_allocate
+                if not quantity_to_plan:
+                    break
+        if quantity_to_plan:
+            return None
+
+        for stock_pk, planned_quantity in planned_quantities:
+            reserved = Stock.objects.filter(
+                pk=stock_pk, quantity__gte=F("quantity_allocated") + planned_quantity
+            ).update(quantity_allocated=F("quantity_allocated") + planned_quantity)
+            if reserved:
+                reserved_quantities[stock_pk] += planned_quantity
+                quantity_to_reserve -= planned_quantity
+        if not quantity_to_reserve:
+            return reserved_quantities
+    return None
+
+
+def reserve_stocks(
+    variant_quantities: Dict[int, int], country_code: str, channel_slug: str
+) -> Optional[StockReservation]:
+    """Reserve quantities of variants, keyed by variant pk, in a transaction of its own.
+
+    Called before the transaction creating the order, so the reserved stocks stay
+    locked only until the reservation commits instead of until the order does.
+    Return None if the stocks don't have enough available quantity, nothing is
+    reserved then. The reservation has to be passed to `allocate_stocks` and then
+    to `release_stock_reservation`.
+    """
+    quantities = {}
+    with transaction.atomic():
+        for variant_pk, quantity in sorted(variant_quantities.items()):
+            reserved_quantities = _reserve_stocks_for_variant(
+                variant_pk, quantity, country_code, channel_slug
+            )
+            if reserved_quantities is None:
+                transaction.set_rollback(True)
+                return None
+            quantities[variant_pk] = dict(reserved_quantities)
+    return StockReservation(quantities=quantities)
+
+
+def _allocate_reserved_stocks(
+    order_lines_info: Iterable["OrderLineData"], stock_reservation: StockReservation
+) -> bool:
+    """Allocate the reservation to the order lines, return whether they matched."""
+    variant_quantities: Dict[int, int] = defaultdict(int)
+    for line_info in order_lines_info:
+        variant_quantities[line_info.variant.pk] += line_info.quantity  # type: ignore
+    reserved_quantities = {
+        variant_pk: dict(stock_quantities)
+        for variant_pk, stock_quantities in stock_reservation.quantities.items()
+    }
+    if variant_quantities != {
+        variant_pk: sum(stock_quantities.values())
+        for variant_pk, stock_quantities in reserved_quantities.items()
+    }:
+        return False
+
+    allocations: List[Allocation] = []
+    for line_info in order_lines_info:
+        quantity_to_allocate = line_info.quantity
+        stock_quantities = reserved_quantities[line_info.variant.pk]  # type: ignore
+        for stock_pk, reserved_quantity in stock_quantities.items():
+            quantity = min(quantity_to_allocate, reserved_quantity)
+            if quantity > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=line_info.line,
+                        stock_id=stock_pk,
+                        quantity_allocated=quantity,
+                    )
+                )
+                stock_quantities[stock_pk] -= quantity
+                quantity_to_allocate -= quantity
+    allocations = Allocation.objects.bulk_create(allocations)
+    stock_reservation.allocation_pks = [allocation.pk for allocation in allocations]
+    return True
+
+
+def release_stock_reservation(stock_reservation: StockReservation):
+    """Release quantities of the reservation unless they were allocated.
+
+    Called after the transaction which was to allocate the reservation ended. The
+    reservation is kept only if the allocations were committed with the order.
+    Allocated quantities don't go below zero, in case they were recalculated from
+    allocations while the reservation wasn't allocated yet.
+    """
+    if (
+        stock_reservation.allocation_pks
+        and Allocation.objects.filter(pk__in=stock_reservation.allocation_pks).exists()
+    ):
+        return
+    released_quantities: Dict[int, int] = defaultdict(int)
+    for stock_quantities in stock_reservation.quantities.values():
+        for stock_pk, quantity in stock_quantities.items():
+            released_quantities[stock_pk] += quantity
+    stocks = [
+        Stock(
+            pk=stock_pk,
+            quantity_allocated=Greatest(F("quantity_allocated") - quantity, 0),
+        )
+        for stock_pk, quantity in sorted(released_quantities.items())
+    ]
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
+
+
 @transaction.atomic
 def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
     """Deallocate stocks for given `order_lines`.
@@ -154,6 +349,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
         line_to_allocations[allocation.order_line_id].append(allocation)
 
     allocations_to_update = []
+    deallocated_quantities: Dict[int, int] = defaultdict(int)
     not_dellocated_lines = []
     for line_info in order_lines_data:
         order_line = line_info.line
@@ -170,6 +366,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
                 )
                 quantity_dealocated += quantity_to_deallocate
                 allocations_to_update.append(allocation)
+                deallocated_quantities[allocation.stock_id] -= quantity_to_deallocate
                 if quantity_dealocated == quantity:
                     break
         if not quantity_dealocated == quantity:
@@ -179,6 +376,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
         raise AllocationError(not_dellocated_lines)
 
     Allocation.objects.bulk_update(allocations_to_update, ["quantity_allocated"])
+    _update_stocks_quantity_allocated(deallocated_quantities)
 
 
 @transaction.atomic
@@ -218,6 +416,7 @@ def increase_stock(
             Allocation.objects.create(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
+        _update_stocks_quantity_allocated({stock.pk: quantity})
 
 
 @transaction.atomic
@@ -232,9 +431,11 @@ def increase_allocations(lines_info: Iterable["OrderLineData"], channel_slug: st
     # evaluate allocations query to trigger select_for_update lock
     allocation_pks_to_delete = [alloc.pk for alloc in allocations]
     allocation_quantity_map: Dict[int, list] = defaultdict(list)
+    deallocated_quantities: Dict[int, int] = defaultdict(int)
 
     for alloc in allocations:
         allocation_quantity_map[alloc.order_line.pk].append(alloc.quantity_allocated)
+        deallocated_quantities[alloc.stock_id] -= alloc.quantity_allocated
 
     for line_info in lines_info:
         allocated = sum(allocation_quantity_map[line_info.line.pk])
@@ -242,6 +443,7 @@ def increase_allocations(lines_info: Iterable["OrderLineData"], channel_slug: st
         line_info.quantity += allocated
 
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
+    _update_stocks_quantity_allocated(deallocated_quantities)
 
     allocate_stocks(
         lines_info,
@@ -275,9 +477,7 @@ def decrease_stock(order_lines_info: Iterable["OrderLineData"], update_stocks=Tr
     try:
         deallocate_stock(order_lines_info)
     except AllocationError as exc:
-        Allocation.objects.filter(order_line__in=exc.order_lines).update(
-            quantity_allocated=0
-        )
+        _deallocate_all(Allocation.objects.filter(order_line__in=exc.order_lines))
 
     stocks = (
         Stock.objects.select_for_update(of=("self",))
@@ -293,33 +493,13 @@ def decrease_stock(order_lines_info: Iterable["OrderLineData"], update_stocks=Tr
             str(stock.warehouse_id)
         ] = stock
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock__in=stocks,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(Sum("quantity_allocated"))
-    )
-
-    quantity_allocation_for_stocks: Dict[int, int] = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated__sum"
-        ]
-
     if update_stocks:
-        _decrease_stocks_quantity(
-            order_lines_info,
-            variant_and_warehouse_to_stock,
-            quantity_allocation_for_stocks,
-        )
+        _decrease_stocks_quantity(order_lines_info, variant_and_warehouse_to_stock)
 
 
 def _decrease_stocks_quantity(
     order_lines_info: Iterable["OrderLineData"],
     variant_and_warehouse_to_stock: Dict[int, Dict[str, Stock]],
-    quantity_allocation_for_stocks: Dict[int, int],
 ):
     insufficient_stocks: List[InsufficientStockData] = []
     stocks_to_update = []
@@ -337,9 +517,7 @@ def _decrease_stocks_quantity(
             )
             continue
 
-        quantity_allocated = quantity_allocation_for_stocks.get(stock.pk, 0)
-
-        if stock.quantity - quantity_allocated < line_info.quantity:
+        if stock.quantity - stock.quantity_allocated < line_info.quantity:
             insufficient_stocks.append(
                 InsufficientStockData(
                     variant=variant,  # type: ignore
@@ -375,4 +553,63 @@ def deallocate_stock_for_order(order: "Order"):
     allocations = Allocation.objects.filter(
         order_line__order=order, quantity_allocated__gt=0
     ).select_for_update(of=("self",))
-    allocations.update(quantity_allocated=0)
+    _deallocate_all(allocations)
+
+
+def _deallocate_all(allocations):
+    # Evaluate the allocations first to lock them when selected for update.
+    allocations = list(allocations)
+    allocated_quantities: Dict[int, int] = defaultdict(int)
+    for allocation in allocations:
+        allocated_quantities[allocation.stock_id] -= allocation.quantity_allocated
+    Allocation.objects.filter(
+        pk__in=[allocation.pk for allocation in allocations]
+    ).update(quantity_allocated=0)
+    _update_stocks_quantity_allocated(allocated_quantities)
+
+
+def _get_allocations_quantity():
+    allocations_quantity = (
+        Allocation.objects.filter(stock=OuterRef("pk"))
+        .order_by()
+        .values("stock")
+        .annotate(total=Sum("quantity_allocated"))
+        .values("total")
+    )
+    return Coalesce(Subquery(allocations_quantity), 0)
+
+
+def get_stocks_with_invalid_quantity_allocated(
+    stocks: Optional[StockQuerySet] = None,
+) -> StockQuerySet:
+    """Return stocks whose allocated quantity differs from sum of their allocations.
+
+    Each returned stock is annotated with the sum as `allocations_quantity`.
+    """
+    if stocks is None:
+        stocks = Stock.objects.all()
+    return stocks.annotate(allocations_quantity=_get_allocations_quantity()).exclude(
+        quantity_allocated=F("allocations_quantity")
+    )
+
+
+@transaction.atomic
+def recalculate_stocks_quantity_allocated(
+    stocks: Optional[StockQuerySet] = None,
+) -> int:
+    """Set allocated quantity of stocks to the sum of their allocations.
+
+    Only stocks with an invalid allocated quantity are updated, the number of them
+    is returned. With `OPTIMISTIC_STOCK_ALLOCATION`, quantities reserved by
+    checkouts being completed have no allocations yet, so this must not run while
+    checkouts are completed; it would drop the reservations from stocks, which
+    could then be allocated twice.
+    """
+    stock_pks = list(
+        get_stocks_with_invalid_quantity_allocated(stocks)
+        .select_for_update(of=("self",))
+        .values_list("pk", flat=True)
+    )
+    return Stock.objects.filter(pk__in=stock_pks).update(
+        quantity_allocated=_get_allocations_quantity()
+    )
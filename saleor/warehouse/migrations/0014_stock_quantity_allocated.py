@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def set_stocks_quantity_allocated(apps, schema_editor):
+    Stock = apps.get_model("warehouse", "Stock")
+    Allocation = apps.get_model("warehouse", "Allocation")
+    allocations_quantity = (
+        Allocation.objects.filter(stock=OuterRef("pk"))
+        .order_by()
+        .values("stock")
+        .annotate(total=Sum("quantity_allocated"))
+        .values("total")
+    )
+    Stock.objects.update(quantity_allocated=Coalesce(Subquery(allocations_quantity), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0013_auto_20210308_1135"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_allocated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(set_stocks_quantity_allocated, migrations.RunPython.noop),
+    ]
@@ -3,8 +3,7 @@ import uuid
 from typing import Set
 
 from django.db import models
-from django.db.models import F, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import F
 
 from ..account.models import Address
 from ..core.models import ModelWithMetadata
@@ -57,10 +56,7 @@ class Warehouse(ModelWithMetadata):
 
 class StockQuerySet(models.QuerySet):
     def annotate_available_quantity(self):
-        return self.annotate(
-            available_quantity=F("quantity")
-            - Coalesce(Sum("allocations__quantity_allocated"), 0)
-        )
+        return self.annotate(available_quantity=F("quantity") - F("quantity_allocated"))
 
     def for_channel(self, channel_slug: str):
         query_warehouse = models.Subquery(
@@ -108,6 +104,8 @@ class Stock(models.Model):
         ProductVariant, null=False, on_delete=models.CASCADE, related_name="stocks"
     )
     quantity = models.PositiveIntegerField(default=0)
+    # Sum of quantities of the stock allocations, maintained along with them.
+    quantity_allocated = models.PositiveIntegerField(default=0)
 
     objects = StockQuerySet.as_manager()
 
@@ -5,7 +5,11 @@ from ..availability import (
     _get_available_quantity,
     check_stock_quantity,
     check_stock_quantity_bulk,
+    get_available_quantities_bulk,
+    get_products_in_stock_bulk,
 )
+from ..management import recalculate_stocks_quantity_allocated
+from ..models import Stock
 
 COUNTRY_CODE = "US"
 
@@ -109,3 +113,85 @@ def test_check_stock_quantity_bulk_no_channel_shipping_zones(
         check_stock_quantity_bulk(
             [variant_with_many_stocks], country_code, [available_quantity], channel_USD
         )
+
+
+def test_get_available_quantities_bulk(
+    variant_with_many_stocks,
+    order_line_with_allocation_in_many_stocks,
+    product_list,
+    channel_USD,
+    assert_num_queries,
+):
+    # given
+    variant_ids = [variant_with_many_stocks.pk] + [
+        product.variants.get().pk for product in product_list
+    ]
+
+    # when
+    with assert_num_queries(1):
+        quantities = get_available_quantities_bulk(
+            variant_ids, COUNTRY_CODE, channel_USD.slug
+        )
+
+    # then
+    assert quantities == {
+        variant_with_many_stocks.pk: 4,
+        **{variant_id: 100 for variant_id in variant_ids[1:]},
+    }
+
+
+def test_get_available_quantities_bulk_skips_variants_without_stocks(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    variant_with_many_stocks.stocks.all().delete()
+
+    # when
+    quantities = get_available_quantities_bulk(
+        [variant_with_many_stocks.pk], COUNTRY_CODE, channel_USD.slug
+    )
+
+    # then
+    assert quantities == {}
+
+
+def test_get_products_in_stock_bulk(
+    variant_with_many_stocks, product_list, channel_USD, assert_num_queries
+):
+    # given
+    out_of_stock_product = product_list[0]
+    out_of_stock_product.variants.get().stocks.update(quantity=0)
+    product_ids = [variant_with_many_stocks.product_id] + [
+        product.pk for product in product_list
+    ]
+
+    # when
+    with assert_num_queries(1):
+        in_stock = get_products_in_stock_bulk(
+            product_ids, COUNTRY_CODE, channel_USD.slug
+        )
+
+    # then
+    assert in_stock == set(product_ids) - {out_of_stock_product.pk}
+
+
+def test_get_products_in_stock_bulk_with_all_quantity_allocated(
+    variant_with_many_stocks, order_line_with_allocation_in_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    Stock.objects.filter(product_variant__product_id=variant.product_id).exclude(
+        product_variant=variant
+    ).delete()
+    for allocation in order_line_with_allocation_in_many_stocks.allocations.all():
+        allocation.quantity_allocated = allocation.stock.quantity
+        allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
+
+    # when
+    in_stock = get_products_in_stock_bulk(
+        [variant.product_id], COUNTRY_CODE, channel_USD.slug
+    )
+
+    # then
+    assert in_stock == set()
@@ -1,5 +1,8 @@
+from typing import List
+from unittest.mock import patch
+
 import pytest
-from django.db.models import Sum
+from django.db.models import QuerySet, Sum
 from django.db.models.functions import Coalesce
 
 from ...core.exceptions import InsufficientStock
@@ -11,8 +14,12 @@ from ..management import (
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
+    get_stocks_with_invalid_quantity_allocated,
     increase_allocations,
     increase_stock,
+    recalculate_stocks_quantity_allocated,
+    release_stock_reservation,
+    reserve_stocks,
 )
 from ..models import Allocation
 
@@ -29,6 +36,7 @@ def test_allocate_stocks(order_line, stock, channel_USD):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 50
     allocation = Allocation.objects.get(order_line=order_line, stock=stock)
     assert allocation.quantity_allocated == 50
 
@@ -182,6 +190,7 @@ def test_deallocate_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     deallocate_stock(
         [
@@ -193,6 +202,7 @@ def test_deallocate_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 0
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 0
 
@@ -203,6 +213,7 @@ def test_deallocate_stock_partially(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     deallocate_stock(
         [
@@ -252,6 +263,7 @@ def test_increase_stock_without_allocate(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     increase_stock(allocation.order_line, stock.warehouse, 50, allocate=False)
 
@@ -267,11 +279,13 @@ def test_increase_stock_with_allocate(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     increase_stock(allocation.order_line, stock.warehouse, 50, allocate=True)
 
     stock.refresh_from_db()
     assert stock.quantity == 150
+    assert stock.quantity_allocated == 130
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 130
 
@@ -285,6 +299,7 @@ def test_increase_stock_with_new_allocation(order_line, stock):
 
     stock.refresh_from_db()
     assert stock.quantity == 150
+    assert stock.quantity_allocated == 50
     allocation = Allocation.objects.get(order_line=order_line, stock=stock)
     assert allocation.quantity_allocated == 50
 
@@ -304,6 +319,7 @@ def test_increase_allocations(quantity, allocation):
     initially_allocated = 80
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     increase_allocations([order_line_info], order_line.order.channel.slug)
 
@@ -331,6 +347,7 @@ def test_increase_allocation_insufficient_stock(allocation):
     initially_allocated = 80
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
 
     with pytest.raises(InsufficientStock):
         increase_allocations([order_line_info], order_line.order.channel.slug)
@@ -351,6 +368,7 @@ def test_decrease_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -366,6 +384,7 @@ def test_decrease_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 50
+    assert stock.quantity_allocated == 30
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 30
 
@@ -377,6 +396,7 @@ def test_decrease_stock_without_stock_update(quantity, expected_allocated, alloc
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -406,10 +426,12 @@ def test_decrease_stock_multiple_lines(allocations):
     stock.save(update_fields=["quantity"])
     allocation_1.quantity_allocated = 80
     allocation_1.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk_1 = allocation_1.stock.warehouse.pk
 
     allocation_2.quantity_allocated = 80
     allocation_2.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk_2 = allocation_2.stock.warehouse.pk
 
     decrease_stock(
@@ -441,6 +463,7 @@ def test_decrease_stock_partially(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -543,6 +566,7 @@ def test_decrease_stock_insufficient_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    recalculate_stocks_quantity_allocated()
     warehouse_pk = allocation.stock.warehouse.pk
 
     with pytest.raises(InsufficientStock):
@@ -574,3 +598,229 @@ def test_deallocate_stock_for_order(
     allocations = order_line.allocations.all()
     assert allocations[0].quantity_allocated == 0
     assert allocations[1].quantity_allocated == 0
+    assert not Stock.objects.filter(
+        pk__in=[allocation.stock_id for allocation in allocations],
+        quantity_allocated__gt=0,
+    ).exists()
+
+
+def test_increase_allocations_updates_stock_quantity_allocated(allocation):
+    # given
+    order_line = allocation.order_line
+    stock = allocation.stock
+    stock.quantity = 100
+    stock.save(update_fields=["quantity"])
+    order_line_info = OrderLineData(
+        line=order_line, quantity=10, variant=order_line.variant
+    )
+
+    # when
+    increase_allocations([order_line_info], order_line.order.channel.slug)
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated + 10
+    assert not get_stocks_with_invalid_quantity_allocated().exists()
+
+
+def test_recalculate_stocks_quantity_allocated(allocation):
+    # given
+    stock = allocation.stock
+    Stock.objects.filter(pk=stock.pk).update(quantity_allocated=100)
+
+    # when
+    updated_count = recalculate_stocks_quantity_allocated()
+
+    # then
+    assert updated_count == 1
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated
+    assert not get_stocks_with_invalid_quantity_allocated().exists()
+
+
+def test_get_stocks_with_invalid_quantity_allocated(allocation):
+    # given
+    invalid_stock = allocation.stock
+    Stock.objects.filter(pk=invalid_stock.pk).update(quantity_allocated=0)
+
+    # when
+    stocks = get_stocks_with_invalid_quantity_allocated()
+
+    # then
+    assert list(stocks) == [invalid_stock]
+    assert stocks[0].allocations_quantity == allocation.quantity_allocated
+
+
+def test_allocate_stocks_optimistically(order_line, stock, channel_USD, settings):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    stock.quantity = 100
+    stock.save(update_fields=["quantity"])
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=50)
+
+    # when
+    allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 50
+    allocation = Allocation.objects.get(order_line=order_line, stock=stock)
+    assert allocation.quantity_allocated == 50
+
+
+def test_allocate_stocks_optimistically_many_stocks(
+    order_line, variant_with_many_stocks, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    variant = variant_with_many_stocks
+    stocks = variant.stocks.all().order_by("pk")
+    line_data = OrderLineData(line=order_line, variant=variant, quantity=5)
+
+    # when
+    allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [a.quantity_allocated for a in allocations] == [4, 1]
+    assert [s.quantity_allocated for s in stocks] == [4, 1]
+
+
+def test_allocate_stocks_optimistically_insufficient_stocks(
+    order_line, variant_with_many_stocks, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    variant = variant_with_many_stocks
+    line_data = OrderLineData(line=order_line, variant=variant, quantity=8)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+    assert not variant.stocks.filter(quantity_allocated__gt=0).exists()
+
+
+def test_allocate_stocks_optimistically_stock_changed_concurrently(
+    order_line, variant_with_many_stocks, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    variant = variant_with_many_stocks
+    first_stock, second_stock = variant.stocks.all().order_by("pk")
+    line_data = OrderLineData(line=order_line, variant=variant, quantity=5)
+    update = QuerySet.update
+
+    def update_with_concurrent_allocation(queryset, **kwargs):
+        # Another order allocates part of the first stock after stocks were read.
+        if queryset.model is Stock and not concurrent_allocations:
+            concurrent_allocations.append(2)
+            Stock.objects.filter(pk=first_stock.pk).update(quantity_allocated=2)
+        return update(queryset, **kwargs)
+
+    concurrent_allocations: List[int] = []
+
+    # when
+    with patch.object(QuerySet, "update", update_with_concurrent_allocation):
+        allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [a.quantity_allocated for a in allocations] == [2, 3]
+    first_stock.refresh_from_db()
+    assert first_stock.quantity_allocated == 4
+    second_stock.refresh_from_db()
+    assert second_stock.quantity_allocated == 3
+
+
+def test_reserve_stocks(variant_with_many_stocks, channel_USD):
+    # given
+    variant = variant_with_many_stocks
+    stocks = variant.stocks.all().order_by("pk")
+
+    # when
+    reservation = reserve_stocks({variant.pk: 5}, COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    assert reservation.quantities == {variant.pk: {stocks[0].pk: 4, stocks[1].pk: 1}}
+    assert [s.quantity_allocated for s in stocks] == [4, 1]
+    assert not Allocation.objects.exists()
+
+
+def test_reserve_stocks_insufficient_stocks(variant_with_many_stocks, channel_USD):
+    # given
+    variant = variant_with_many_stocks
+
+    # when
+    reservation = reserve_stocks({variant.pk: 8}, COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    assert reservation is None
+    assert not variant.stocks.filter(quantity_allocated__gt=0).exists()
+
+
+def test_allocate_stocks_with_reservation(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    stocks = variant.stocks.all().order_by("pk")
+    reservation = reserve_stocks({variant.pk: 5}, COUNTRY_CODE, channel_USD.slug)
+    line_data = OrderLineData(line=order_line, variant=variant, quantity=5)
+
+    # when
+    allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug, reservation)
+    release_stock_reservation(reservation)
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [a.quantity_allocated for a in allocations] == [4, 1]
+    assert [s.quantity_allocated for s in stocks] == [4, 1]
+
+
+def test_allocate_stocks_with_not_matching_reservation(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    stocks = variant.stocks.all().order_by("pk")
+    reservation = reserve_stocks({variant.pk: 2}, COUNTRY_CODE, channel_USD.slug)
+    line_data = OrderLineData(line=order_line, variant=variant, quantity=5)
+
+    # when
+    allocate_stocks([line_data], COUNTRY_CODE, channel_USD.slug, reservation)
+    release_stock_reservation(reservation)
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [a.quantity_allocated for a in allocations] == [2, 3]
+    assert [s.quantity_allocated for s in stocks] == [2, 3]
+
+
+def test_release_stock_reservation(variant_with_many_stocks, channel_USD):
+    # given
+    variant = variant_with_many_stocks
+    reservation = reserve_stocks({variant.pk: 5}, COUNTRY_CODE, channel_USD.slug)
+
+    # when
+    release_stock_reservation(reservation)
+
+    # then
+    assert not variant.stocks.filter(quantity_allocated__gt=0).exists()
+
+
+def test_release_stock_reservation_after_recalculation(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    reservation = reserve_stocks({variant.pk: 5}, COUNTRY_CODE, channel_USD.slug)
+    recalculate_stocks_quantity_allocated()
+
+    # when
+    release_stock_reservation(reservation)
+
+    # then
+    assert not variant.stocks.filter(quantity_allocated__gt=0).exists()
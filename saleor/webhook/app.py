@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class WebhookAppConfig(AppConfig):
+    name = "saleor.webhook"
+
+    def ready(self):
+        from ..app.models import App
+        from .models import Webhook, WebhookEvent
+        from .signals import invalidate_webhook_subscriptions_handler
+
+        for model in (App, Webhook, WebhookEvent):
+            model_name = model._meta.model_name
+            post_save.connect(
+                invalidate_webhook_subscriptions_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_webhook_subscriptions_on_{model_name}_save",
+            )
+            post_delete.connect(
+                invalidate_webhook_subscriptions_handler,
+                sender=model,
+                dispatch_uid=f"invalidate_webhook_subscriptions_on_{model_name}_delete",
+            )
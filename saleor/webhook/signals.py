@@ -0,0 +1,5 @@
+from .utils import invalidate_webhook_subscriptions
+
+
+def invalidate_webhook_subscriptions_handler(sender, instance, **kwargs):
+    invalidate_webhook_subscriptions()
@@ -0,0 +1,67 @@
+import time
+from typing import FrozenSet, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .event_types import WebhookEventType
+from .models import WebhookEvent
+
+WEBHOOK_SUBSCRIPTIONS_VERSION_CACHE_KEY = "webhook_subscriptions_version"
+
+# Process-wide cache of event types with at least one active subscriber, together
+# with the subscriptions version it was loaded for.
+_subscribed_event_types: Optional[Tuple[Optional[int], FrozenSet[str]]] = None
+
+
+def get_webhook_subscriptions_version() -> Optional[int]:
+    version = cache.get(WEBHOOK_SUBSCRIPTIONS_VERSION_CACHE_KEY)
+    if version is None:
+        # A new version is used when the key was never set or got evicted, so
+        # event types loaded for an old version are never used again.
+        cache.add(WEBHOOK_SUBSCRIPTIONS_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(WEBHOOK_SUBSCRIPTIONS_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_webhook_subscriptions():
+    """Force all processes to reload subscribed event types.
+
+    The version is bumped again once the transaction is committed, as other
+    processes could load the subscriptions before the changes were visible.
+    """
+
+    def bump_version():
+        global _subscribed_event_types
+        cache.set(WEBHOOK_SUBSCRIPTIONS_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        _subscribed_event_types = None
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def get_subscribed_event_types() -> FrozenSet[str]:
+    global _subscribed_event_types
+    version = get_webhook_subscriptions_version()
+    # Without a version, e.g. with a dummy cache backend, changes can't be noticed
+    # so the event types are loaded every time.
+    if (
+        version is None
+        or _subscribed_event_types is None
+        or _subscribed_event_types[0] != version
+    ):
+        event_types = WebhookEvent.objects.filter(
+            webhook__is_active=True, webhook__app__is_active=True
+        ).values_list("event_type", flat=True)
+        _subscribed_event_types = (version, frozenset(event_types.distinct()))
+    return _subscribed_event_types[1]
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    """Return whether any active webhook could receive the event.
+
+    App permissions are not taken into account, webhooks are filtered by them when
+    the event is triggered.
+    """
+    event_types = get_subscribed_event_types()
+    return event_type in event_types or WebhookEventType.ANY in event_types